@@ -0,0 +1,291 @@
+"""
+Benchmarks de performance des chemins critiques ProWinder
+
+Mesure :
+- la latence par appel (moyenne et p99) de DigitalTwin.step, RadiusCalculator.estimate,
+  TensionObserver.update, InertiaEstimator.update et AdaptiveNotchFilter.process, ainsi que
+  celle des bancs d'estimateurs vectorisés (BANK_AXES axes par appel) ;
+- le débit du jumeau numérique (pas simulés par seconde, moteurs objets et kernel) ;
+- le temps total des scénarios de validation (scripts/validation) ;
+- le temps d'import des modules utilisés par les processus de travail (interpréteur neuf).
+
+Les résultats sont écrits en JSON. Avec --compare, chaque benchmark est comparé à une
+référence (baseline) sur sa métrique principale et le script échoue (code 1) si l'un
+d'eux régresse de plus de --threshold %.
+
+Utilisation (depuis la racine du dépôt) :
+    python scripts/benchmarks/run_benchmarks.py --output scripts/benchmarks/baseline.json
+    python scripts/benchmarks/run_benchmarks.py --compare scripts/benchmarks/baseline.json --threshold 25
+    python scripts/benchmarks/run_benchmarks.py --only twin --no-validation
+    python scripts/benchmarks/run_benchmarks.py --only import
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from prowinder.control.banks import RadiusCalculatorBank, TensionObserverBank
+from prowinder.control.filters import AdaptiveNotchFilter
+from prowinder.control.inertia_estimator import InertiaEstimator
+from prowinder.control.radius_estimator import RadiusCalculator
+from prowinder.control.tension_observer import TensionObserver
+from prowinder.mechanics.material import MaterialProperties
+from prowinder.simulation.digital_twin import DigitalTwin, SystemConfig
+
+# Number of axes of the estimator bank benchmarks
+BANK_AXES = 32
+
+# Primary metric of each benchmark kind and whether larger values are better
+PRIMARY_METRICS = {
+    'latency': ('mean_us', False),
+    'throughput': ('steps_per_s', True),
+    'wall_time': ('wall_s', False),
+}
+
+VALIDATION_SCRIPTS = ('validate_T2.1.1.py', 'validate_T2.1.2.py', 'validate_T2.1.3.py')
+
+# Modules imported by CLI invocations and sweep / Monte Carlo worker processes
+IMPORT_MODULES = ('prowinder', 'prowinder.simulation.digital_twin', 'prowinder.simulation.sweep',
+                  'prowinder.simulation.monte_carlo')
+
+
+def measure_latency(call: Callable[[int], object], calls: int, warmup: int = 200) -> Dict[str, float]:
+    """Chronomètre chaque appel call(i) individuellement (perf_counter_ns)."""
+    for i in range(warmup):
+        call(i)
+    samples = np.empty(calls, dtype=np.int64)
+    clock = time.perf_counter_ns
+    for i in range(calls):
+        start = clock()
+        call(warmup + i)
+        samples[i] = clock() - start
+    us = samples / 1e3
+    return {
+        'kind': 'latency',
+        'calls': calls,
+        'mean_us': float(np.mean(us)),
+        'p50_us': float(np.percentile(us, 50)),
+        'p99_us': float(np.percentile(us, 99)),
+    }
+
+
+def measure_throughput(config: SystemConfig, steps: int, repeat: int = 3) -> Dict[str, float]:
+    """Meilleur débit (pas/s) sur `repeat` exécutions de `steps` pas du jumeau."""
+    best = math.inf
+    for _ in range(repeat):
+        twin = DigitalTwin(config)
+        start = time.perf_counter()
+        for _ in range(steps):
+            twin.step(5.0, 100.0, 0.0)
+        best = min(best, time.perf_counter() - start)
+    return {'kind': 'throughput', 'steps': steps, 'steps_per_s': steps / best}
+
+
+def measure_script(path: str, repeat: int = 1) -> Dict[str, float]:
+    """Temps total d'un script de validation (sous-processus, depuis la racine du dépôt)."""
+    env = dict(os.environ, MPLBACKEND='Agg', PYTHONIOENCODING='utf-8')
+    best = math.inf
+    returncode = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, path], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+        returncode = proc.returncode
+    return {'kind': 'wall_time', 'wall_s': best, 'returncode': returncode}
+
+
+def measure_import(module: str, repeat: int = 3) -> Dict[str, float]:
+    """Meilleur temps d'import de `module` dans un interpréteur neuf (démarrage de Python exclu)."""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, 'src'))
+    best = math.inf
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env,
+                              capture_output=True, text=True, check=True)
+        best = min(best, float(proc.stdout.split()[-1]))
+    return {'kind': 'wall_time', 'wall_s': best, 'returncode': 0}
+
+
+def _material() -> MaterialProperties:
+    return MaterialProperties("PET", 1390.0, 4e9, 50e-6, width=0.15)
+
+
+def latency_benchmarks(calls: int) -> Dict[str, Callable[[], Dict[str, float]]]:
+    """Benchmarks de latence ; chaque entrée construit son objet puis le chronomètre."""
+
+    def twin_step():
+        twin = DigitalTwin(SystemConfig())
+        return measure_latency(lambda i: twin.step(5.0, 100.0, 0.0), calls)
+
+    def radius_estimate():
+        calc = RadiusCalculator(R0=0.05, film_thickness=50e-6, roller_length=1.0)
+        return measure_latency(lambda i: calc.estimate(60.0, 10.0 + 1e-3 * (i % 100), 50e-6, dt=0.01), calls)
+
+    def tension_observer_update():
+        observer = TensionObserver(_material(), span_length=1.5, dt=1e-3)
+        return measure_latency(lambda i: observer.update(
+            tau_motor=-20.0, omega=25.0, alpha=0.0, R=0.2, v_upstream=5.0, v_downstream=5.01), calls)
+
+    def inertia_estimator_update():
+        estimator = InertiaEstimator(J_motor=0.05, J_roller=0.02, R_core=0.05, L_roller=1.0, dt=0.01)
+        return measure_latency(lambda i: estimator.update(
+            tau_motor=8.0 + math.sin(0.05 * i), omega=10.0 + 2.0 * math.sin(0.02 * i),
+            alpha=0.04 * math.cos(0.02 * i), T_web=50.0, R=0.1), calls)
+
+    def notch_process():
+        notch = AdaptiveNotchFilter(center_freq=50.0, q_factor=5.0, sampling_rate=1000.0)
+        return measure_latency(lambda i: notch.process(math.sin(0.3 * i)), calls)
+
+    def radius_bank_estimate():
+        bank = RadiusCalculatorBank(BANK_AXES, R0=0.05, film_thickness=50e-6, roller_length=1.0)
+        v, omega = np.full(BANK_AXES, 60.0), np.full(BANK_AXES, 10.0)
+        return measure_latency(lambda i: bank.estimate(v, omega + 1e-3 * (i % 100), 50e-6, dt=0.01), calls)
+
+    def tension_bank_update():
+        bank = TensionObserverBank(BANK_AXES, _material(), span_length=1.5, dt=1e-3)
+        tau, omega, zero = np.full(BANK_AXES, -20.0), np.full(BANK_AXES, 25.0), np.zeros(BANK_AXES)
+        R, v_up, v_down = np.full(BANK_AXES, 0.2), np.full(BANK_AXES, 5.0), np.full(BANK_AXES, 5.01)
+        return measure_latency(lambda i: bank.update(tau, omega, zero, R, v_up, v_down), calls)
+
+    return {
+        'twin.step': twin_step,
+        'radius_calculator.estimate': radius_estimate,
+        'tension_observer.update': tension_observer_update,
+        'inertia_estimator.update': inertia_estimator_update,
+        'notch_filter.process': notch_process,
+        f'banks.radius.estimate[{BANK_AXES}]': radius_bank_estimate,
+        f'banks.tension.update[{BANK_AXES}]': tension_bank_update,
+    }
+
+
+def throughput_benchmarks(steps: int) -> Dict[str, Callable[[], Dict[str, float]]]:
+    return {
+        'twin.throughput.objects': lambda: measure_throughput(SystemConfig(), steps),
+        'twin.throughput.kernel': lambda: measure_throughput(SystemConfig(engine="kernel"), steps),
+    }
+
+
+def validation_benchmarks() -> Dict[str, Callable[[], Dict[str, float]]]:
+    folder = os.path.join(ROOT, 'scripts', 'validation')
+    return {f'validation.{name[:-3]}': (lambda path=os.path.join(folder, name): measure_script(path))
+            for name in VALIDATION_SCRIPTS}
+
+
+def import_benchmarks() -> Dict[str, Callable[[], Dict[str, float]]]:
+    return {f'import.{module}': (lambda module=module: measure_import(module)) for module in IMPORT_MODULES}
+
+
+def run(calls: int, steps: int, validation: bool, only: Optional[List[str]] = None) -> Dict:
+    """Exécute les benchmarks (filtrés par préfixe avec `only`) et retourne le rapport JSON."""
+    benchmarks = {**latency_benchmarks(calls), **throughput_benchmarks(steps), **import_benchmarks()}
+    if validation:
+        benchmarks.update(validation_benchmarks())
+
+    results = {}
+    for name, bench in benchmarks.items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        results[name] = bench()
+        print(f"  {name:40s} {_format(results[name])}")
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Compare deux rapports sur la métrique principale de chaque benchmark commun.
+
+    Un script de validation dont le code de retour diffère de celui de la référence (nouvel
+    échec, ou code d'échec modifié) compte comme une régression. Un échec déjà enregistré
+    dans la référence avec le même code est affiché mais ne bloque pas ; son temps n'est
+    pas comparé.
+
+    Returns:
+        Liste des régressions (> threshold % ou code de retour modifié), vide si aucune
+    """
+    regressions = []
+    for name, result in current['results'].items():
+        reference = baseline['results'].get(name)
+        returncode = result.get('returncode', 0)
+        if returncode != 0:
+            if reference is not None and reference.get('returncode', 0) == returncode:
+                print(f"  {name:40s} exit code {returncode} (already failing in baseline)  known")
+            else:
+                print(f"  {name:40s} exit code {returncode} (new failure)  FAILED")
+                regressions.append(name)
+            continue
+        if reference is None:
+            continue
+        metric, higher_is_better = PRIMARY_METRICS[result['kind']]
+        old, new = reference[metric], result[metric]
+        # Positive change = slower, whatever the metric direction
+        change = 100.0 * ((old / new - 1.0) if higher_is_better else (new / old - 1.0))
+        status = 'REGRESSION' if change > threshold else 'ok'
+        print(f"  {name:40s} {metric:12s} {old:12.4g} -> {new:12.4g}  ({change:+6.1f}%)  {status}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def _format(result: Dict[str, float]) -> str:
+    if result['kind'] == 'latency':
+        return f"mean {result['mean_us']:9.2f} us   p99 {result['p99_us']:9.2f} us"
+    if result['kind'] == 'throughput':
+        return f"{result['steps_per_s']:12.0f} steps/s"
+    return f"{result['wall_s']:9.3f} s (exit {result['returncode']})"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ProWinder performance benchmarks")
+    parser.add_argument('--output', help="Write results to this JSON file")
+    parser.add_argument('--compare', help="Baseline JSON file to compare against")
+    parser.add_argument('--threshold', type=float, default=25.0, help="Allowed slowdown in percent (default: 25)")
+    parser.add_argument('--calls', type=int, default=5000, help="Timed calls per latency benchmark")
+    parser.add_argument('--steps', type=int, default=20000, help="Twin steps per throughput run")
+    parser.add_argument('--no-validation', action='store_true', help="Skip the validation scripts")
+    parser.add_argument('--only', nargs='*', help="Run only benchmarks whose name starts with these prefixes")
+    args = parser.parse_args(argv)
+
+    print("ProWinder benchmarks")
+    report = run(args.calls, args.steps, not args.no_validation, args.only)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\nComparison with {args.compare} (threshold {args.threshold:.0f}%)")
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"FAILED: {len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+        print("OK: no regression")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,39 @@
 """
 ProWinder Dynamics - Package principal
+
+Les sous-paquets et les classes principales sont chargés à la demande (PEP 562) :
+`import prowinder` ne charge ni NumPy, ni SciPy, ni les modèles.
+
+    >>> import prowinder
+    >>> twin = prowinder.DigitalTwin(prowinder.SystemConfig())   # digital_twin importé ici
 """
+import importlib
+
 __version__ = "0.1.0"
+
+_SUBPACKAGES = ("control", "mechanics", "simulation")
+
+# Public name -> defining module, imported on first attribute access
+_LAZY_ATTRIBUTES = {
+    "DigitalTwin": "prowinder.simulation.digital_twin",
+    "SystemConfig": "prowinder.simulation.digital_twin",
+    "BatchDigitalTwin": "prowinder.simulation.batch_twin",
+    "run_sweep": "prowinder.simulation.sweep",
+    "MonteCarloStudy": "prowinder.simulation.monte_carlo",
+    "LineBuilder": "prowinder.simulation.web_line",
+}
+
+
+def __getattr__(name):
+    if name in _SUBPACKAGES:
+        module = importlib.import_module(f"{__name__}.{name}")
+    elif name in _LAZY_ATTRIBUTES:
+        module = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = module  # Cached: later lookups bypass __getattr__
+    return module
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_SUBPACKAGES) + list(_LAZY_ATTRIBUTES))
@@ -0,0 +1,354 @@
+"""
+Bancs d'estimateurs multi-axes (refendeuse-bobineuse : un estimateur par broche).
+
+Chaque banc regroupe l'état de M axes dans des tableaux NumPy de forme (M,) et met à jour
+tous les axes en un seul appel vectorisé, avec exactement les équations des classes
+unitaires :
+
+- FrictionObserverBank   <-> observers.FrictionObserver
+- RadiusCalculatorBank   <-> radius_estimator.RadiusCalculator
+- TensionObserverBank    <-> tension_observer.TensionObserver
+
+Les paramètres sont des scalaires (communs) ou des tableaux (M,) (par axe). Les entrées de
+update/estimate suivent la même règle. `reset(mask)` réinitialise les seuls axes désignés
+(masque booléen (M,) ou liste d'indices ; None = tous). Les modes sont rendus sous forme de
+codes int8 (indices dans RADIUS_MODES, RADIUS_METHODS, TENSION_MODES), comme dans l'historique.
+
+Example:
+    >>> bank = TensionObserverBank(32, material, span_length=1.5, dt=1e-3)
+    >>> estimates = bank.update(tau, omega, alpha, R, v_up, v_down, J_total=J)
+    >>> estimates.tension.shape, estimates.axis(3)
+    ((32,), TensionEstimate(tension=..., mode='span', ...))
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+from ..mechanics.friction import FrictionModel
+from ..mechanics.material import MaterialProperties
+from .radius_estimator import RadiusEstimate
+from .tension_observer import TENSION_MODES, TensionEstimate
+
+# Category codes of the radius estimator outputs
+RADIUS_MODES = ("startup", "running")
+RADIUS_METHODS = ("velocity", "integration", "fusion")
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+def _per_axis(value, n: int, dtype=float) -> np.ndarray:
+    """Paramètre scalaire ou (n,) -> tableau (n,) modifiable."""
+    array = np.asarray(value, dtype=dtype)
+    if array.ndim > 1 or (array.ndim == 1 and array.shape[0] != n):
+        raise ValueError(f"Per-axis values must be scalars or have shape ({n},), got {array.shape}")
+    return np.array(np.broadcast_to(array, (n,)))
+
+
+def _mask(mask, n: int) -> np.ndarray:
+    """Masque booléen (n,) depuis None (tous), un masque booléen ou des indices."""
+    if mask is None:
+        return np.ones(n, dtype=bool)
+    mask = np.asarray(mask)
+    if mask.dtype == bool:
+        if mask.shape != (n,):
+            raise ValueError(f"Reset mask must have shape ({n},)")
+        return mask
+    selected = np.zeros(n, dtype=bool)
+    selected[mask] = True
+    return selected
+
+
+# --- Friction ---
+
+class FrictionObserverBank:
+    """
+    M observateurs de frottement (FrictionObserver) mis à jour ensemble.
+
+    Args:
+        n_axes: Nombre d'axes M
+        friction_model: Modèle commun ou un FrictionModel par axe (utilisé par les axes à gain nul)
+        gain: Gain de l'observateur, scalaire ou par axe (0 = sortie du modèle, sans adaptation)
+    """
+
+    def __init__(self, n_axes: int, friction_model: Union[FrictionModel, Sequence[FrictionModel]],
+                 gain: ArrayLike = 10.0):
+        self.n = n_axes
+        models = [friction_model] * n_axes if isinstance(friction_model, FrictionModel) else list(friction_model)
+        if len(models) != n_axes:
+            raise ValueError(f"Expected {n_axes} friction models, got {len(models)}")
+        self.Tc = np.array([m.Tc for m in models], dtype=float)
+        self.Kv = np.array([m.Kv for m in models], dtype=float)
+        self.Ts = np.array([m.Ts for m in models], dtype=float)
+        self.vs = np.array([m.vs for m in models], dtype=float)
+        self.gain = _per_axis(gain, n_axes)
+        self.estimated_friction = np.zeros(n_axes)
+        self.state_estimate = np.zeros(n_axes)
+
+    def model_torque(self, velocity: np.ndarray) -> np.ndarray:
+        """FrictionModel.compute_torque vectorisé sur les axes."""
+        vs = np.where(self.vs == 0, 1.0, self.vs)
+        stribeck = np.where(self.vs == 0, 0.0, (self.Ts - self.Tc) * np.exp(-(velocity / vs) ** 2))
+        return (self.Tc + stribeck) * np.sign(velocity) + self.Kv * velocity
+
+    def update(self, measured_velocity: ArrayLike, applied_torque: ArrayLike, dt: ArrayLike,
+               inertia: ArrayLike) -> np.ndarray:
+        """Mise à jour de tous les axes ; retourne le couple de frottement estimé (M,)."""
+        velocity = np.asarray(measured_velocity, dtype=float)
+        correction = self.gain * (velocity - self.state_estimate)
+        adaptive = self.gain != 0.0
+        if adaptive.all():
+            self.state_estimate = self.state_estimate + correction * dt
+            self.estimated_friction = self.estimated_friction - correction * inertia * dt
+            return self.estimated_friction
+        self.state_estimate = np.where(adaptive, self.state_estimate + correction * dt, self.state_estimate)
+        self.estimated_friction = np.where(adaptive, self.estimated_friction - correction * inertia * dt,
+                                           self.estimated_friction)
+        return np.where(adaptive, self.estimated_friction, self.model_torque(velocity))
+
+    def reset(self, mask=None):
+        # Rebound rather than modified in place: earlier results may share these arrays
+        selected = _mask(mask, self.n)
+        self.estimated_friction = np.where(selected, 0.0, self.estimated_friction)
+        self.state_estimate = np.where(selected, 0.0, self.state_estimate)
+
+
+# --- Radius ---
+
+@dataclass
+class RadiusEstimates:
+    """Estimations de rayon de tous les axes (codes int8 pour mode et méthode)."""
+    radius: np.ndarray
+    mode: np.ndarray        # Index into RADIUS_MODES
+    confidence: np.ndarray
+    method_used: np.ndarray  # Index into RADIUS_METHODS
+
+    def axis(self, i: int) -> RadiusEstimate:
+        return RadiusEstimate(float(self.radius[i]), RADIUS_MODES[self.mode[i]], float(self.confidence[i]),
+                              RADIUS_METHODS[self.method_used[i]])
+
+
+class RadiusCalculatorBank:
+    """
+    M estimateurs de rayon (RadiusCalculator) mis à jour ensemble.
+
+    Args:
+        n_axes: Nombre d'axes M
+        R0, film_thickness, roller_length, min_velocity_threshold, max_radius_error:
+            Comme RadiusCalculator, scalaires ou par axe
+    """
+
+    # Moving-average weights of RadiusCalculator._apply_filtering (oldest first), by filter stage:
+    # running > 10 samples, running > 5 samples, running, startup
+    FILTER_WEIGHTS = np.array([
+        [0.01, 0.01, 0.02, 0.06, 0.90],
+        [0.02, 0.03, 0.05, 0.10, 0.80],
+        [0.05, 0.1, 0.15, 0.2, 0.5],
+        [0.1, 0.15, 0.2, 0.25, 0.3],
+    ])
+
+    def __init__(self, n_axes: int, R0: ArrayLike, film_thickness: ArrayLike, roller_length: ArrayLike,
+                 min_velocity_threshold: ArrayLike = 10.0, max_radius_error: ArrayLike = 0.10):
+        self.n = n_axes
+        self.R0 = _per_axis(R0, n_axes)
+        self.e_film_nominal = _per_axis(film_thickness, n_axes)
+        self.L = _per_axis(roller_length, n_axes)
+        self.min_v_threshold = _per_axis(min_velocity_threshold, n_axes)  # m/min
+        self.max_error = _per_axis(max_radius_error, n_axes)
+        self.alpha_velocity = 0.98
+        self.R_last = self.R0.copy()
+        self.running = np.zeros(n_axes, dtype=bool)
+        self.accumulated_length = np.zeros(n_axes)
+        self.n_samples_in_running = np.zeros(n_axes, dtype=np.int64)
+        self.radius_history = np.repeat(self.R0[:, None], 5, axis=1)
+
+    def reset(self, mask=None, R0: Optional[ArrayLike] = None):
+        """Réinitialise les axes du masque (avec un nouveau rayon initial éventuel)."""
+        selected = _mask(mask, self.n)
+        if R0 is not None:
+            self.R0 = np.where(selected, _per_axis(R0, self.n), self.R0)
+        self.R_last = np.where(selected, self.R0, self.R_last)
+        self.running = self.running & ~selected
+        self.accumulated_length = np.where(selected, 0.0, self.accumulated_length)
+        self.n_samples_in_running = np.where(selected, 0, self.n_samples_in_running)
+        self.radius_history[selected] = self.R0[selected, None]
+
+    def estimate(self, v_linear: ArrayLike, omega: ArrayLike, film_thickness_measured: ArrayLike,
+                 dt: Optional[ArrayLike] = None) -> RadiusEstimates:
+        """
+        Estime le rayon de tous les axes (v_linear en m/min, omega en rad/s, dt optionnel en s).
+        """
+        # Scalar inputs broadcast against the per-axis parameters
+        v = np.asarray(v_linear, dtype=float)
+        omega = np.asarray(omega, dtype=float)
+
+        # Method 1: velocity ratio, rejected at low speed or outside the plausible range
+        spinning = np.abs(omega) >= 0.1
+        R_v = (v / 60.0) / np.where(spinning, omega, 1.0)
+        valid = spinning & (R_v >= self.R0 * 0.8) & (R_v <= self.R0 * 10)
+
+        # Method 2: thickness integration
+        if dt is not None:
+            self.accumulated_length = self.accumulated_length + np.abs(v) / 60.0 * dt
+        acc = self.accumulated_length
+        R_int = np.where(acc > 0, np.sqrt(np.maximum(self.R0**2 + acc * film_thickness_measured / np.pi, self.R0**2)),
+                         self.R_last)
+
+        # Mode transitions (an axis entering "running" starts counting on the next call)
+        was_running = self.running
+        start = ~was_running & (v > self.min_v_threshold) & (acc > 1.0) & valid
+        stop = was_running & (v < self.min_v_threshold * 0.5)
+        self.n_samples_in_running = np.where(start | stop, 0, self.n_samples_in_running + was_running)
+        self.running = (was_running & ~stop) | start
+
+        # Fusion
+        alpha = np.where(acc < 0.1, 0.7, self.alpha_velocity)
+        R_fused = np.where(valid, alpha * R_v + (1 - alpha) * R_int, R_int)
+
+        # Moving-average filter
+        history = self.radius_history
+        history[:, :-1] = history[:, 1:]
+        history[:, -1] = R_fused
+        running, count = self.running, self.n_samples_in_running
+        stage = np.where(running, 2 - (count > 5) - (count > 10), 3)
+        weights = self.FILTER_WEIGHTS[stage]
+        R_final = (history * weights).sum(axis=1) / weights.sum(axis=1)
+        self.R_last = R_final
+
+        # Confidence and method
+        error = np.abs(R_v - R_int) / np.maximum(R_int, 1e-6)
+        confidence = np.where(running, np.where(valid, np.minimum(np.maximum(1.0 - error * 5.0, 0.0), 1.0), 0.6),
+                              np.where(acc < 0.5, 0.5, 0.7))
+        # velocity (0) / integration (1) when running, fusion (2) / integration (1) at startup
+        method = np.where(valid, np.where(running, 0, 2), 1).astype(np.int8)
+        return RadiusEstimates(R_final, running.astype(np.int8), confidence, method)
+
+
+# --- Tension ---
+
+@dataclass
+class TensionEstimates:
+    """Estimations de tension de tous les axes (mode : code int8 dans TENSION_MODES)."""
+    tension: np.ndarray
+    tension_tau: np.ndarray
+    tension_span: np.ndarray
+    mode: np.ndarray
+    confidence: np.ndarray
+    weight: np.ndarray
+    friction_est: np.ndarray
+    timestamp: np.ndarray
+
+    def axis(self, i: int) -> TensionEstimate:
+        return TensionEstimate(float(self.tension[i]), float(self.tension_tau[i]), float(self.tension_span[i]),
+                               TENSION_MODES[self.mode[i]], float(self.confidence[i]), float(self.weight[i]),
+                               float(self.friction_est[i]), float(self.timestamp[i]))
+
+
+class TensionObserverBank:
+    """
+    M observateurs de tension (TensionObserver) mis à jour ensemble.
+
+    Args:
+        n_axes: Nombre d'axes M
+        material_props: Matériau commun ou un MaterialProperties par axe
+        span_length, dt, omega_min, omega_max, ema_alpha, tension_min, tension_max, J_nominal,
+        min_radius: Comme TensionObserver, scalaires ou par axe
+        friction_observer: FrictionObserverBank optionnel (même nombre d'axes)
+    """
+
+    def __init__(self, n_axes: int, material_props: Union[MaterialProperties, Sequence[MaterialProperties]],
+                 span_length: ArrayLike, dt: ArrayLike = 0.01, omega_min: ArrayLike = 1.0,
+                 omega_max: ArrayLike = 5.0, ema_alpha: ArrayLike = 0.15, tension_min: ArrayLike = 0.0,
+                 tension_max: ArrayLike = 2000.0, friction_observer: Optional[FrictionObserverBank] = None,
+                 J_nominal: ArrayLike = 0.1, min_radius: ArrayLike = 1e-4):
+        self.n = n_axes
+        materials = [material_props] * n_axes if isinstance(material_props, MaterialProperties) else list(material_props)
+        if len(materials) != n_axes:
+            raise ValueError(f"Expected {n_axes} materials, got {len(materials)}")
+        if friction_observer is not None and friction_observer.n != n_axes:
+            raise ValueError("The friction observer bank must have the same number of axes")
+        self.young_modulus = np.array([m.young_modulus for m in materials], dtype=float)
+        self.viscosity = np.array([m.viscosity for m in materials], dtype=float)
+        self.section = np.array([m.thickness * m.width for m in materials], dtype=float)
+        self.span_length = _per_axis(span_length, n_axes)
+        self.dt = _per_axis(dt, n_axes)
+        self.omega_min = _per_axis(omega_min, n_axes)
+        self.omega_max = _per_axis(omega_max, n_axes)
+        self.ema_alpha = _per_axis(ema_alpha, n_axes)
+        self.tension_min = _per_axis(tension_min, n_axes)
+        self.tension_max = _per_axis(tension_max, n_axes)
+        self.J_nominal = _per_axis(J_nominal, n_axes)
+        self.min_radius = _per_axis(min_radius, n_axes)
+        self.friction_observer = friction_observer
+
+        # Span model (explicit Euler, zero initial tension, like the WebSpan of TensionObserver)
+        self.span_strain = np.zeros(n_axes)
+        self.span_tension = np.zeros(n_axes)
+
+        self.current_time = np.zeros(n_axes)
+        self.last_tension = np.zeros(n_axes)
+        self.has_estimate = np.zeros(n_axes, dtype=bool)
+
+    def update(self, tau_motor: ArrayLike, omega: ArrayLike, alpha: ArrayLike, R: ArrayLike,
+               v_upstream: ArrayLike, v_downstream: ArrayLike, J_total: Optional[ArrayLike] = None,
+               strain_upstream: ArrayLike = 0.0, dt: Optional[ArrayLike] = None,
+               tension_measured: Optional[ArrayLike] = None) -> TensionEstimates:
+        """
+        Mise à jour de tous les axes (mêmes entrées que TensionObserver.update, par axe).
+
+        tension_measured peut contenir des NaN : les axes correspondants n'ont pas de mesure.
+        Un rayon inférieur à min_radius donne une estimation par couple nulle.
+        """
+        # Scalar inputs broadcast against the per-axis state
+        dt_used = self.dt if dt is None else np.asarray(dt, dtype=float)
+        self.current_time = self.current_time + dt_used
+        J_used = np.maximum(self.J_nominal if J_total is None else np.asarray(J_total, dtype=float), 1e-6)
+        omega = np.asarray(omega, dtype=float)
+        R = np.asarray(R, dtype=float)
+
+        friction_est = np.zeros(self.n)
+        if self.friction_observer is not None:
+            friction_est = self.friction_observer.update(omega, tau_motor, dt_used, J_used)
+
+        # Torque-balance estimate
+        usable = np.abs(R) >= self.min_radius
+        tension_tau = np.where(usable, (J_used * alpha - tau_motor + friction_est) / np.where(usable, R, 1.0), 0.0)
+        tension_tau = np.minimum(np.maximum(tension_tau, self.tension_min), self.tension_max)
+
+        # Span estimate (WebSpan.update, explicit Euler)
+        L = self.span_length
+        d_strain = (v_upstream / L) * (strain_upstream - self.span_strain) + (np.asarray(v_downstream) - v_upstream) / L
+        self.span_strain = self.span_strain + d_strain * dt_used
+        self.span_tension = np.maximum(
+            0.0, (self.young_modulus * self.span_strain + self.viscosity * d_strain) * self.section)
+        tension_span = self.span_tension
+        speed = np.abs(omega)
+        if tension_measured is not None:
+            measured = np.asarray(tension_measured, dtype=float)
+            tension_span = np.where((speed >= self.omega_max) & ~np.isnan(measured), measured, tension_span)
+
+        # Speed-based blending and EMA
+        ramp = (speed - self.omega_min) / (self.omega_max - self.omega_min)
+        low, high = speed <= self.omega_min, speed >= self.omega_max
+        weight = np.where(low, 0.0, np.where(high, 1.0, ramp))
+        tension_raw = np.minimum(np.maximum((1.0 - weight) * tension_tau + weight * tension_span, self.tension_min),
+                                 self.tension_max)
+        tension = (1.0 - self.ema_alpha) * self.last_tension + self.ema_alpha * tension_raw
+        if not self.has_estimate.all():
+            tension = np.where(self.has_estimate, tension, tension_raw)
+            self.has_estimate[:] = True
+        self.last_tension = tension
+
+        # torque (0) / fusion (1) / span (2), as in TENSION_MODES
+        mode = ((weight > 0.01).astype(np.int8) + (weight >= 0.99)).astype(np.int8)
+        confidence = np.where(low, 0.7, np.where(high, 0.9, 0.7 + 0.2 * ramp))
+        return TensionEstimates(tension, tension_tau, tension_span, mode, confidence, weight,
+                                np.asarray(friction_est, dtype=float), self.current_time)
+
+    def reset(self, mask=None):
+        """Comme TensionObserver.reset (l'état du span n'est pas réinitialisé)."""
+        selected = _mask(mask, self.n)
+        self.current_time = np.where(selected, 0.0, self.current_time)
+        self.last_tension = np.where(selected, 0.0, self.last_tension)
+        self.has_estimate = self.has_estimate & ~selected
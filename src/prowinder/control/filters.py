@@ -1,25 +1,63 @@
 import numpy as np
-from scipy import signal
+
+
+def _signal():
+    """scipy.signal, importé au premier besoin (son import coûte plus d'une seconde)."""
+    from scipy import signal
+    return signal
+
 
 class AdaptiveNotchFilter:
     """
     Filtre coupe-bande (Notch) adaptatif pour supprimer les résonances mécaniques
     qui varient avec le rayon de la bobine (f_resonance ~ 1/sqrt(J)).
+
+    Les coefficients sont conçus à la première utilisation (process, b, a, zi) puis à chaque
+    changement de fréquence : tant que le filtre n'est que réglé (adapt), SciPy n'est pas chargé.
     """
     def __init__(self, center_freq: float, q_factor: float, sampling_rate: float):
         self.fs = sampling_rate
         self.Q = q_factor
         self.f0 = center_freq
-        self.b, self.a = self._design_filter(self.f0)
-        self.zi = signal.lfilter_zi(self.b, self.a)
+        self._ba = None  # (b, a) for self.f0, designed lazily
+        self._zi = None
 
     def _design_filter(self, freq):
         """Conçoit le filtre pour une fréquence donnée."""
         # Fréquence normalisée
         w0 = freq / (self.fs / 2)
-        b, a = signal.iirnotch(w0, self.Q)
+        b, a = _signal().iirnotch(w0, self.Q)
         return b, a
 
+    def _coefficients(self):
+        if self._ba is None:
+            self._ba = self._design_filter(self.f0)
+            self._zi = _signal().lfilter_zi(*self._ba)
+        return self._ba
+
+    @property
+    def b(self) -> np.ndarray:
+        return self._coefficients()[0]
+
+    @property
+    def a(self) -> np.ndarray:
+        return self._coefficients()[1]
+
+    @property
+    def zi(self) -> np.ndarray:
+        self._coefficients()
+        return self._zi
+
+    @zi.setter
+    def zi(self, value: np.ndarray):
+        self._coefficients()
+        self._zi = value
+
+    def retune(self, freq: float):
+        """Change la fréquence centrale ; le filtre est reconçu (et son état réinitialisé) au prochain usage."""
+        self.f0 = freq
+        self._ba = None
+
     def adapt(self, current_inertia: float, base_inertia: float, base_freq: float):
         """
         Adapte la fréquence du filtre en fonction de l'inertie actuelle.
@@ -29,14 +67,13 @@ class AdaptiveNotchFilter:
             new_freq = base_freq * np.sqrt(base_inertia / current_inertia)
             # Limites de sécurité
             new_freq = max(1.0, min(new_freq, self.fs / 2.1))
-            
+
             if abs(new_freq - self.f0) > 0.5: # Hystérésis de mise à jour
-                self.f0 = new_freq
-                self.b, self.a = self._design_filter(self.f0)
                 # Note: Resetting zi might cause a jump, in production use state-preserving update
-                self.zi = signal.lfilter_zi(self.b, self.a)
+                self.retune(new_freq)
 
     def process(self, data_point: float) -> float:
         """Applique le filtre à un échantillon."""
-        filtered, self.zi = signal.lfilter(self.b, self.a, [data_point], zi=self.zi)
+        b, a = self._coefficients()
+        filtered, self._zi = _signal().lfilter(b, a, [data_point], zi=self._zi)
         return filtered[0]
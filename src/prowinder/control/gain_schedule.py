@@ -0,0 +1,141 @@
+"""
+Tables de séquencement de gains (gain scheduling) de la boucle de tension.
+
+Les gains PI (kp, ki) et la fréquence du filtre coupe-bande sont calculés hors ligne sur
+une grille régulière (rayon, vitesse ligne) — voir simulation.linearization.design_gain_schedule —
+et rangés dans un unique tableau float32 compact. En ligne, la commande lit la table par
+interpolation bilinéaire en O(1) : l'indice de cellule est obtenu par arithmétique sur la
+grille régulière, sans recherche ni conception par pas.
+
+Hors de la grille, les valeurs sont celles du bord le plus proche.
+
+Example:
+    >>> schedule = design_gain_schedule(config, np.linspace(0.05, 0.3, 26), np.linspace(0.5, 10.0, 8))
+    >>> schedule.save("gains.npz")
+    >>> config = SystemConfig(gain_schedule=GainSchedule.load("gains.npz"))
+"""
+
+from dataclasses import dataclass
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+# Scheduled quantities, in the order of the last axis of GainSchedule.values
+SCHEDULE_FIELDS = ("tension_kp", "tension_ki", "notch_freq")
+
+
+class ScheduledGains(NamedTuple):
+    """Gains lus dans la table pour un point de fonctionnement."""
+    tension_kp: float
+    tension_ki: float
+    notch_freq: float  # Hz
+
+
+@dataclass(eq=False)
+class GainSchedule:
+    """
+    Table (rayon x vitesse) des gains de la boucle de tension.
+
+    Args:
+        radius_min, radius_step: Grille régulière des rayons (m)
+        speed_min, speed_step: Grille régulière des vitesses ligne (m/s)
+        values: Tableau (n_radius, n_speed, len(SCHEDULE_FIELDS)), stocké en float32
+    """
+    radius_min: float
+    radius_step: float
+    speed_min: float
+    speed_step: float
+    values: np.ndarray
+
+    def __post_init__(self):
+        self.values = np.ascontiguousarray(self.values, dtype=np.float32)
+        if self.values.ndim != 3 or self.values.shape[2] != len(SCHEDULE_FIELDS):
+            raise ValueError(f"values must have shape (n_radius, n_speed, {len(SCHEDULE_FIELDS)})")
+        if self.radius_step <= 0 or self.speed_step <= 0:
+            raise ValueError("Grid steps must be positive")
+        # Plain nested lists: scalar indexing is much cheaper than on a NumPy array
+        self._table = self.values.astype(float).tolist()
+        self._n_radius, self._n_speed = self.values.shape[:2]
+
+    @classmethod
+    def from_grid(cls, radius: np.ndarray, speed: np.ndarray, values: np.ndarray) -> "GainSchedule":
+        """Construit la table depuis des grilles 1D régulières (np.linspace)."""
+        steps = []
+        for name, axis in (("radius", radius), ("speed", speed)):
+            axis = np.asarray(axis, dtype=float)
+            if axis.ndim != 1:
+                raise ValueError(f"{name} grid must be one-dimensional")
+            step = (axis[-1] - axis[0]) / (len(axis) - 1) if len(axis) > 1 else 1.0
+            if not np.allclose(np.diff(axis), step, rtol=1e-6, atol=0.0):
+                raise ValueError(f"{name} grid must be uniformly spaced")
+            steps.append((float(axis[0]), float(step)))
+        (r0, dr), (v0, dv) = steps
+        return cls(r0, dr, v0, dv, values)
+
+    @property
+    def radius(self) -> np.ndarray:
+        return self.radius_min + self.radius_step * np.arange(self._n_radius)
+
+    @property
+    def speed(self) -> np.ndarray:
+        return self.speed_min + self.speed_step * np.arange(self._n_speed)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Table d'une grandeur (n_radius, n_speed)."""
+        return self.values[..., SCHEDULE_FIELDS.index(name)]
+
+    @staticmethod
+    def _cell(x: float, x0: float, step: float, n: int) -> Tuple[int, float]:
+        u = (x - x0) / step
+        if u <= 0.0 or n == 1:
+            return 0, 0.0
+        if u >= n - 1:
+            return n - 2, 1.0
+        i = int(u)
+        return i, u - i
+
+    def lookup(self, radius: float, speed: float) -> ScheduledGains:
+        """Interpolation bilinéaire en O(1) (scalaire, appelée à chaque pas de commande)."""
+        i, fr = self._cell(radius, self.radius_min, self.radius_step, self._n_radius)
+        j, fv = self._cell(abs(speed), self.speed_min, self.speed_step, self._n_speed)
+        table = self._table
+        i1 = min(i + 1, self._n_radius - 1)
+        j1 = min(j + 1, self._n_speed - 1)
+        a, b, c, d = table[i][j], table[i][j1], table[i1][j], table[i1][j1]
+        w00, w01, w10, w11 = (1 - fr) * (1 - fv), (1 - fr) * fv, fr * (1 - fv), fr * fv
+        return ScheduledGains(*(w00 * a[k] + w01 * b[k] + w10 * c[k] + w11 * d[k] for k in range(len(SCHEDULE_FIELDS))))
+
+    def interpolate(self, radius, speed) -> np.ndarray:
+        """Version vectorisée de lookup : tableau forme(radius, speed) + (len(SCHEDULE_FIELDS),)."""
+        R, v = np.broadcast_arrays(np.asarray(radius, dtype=float), np.abs(np.asarray(speed, dtype=float)))
+
+        def cell(x, x0, step, n):
+            u = np.clip((x - x0) / step, 0.0, n - 1)
+            i = np.minimum(u.astype(int), max(n - 2, 0))
+            return i, np.minimum(i + 1, n - 1), (u - i)[..., None]
+
+        i, i1, fr = cell(R, self.radius_min, self.radius_step, self._n_radius)
+        j, j1, fv = cell(v, self.speed_min, self.speed_step, self._n_speed)
+        table = self.values.astype(float)
+        return ((1 - fr) * ((1 - fv) * table[i, j] + fv * table[i, j1])
+                + fr * ((1 - fv) * table[i1, j] + fv * table[i1, j1]))
+
+    def save(self, path: str):
+        """Enregistre la table au format .npz."""
+        np.savez(path, grid=np.array([self.radius_min, self.radius_step, self.speed_min, self.speed_step]),
+                 values=self.values, fields=np.array(SCHEDULE_FIELDS))
+
+    @classmethod
+    def load(cls, path: str) -> "GainSchedule":
+        with np.load(path) as data:
+            if tuple(data["fields"]) != SCHEDULE_FIELDS:
+                raise ValueError(f"{path}: unexpected schedule fields {tuple(data['fields'])}")
+            return cls(*data["grid"].tolist(), data["values"])
+
+    def __getstate__(self):
+        # The nested-list cache is rebuilt on unpickling
+        return {name: getattr(self, name) for name in ("radius_min", "radius_step", "speed_min", "speed_step", "values")}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__post_init__()
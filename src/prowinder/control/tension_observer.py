@@ -17,6 +17,9 @@ from ..mechanics.material import MaterialProperties, WebMaterial
 from ..mechanics.web_span import WebSpan, SpanProperties
 from .observers import FrictionObserver
 
+# Possible values of TensionEstimate.mode (index = compact integer code)
+TENSION_MODES = ("torque", "fusion", "span")
+
 
 @dataclass
 class TensionEstimate:
@@ -1,5 +1,13 @@
+from dataclasses import dataclass
 import numpy as np
 
+@dataclass
+class FrictionProperties:
+    coulomb_coeff: float = 0.5       # Nm (Tc)
+    viscous_coeff: float = 0.01      # Nm.s/rad (Kv)
+    stiction_coeff: float = 1.2      # Nm (Ts)
+    stribeck_velocity: float = 0.5   # rad/s (vs)
+
 class FrictionModel:
     """
     Modèle de friction complèt incluant le frottement de Coulomb, visqueux et l'effet Stribeck.
@@ -1,6 +1,13 @@
 from dataclasses import dataclass
+import math
 import numpy as np
 
+# Discretization of the linear blocks: "euler" (historical) or "exact" (zero-order hold)
+DISCRETIZATIONS = ("euler", "exact")
+
+# Peak torque of the drive, as a multiple of the rated torque (often 2x nominal)
+PEAK_TORQUE_RATIO = 2.0
+
 @dataclass
 class MotorSpecs:
     name: str
@@ -13,15 +20,21 @@ class Motor:
     """
     Modèle dynamique du moteur électrique + variateur.
     Simule la réponse du couple (retard drive) et les limites physiques.
+
+    discretization : "euler" (T += dt/tau * (T_ref - T), instable si dt > 2*tau) ou
+    "exact" (bloqueur d'ordre 0 : T += (1 - exp(-dt/tau)) * (T_ref - T), stable pour tout dt).
     """
-    def __init__(self, specs: MotorSpecs):
+    def __init__(self, specs: MotorSpecs, discretization: str = "euler"):
+        if discretization not in DISCRETIZATIONS:
+            raise ValueError(f"Unknown discretization '{discretization}'")
         self.specs = specs
+        self.discretization = discretization
         self.current_torque = 0.0
         self.target_torque = 0.0
         
     def set_torque_command(self, torque_ref: float):
         """Définit la consigne de couple (limitée par le couple nominal)."""
-        limit = self.specs.rated_torque * 2.0 # Peak torque souvent 2x Nominal
+        limit = self.specs.rated_torque * PEAK_TORQUE_RATIO
         self.target_torque = np.clip(torque_ref, -limit, limit)
 
     def update(self, dt: float, current_speed: float) -> float:
@@ -33,8 +46,12 @@ class Motor:
         # Constante de temps du drive (tau = 1/bandwidth)
         tau = 1.0 / self.specs.torque_bandwidth
         
-        # Discrétisation Euler 1er ordre: T_new = T_old + (dt/tau)*(T_ref - T_old)
-        d_torque = (self.target_torque - self.current_torque) * (dt / tau)
+        if self.discretization == "exact":
+            # Solution exacte du 1er ordre à consigne constante sur le pas
+            d_torque = (self.target_torque - self.current_torque) * -math.expm1(-dt / tau)
+        else:
+            # Discrétisation Euler 1er ordre: T_new = T_old + (dt/tau)*(T_ref - T_old)
+            d_torque = (self.target_torque - self.current_torque) * (dt / tau)
         self.current_torque += d_torque
         
         # Limite de puissance à haute vitesse (P = C*w)
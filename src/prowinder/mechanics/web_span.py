@@ -1,5 +1,7 @@
 from dataclasses import dataclass
+import math
 from .material import WebMaterial
+from .motor import DISCRETIZATIONS
 
 @dataclass
 class SpanProperties:
@@ -16,8 +18,14 @@ class WebSpan:
     
     Loi de comportement : 
     d(Strain)/dt = (v2 - v1) / L + (v1/L) * (Strain_in - Strain)
+
+    discretization : "euler" (historique) ou "exact" : à vitesses constantes sur le pas,
+    l'équation est linéaire du 1er ordre et se résout en forme close (bloqueur d'ordre 0).
     """
-    def __init__(self, material: WebMaterial, props: SpanProperties):
+    def __init__(self, material: WebMaterial, props: SpanProperties, discretization: str = "euler"):
+        if discretization not in DISCRETIZATIONS:
+            raise ValueError(f"Unknown discretization '{discretization}'")
+        self.discretization = discretization
         self.material = material
         self.length = props.length
         self.tension = props.initial_tension
@@ -37,6 +45,9 @@ class WebSpan:
         Ici on travaille en déformation (Strain) pour être plus générique (Kelvin-Voigt possible).
         d(eps)/dt = (v_down - v_up)/L + (v_up/L)*(eps_up - eps)
         """
+        if self.discretization == "exact":
+            return self._update_exact(v_upstream, v_downstream, dt, strain_upstream)
+
         # 1. Transport de déformation (Convection)
         # Si v_upstream > 0, de la matière déformée entre dans le span
         convection_term = (v_upstream / self.length) * (strain_upstream - self.current_strain)
@@ -54,3 +65,23 @@ class WebSpan:
         self.tension = self.material.compute_tension(self.current_strain, strain_rate=d_strain)
         
         return self.tension
+
+    def _update_exact(self, v_upstream: float, v_downstream: float, dt: float, strain_upstream: float) -> float:
+        """
+        Solution exacte de d(eps)/dt = a - b*eps (a, b constants sur le pas) :
+        eps(dt) = eps_ss + (eps - eps_ss) * exp(-b*dt), avec eps_ss = a/b.
+        La vitesse de déformation du terme visqueux est la moyenne sur le pas.
+        """
+        b = v_upstream / self.length
+        a = (v_downstream - v_upstream) / self.length + b * strain_upstream
+        strain = self.current_strain
+
+        # (1 - exp(-b*dt)) / b, with its limit dt when the upstream speed vanishes
+        x = b * dt
+        gain = -math.expm1(-x) / b if abs(x) > 1e-12 else dt
+        new_strain = strain + (a - b * strain) * gain
+
+        strain_rate = (new_strain - strain) / dt
+        self.current_strain = new_strain
+        self.tension = self.material.compute_tension(new_strain, strain_rate=strain_rate)
+        return self.tension
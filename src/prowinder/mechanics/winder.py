@@ -3,6 +3,7 @@ import numpy as np
 from .roller import Roller
 from .material import WebMaterial, MaterialProperties
 from .friction import FrictionModel
+from .motor import DISCRETIZATIONS
 
 class Winder(Roller):
     """
@@ -12,16 +13,21 @@ class Winder(Roller):
     - L'inertie variable (J propto R^4)
     """
     def __init__(self, name: str, core_inertia: float, core_radius: float, 
-                 material: WebMaterial, friction_model: FrictionModel):
+                 material: WebMaterial, friction_model: FrictionModel, discretization: str = "euler"):
         super().__init__(name, core_inertia, core_radius, friction_model)
+        if discretization not in DISCRETIZATIONS:
+            raise ValueError(f"Unknown discretization '{discretization}'")
         
         self.core_radius = core_radius
         self.material = material
         self.initial_radius = core_radius # Default start at core
+        self.discretization = discretization
         
     def set_initial_state(self, initial_radius: float, initial_speed: float = 0.0):
         self.radius = initial_radius
         self.omega = initial_speed
+        self.initial_radius = initial_radius
+        self.angle = 0.0
         
     def get_total_inertia(self) -> float:
         """
@@ -36,6 +42,13 @@ class Winder(Roller):
         J_coil = 0.5 * math.pi * rho * L * (pow(R, 4) - pow(R0, 4))
         return self.J_base + J_coil
 
+    def get_radius_rate(self) -> float:
+        """
+        Vitesse de variation du rayon dR/dt (m/s).
+        Approximation simple : n tours/sec * epaisseur, avec n = omega / 2pi
+        """
+        return (self.omega / (2 * np.pi)) * self.material.props.thickness
+
     def update_geometric(self, dt: float):
         """
         Met à jour le rayon en fonction de la vitesse de rotation (Conservation masse/volume).
@@ -45,15 +58,16 @@ class Winder(Roller):
         - Omega > 0 : Enroulement 
         - Omega < 0 : Déroulement
         (Convention à définir clairement dans le projet)
+
+        En discrétisation "exact", le rayon n'est pas cumulé pas à pas mais recalculé en forme
+        close depuis l'angle cumulé (spirale d'Archimède) : R = R_init + e * theta / (2*pi).
         """
-        thickness = self.material.props.thickness
-        line_speed = self.omega * self.radius
-        
+        if self.discretization == "exact":
+            self._update_from_angle(dt)
+            return
+
         if self.radius > 0:
-            # Approximation simple : n tours/sec * epaisseur
-            # n = omega / 2pi
-            # dR/dt = n * thickness
-            dr_dt = (self.omega / (2 * np.pi)) * thickness
+            dr_dt = self.get_radius_rate()
             
             self.radius += dr_dt * dt
             
@@ -61,3 +75,14 @@ class Winder(Roller):
             if self.radius < self.core_radius:
                 self.radius = self.core_radius
 
+    def _update_from_angle(self, dt: float):
+        if self.radius <= 0:
+            return
+        thickness = self.material.props.thickness
+        self.angle += self.omega * dt
+        radius = self.initial_radius + thickness * self.angle / (2 * np.pi)
+        if radius < self.core_radius:
+            # Stop on the core: rewind the angle so that the roll regrows from it
+            radius = self.core_radius
+            self.angle = (self.core_radius - self.initial_radius) * 2 * np.pi / thickness
+        self.radius = radius
@@ -0,0 +1,29 @@
+"""
+Constantes câblées du jumeau numérique (mandrin, observateurs, filtre coupe-bande).
+
+Source unique pour les trois moteurs de simulation : DigitalTwin (objets), le noyau à
+état plat (kernel.make_params) et BatchDigitalTwin. Une valeur modifiée ici l'est pour
+tous ; aucun moteur ne doit répéter ces nombres en dur.
+"""
+
+# Unwinder core (Winder)
+CORE_INERTIA = 0.02     # kg.m^2
+CORE_RADIUS = 0.05      # m
+
+# Dummy initial span tension, proportional to the web width (N per m of width)
+INITIAL_TENSION_PER_WIDTH = 100.0
+
+# FrictionObserver used by the control loops
+FRICTION_OBSERVER_GAIN = 20.0
+
+# TensionObserver settings
+OBS_OMEGA_MIN = 1.0         # rad/s, below: torque-based estimate only
+OBS_OMEGA_MAX = 5.0         # rad/s, above: span-based estimate only
+OBS_EMA_ALPHA = 0.15
+OBS_TENSION_MIN = 0.0       # N
+OBS_TENSION_MAX = 2000.0    # N
+OBS_MIN_RADIUS = 1e-4       # m
+
+# AdaptiveNotchFilter on the torque command
+NOTCH_BASE_FREQ = 20.0      # Hz, rescaled by 1/sqrt(J) in open loop
+NOTCH_Q_FACTOR = 10.0
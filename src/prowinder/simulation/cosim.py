@@ -0,0 +1,415 @@
+"""
+Serveur de co-simulation asyncio : un parc de jumeaux exposé sur une socket locale.
+
+Pour les essais d'intégration automate / SCADA, un seul processus héberge des dizaines de
+machines (un BatchDigitalTwin vectorisé ou une liste de DigitalTwin) et les fait avancer
+ensemble, un pas dt par tick. Les clients (TCP ou socket Unix) écrivent des consignes et
+lisent tension, vitesse et rayon avec un protocole binaire compact à trames de taille fixe
+(little-endian) :
+
+    requête (24 octets) : REQUEST = "<BBHIdd"
+        type, réservé, twin_id, seq, speed_ref (m/s), tension_ref (N)
+    réponse (64 octets) : REPLY = "<BBHIQdddddd"
+        type, statut, twin_id, seq, tick, time, tension, omega, radius, torque, tension_est
+
+Types : MSG_SETPOINT (nouvelles consignes, réponse après le tick suivant), MSG_READ
+(réponse après le tick suivant), MSG_INFO (réponse immédiate : twin_id = nombre de
+jumeaux, time = dt, tick = tick courant). Le numéro `seq` est renvoyé tel quel, ce qui
+permet d'enchaîner plusieurs requêtes sans attendre les réponses.
+
+Cadencement :
+- period=None (pas à pas) : un tick est déclenché dès qu'une requête arrive, après avoir
+  laissé la boucle collecter toutes les requêtes déjà reçues ;
+- period=dt : tick sur l'horloge de la boucle asyncio (temps réel souple, sans rattrapage).
+
+Chaque tick applique d'abord toutes les consignes reçues, avance tous les jumeaux, puis
+répond en une seule écriture par client. La latence (réception de la requête -> envoi de
+la réponse) est mesurée par connexion, identifiée par "<numéro>:<pair>" ; à la déconnexion,
+une connexion rejoint un historique borné (closed_history) et un cumul, si bien qu'un client
+qui se reconnecte périodiquement ne fait pas grossir le serveur.
+
+Example:
+    >>> server = CoSimServer(BatchDigitalTwin.replicate(SystemConfig(), 24), period=1e-3)
+    >>> await server.start(port=5020)
+    >>> client = await CoSimClient.connect(port=5020)
+    >>> reading = await client.setpoint(3, speed_ref=5.0, tension_ref=120.0)
+    >>> reading.tension, server.stats()['clients']
+"""
+
+import asyncio
+import itertools
+from collections import deque
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from prowinder.simulation.batch_twin import BatchDigitalTwin
+from prowinder.simulation.digital_twin import DigitalTwin
+from prowinder.simulation.monte_carlo import P2Quantile, RunningStats
+
+REQUEST = struct.Struct("<BBHIdd")
+REPLY = struct.Struct("<BBHIQdddddd")
+
+MSG_SETPOINT = 1
+MSG_READ = 2
+MSG_INFO = 3
+
+STATUS_OK = 0
+STATUS_BAD_TWIN = 1
+STATUS_BAD_TYPE = 2
+
+# Reply channels after the header, in wire order
+READING_CHANNELS = ("time", "tension", "omega", "radius", "torque", "tension_est")
+
+
+class Reading(NamedTuple):
+    """Réponse décodée : état d'un jumeau après le tick `tick`."""
+    twin_id: int
+    tick: int
+    time: float
+    tension: float
+    omega: float
+    radius: float
+    torque: float
+    tension_est: float
+
+
+def encode_request(kind: int, twin_id: int, seq: int, speed_ref: float = 0.0, tension_ref: float = 0.0) -> bytes:
+    return REQUEST.pack(kind, 0, twin_id, seq, speed_ref, tension_ref)
+
+
+def decode_reply(frame: bytes):
+    """(type, statut, seq, Reading)."""
+    kind, status, twin_id, seq, tick, *values = REPLY.unpack(frame)
+    return kind, status, seq, Reading(twin_id, tick, *values)
+
+
+@dataclass
+class ClientStats:
+    """Requêtes et latences (ns) d'une connexion, agrégées en flux (mémoire constante)."""
+    connection: int
+    peer: str
+    requests: int = 0
+    errors: int = 0
+    latency_ns: RunningStats = field(default_factory=RunningStats)
+    latency_p99_ns: P2Quantile = field(default_factory=lambda: P2Quantile(0.99))
+
+    def record(self, latency_ns: int):
+        self.latency_ns.update(latency_ns)
+        self.latency_p99_ns.update(latency_ns)
+
+    @property
+    def key(self) -> str:
+        """Identifiant unique de la connexion : numéro d'ordre et pair."""
+        return f"{self.connection}:{self.peer}"
+
+    def summary(self) -> Dict[str, float]:
+        latency = self.latency_ns
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'latency_mean_us': latency.mean / 1e3,
+            'latency_p99_us': self.latency_p99_ns.value / 1e3 if latency.count else 0.0,
+            'latency_max_us': latency.max / 1e3 if latency.count else 0.0,
+        }
+
+
+class _Pending(NamedTuple):
+    client: ClientStats
+    writer: asyncio.StreamWriter
+    kind: int
+    twin_id: int
+    seq: int
+    received_ns: int
+
+
+class CoSimServer:
+    """
+    Héberge un parc de jumeaux et le fait avancer au rythme des requêtes ou d'une période.
+
+    Args:
+        twins: BatchDigitalTwin (pas vectorisé) ou liste de DigitalTwin (même dt)
+        period: Période du tick (s) sur l'horloge de la boucle ; None = tick à la demande
+        speed_ref, tension_ref: Consignes initiales de toutes les machines
+        clock: Horloge (ns) des mesures de latence
+        closed_history: Connexions fermées dont le détail reste dans stats() ; les plus
+            anciennes ne sont plus comptées que dans le cumul 'closed'
+    """
+
+    def __init__(self, twins: Union[BatchDigitalTwin, Sequence[DigitalTwin]], period: Optional[float] = None,
+                 speed_ref: float = 0.0, tension_ref: float = 0.0, clock=time.perf_counter_ns,
+                 closed_history: int = 16):
+        if isinstance(twins, BatchDigitalTwin):
+            self.batch, self.twins = twins, None
+            n, dt = twins.n, twins.dt
+        else:
+            self.batch, self.twins = None, list(twins)
+            if not self.twins:
+                raise ValueError("CoSimServer needs at least one twin")
+            dts = {twin.config.dt for twin in self.twins}
+            if len(dts) != 1:
+                raise ValueError(f"All twins must share the same dt (got {sorted(dts)})")
+            n, dt = len(self.twins), dts.pop()
+        if n > 0xFFFF:
+            raise ValueError("At most 65535 twins can be addressed")
+        if period is not None and period <= 0:
+            raise ValueError("period must be positive")
+        self.n, self.dt, self.period = n, dt, period
+        self.clock = clock
+        self.speed_ref = np.full(n, float(speed_ref))
+        self.tension_ref = np.full(n, float(tension_ref))
+        self.readings = np.zeros((n, len(READING_CHANNELS)))
+        self.tick_count = 0
+        self.tick_ns = RunningStats()
+        self.tick_requests = RunningStats()
+        # Open connections by number; closed ones are kept in a bounded history and a running total
+        self.clients: Dict[int, ClientStats] = {}
+        self.closed_clients = deque(maxlen=closed_history)
+        self.closed = {'connections': 0, 'requests': 0, 'errors': 0}
+        self._connections = itertools.count(1)
+        self._pending: List[_Pending] = []
+        self._wakeup = asyncio.Event()
+        self._server = None
+        self._ticker = None
+
+    # --- Lifecycle ---
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None):
+        """Ouvre la socket (TCP, ou Unix si `path` est donné) et lance la boucle de ticks."""
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        self._ticker = asyncio.create_task(self._tick_loop())
+        return self
+
+    @property
+    def address(self):
+        """Adresse d'écoute (host, port) ou chemin de la socket Unix."""
+        return self._server.sockets[0].getsockname()
+
+    async def close(self):
+        if self._ticker is not None:
+            self._ticker.cancel()
+            try:
+                await self._ticker
+            except asyncio.CancelledError:
+                pass
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    # --- Connections ---
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # Unix socket clients have no peer name: all would report the socket path
+        peer = writer.get_extra_info('peername') or writer.get_extra_info('sockname')
+        client = ClientStats(next(self._connections), str(peer))
+        self.clients[client.connection] = client
+        try:
+            while True:
+                frame = await reader.readexactly(REQUEST.size)
+                received = self.clock()
+                kind, _, twin_id, seq, speed_ref, tension_ref = REQUEST.unpack(frame)
+                client.requests += 1
+                if kind == MSG_INFO:
+                    writer.write(REPLY.pack(kind, STATUS_OK, min(self.n, 0xFFFF), seq, self.tick_count,
+                                            self.dt, 0.0, 0.0, 0.0, 0.0, 0.0))
+                    client.record(self.clock() - received)
+                    continue
+                status = STATUS_OK if kind in (MSG_SETPOINT, MSG_READ) else STATUS_BAD_TYPE
+                if status == STATUS_OK and twin_id >= self.n:
+                    status = STATUS_BAD_TWIN
+                if status != STATUS_OK:
+                    client.errors += 1
+                    writer.write(REPLY.pack(kind, status, twin_id, seq, self.tick_count, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0))
+                    client.record(self.clock() - received)
+                    continue
+                if kind == MSG_SETPOINT:
+                    # Applied at the start of the next tick (last write of the tick wins)
+                    self.speed_ref[twin_id], self.tension_ref[twin_id] = speed_ref, tension_ref
+                self._pending.append(_Pending(client, writer, kind, twin_id, seq, received))
+                self._wakeup.set()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            del self.clients[client.connection]
+            self.closed_clients.append(client)
+            self.closed['connections'] += 1
+            self.closed['requests'] += client.requests
+            self.closed['errors'] += client.errors
+
+    # --- Ticks ---
+
+    async def _tick_loop(self):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            if self.period is None:
+                await self._wakeup.wait()
+                await asyncio.sleep(0)  # Let the other connections queue what they have already received
+            else:
+                deadline += self.period
+                delay = deadline - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    deadline = loop.time()  # Late: no catch-up, the schedule slips
+            self._wakeup.clear()
+            writers = self.tick()
+            await asyncio.gather(*(writer.drain() for writer in writers), return_exceptions=True)
+
+    def _step(self):
+        """Avance tous les jumeaux d'un pas et met à jour self.readings."""
+        readings = self.readings
+        if self.batch is not None:
+            batch = self.batch
+            batch.step(self.speed_ref, self.tension_ref)
+            readings[:, 0] = batch.time
+            readings[:, 1] = batch.tension
+            readings[:, 2] = batch.omega
+            readings[:, 3] = batch.radius
+            readings[:, 4] = batch.motor_torque
+            readings[:, 5] = batch.tension_est
+        else:
+            for i, twin in enumerate(self.twins):
+                sample = twin.step(self.speed_ref[i], self.tension_ref[i])
+                readings[i] = (sample.time, sample.tension, sample.omega, sample.radius,
+                               sample.torque, sample.tension_est)
+
+    def tick(self):
+        """Un tick : consignes en attente déjà appliquées, pas de simulation, réponses groupées par client."""
+        pending, self._pending = self._pending, []
+        start = self.clock()
+        self._step()
+        self.tick_count += 1
+        self.tick_ns.update(self.clock() - start)
+        self.tick_requests.update(len(pending))
+
+        frames: Dict[asyncio.StreamWriter, List[bytes]] = {}
+        for request in pending:
+            frames.setdefault(request.writer, []).append(
+                REPLY.pack(request.kind, STATUS_OK, request.twin_id, request.seq, self.tick_count,
+                           *self.readings[request.twin_id]))
+        for writer, chunk in frames.items():
+            if not writer.is_closing():
+                writer.write(b"".join(chunk))
+        sent = self.clock()
+        for request in pending:
+            request.client.record(sent - request.received_ns)
+        return list(frames)
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Statistiques du serveur (ticks), de chaque connexion ouverte ou récemment fermée
+        (latences, champ 'open') et cumul de toutes les connexions fermées.
+        """
+        tick_ns = self.tick_ns
+        connections = sorted([*self.closed_clients, *self.clients.values()], key=lambda client: client.connection)
+        return {
+            'ticks': self.tick_count,
+            'tick_mean_us': tick_ns.mean / 1e3,
+            'tick_max_us': tick_ns.max / 1e3 if tick_ns.count else 0.0,
+            'requests_per_tick': self.tick_requests.mean,
+            'clients': {client.key: {**client.summary(), 'open': client.connection in self.clients}
+                        for client in connections},
+            'closed': dict(self.closed),
+        }
+
+
+class CoSimClient:
+    """
+    Client asyncio : requêtes numérotées, plusieurs requêtes peuvent être en vol à la fois.
+
+    Example:
+        >>> client = await CoSimClient.connect(path="/tmp/plant.sock")
+        >>> readings = await asyncio.gather(*(client.read(i) for i in range(24)))
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader, self.writer = reader, writer
+        self._seq = itertools.count()
+        self._waiting: Dict[int, asyncio.Future] = {}
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None) -> "CoSimClient":
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _receive(self):
+        try:
+            while True:
+                kind, status, seq, reading = decode_reply(await self.reader.readexactly(REPLY.size))
+                future = self._waiting.pop(seq, None)
+                if future is None or future.done():
+                    continue
+                if status == STATUS_OK:
+                    future.set_result(reading)
+                else:
+                    reason = "unknown twin" if status == STATUS_BAD_TWIN else "unknown message type"
+                    future.set_exception(ValueError(f"Request {seq} rejected: {reason} ({reading.twin_id})"))
+        except (asyncio.IncompleteReadError, ConnectionError) as error:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"Co-simulation server closed the connection: {error}"))
+            self._waiting.clear()
+
+    async def request(self, kind: int, twin_id: int, speed_ref: float = 0.0, tension_ref: float = 0.0) -> Reading:
+        seq = next(self._seq) & 0xFFFFFFFF
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[seq] = future
+        self.writer.write(encode_request(kind, twin_id, seq, speed_ref, tension_ref))
+        return await future
+
+    async def setpoint(self, twin_id: int, speed_ref: float, tension_ref: float) -> Reading:
+        """Écrit les consignes ; retourne l'état après le tick qui les a appliquées."""
+        return await self.request(MSG_SETPOINT, twin_id, speed_ref, tension_ref)
+
+    async def read(self, twin_id: int) -> Reading:
+        """État du jumeau après le prochain tick."""
+        return await self.request(MSG_READ, twin_id)
+
+    async def info(self):
+        """(nombre de jumeaux, dt, tick courant)."""
+        reading = await self.request(MSG_INFO, 0)
+        return reading.twin_id, reading.time, reading.tick
+
+    async def close(self):
+        self._receiver.cancel()
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+if __name__ == "__main__":
+    # Serve a plant floor of identical machines: python -m prowinder.simulation.cosim 24 5020
+    import sys
+    from prowinder.simulation.digital_twin import SystemConfig
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 5020
+
+    async def main():
+        config = SystemConfig()
+        server = CoSimServer(BatchDigitalTwin.replicate(config, count), period=config.dt, tension_ref=100.0)
+        await server.start(port=port)
+        print(f"Serving {count} twins on {server.address} (dt = {config.dt} s)")
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
@@ -1,16 +1,53 @@
 import numpy as np
-from dataclasses import dataclass, field
-from typing import List, Dict
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, List, Dict, Callable, Iterator, NamedTuple, Optional, Sequence, Union
 
 from prowinder.mechanics.motor import Motor, MotorSpecs
 from prowinder.mechanics.winder import Winder
 from prowinder.mechanics.material import WebMaterial, MaterialProperties
-from prowinder.mechanics.friction import FrictionModel
+from prowinder.mechanics.friction import FrictionModel, FrictionProperties
 from prowinder.mechanics.web_span import WebSpan, SpanProperties
 from prowinder.control.observers import FrictionObserver
-from prowinder.control.tension_observer import TensionObserver
+from prowinder.control.tension_observer import TensionObserver, TensionEstimate, TENSION_MODES
 from prowinder.control.filters import AdaptiveNotchFilter
+from prowinder.control.gain_schedule import GainSchedule
 from prowinder.mechanics.dynamics import InertiaTracker
+from prowinder.simulation.history import PolicyRecorder, LoggingPolicy
+from prowinder.simulation.profiles import Profile, ReferenceArrays, TaperTension, sample_references
+from prowinder.simulation.scheduler import MultiRateScheduler
+from prowinder.simulation.integrators import INTEGRATORS, IMPLICIT_STEPS, PlantInputs, PlantState
+from prowinder.simulation.profiling import StageProfiler, attach
+from prowinder.simulation.trace_file import TraceReader, TraceWriter
+from prowinder.simulation.events import Event, EventMonitor, EventRecord
+from prowinder.simulation import constants, kernel
+
+# A reference is a constant, a function of simulation time t (s) or a Profile
+# (a TaperTension is also accepted for the tension reference)
+Reference = Union[float, Callable[[float], float], Profile, TaperTension]
+
+
+class TwinSample(NamedTuple):
+    """Échantillon compact d'un pas de simulation (mêmes canaux que DigitalTwin.history)."""
+    time: float
+    omega: float
+    radius: float
+    tension: float
+    tension_est: float
+    torque: float
+    tension_mode: str
+
+
+# Structured dtype of the blocks yielded by DigitalTwin.iter_steps(block_size > 1);
+# tension_mode is stored as an index into TENSION_MODES
+SAMPLE_DTYPE = np.dtype([(name, np.float64) for name in TwinSample._fields[:-1]] + [('tension_mode', np.int8)])
+
+
+@dataclass
+class SensorNoise:
+    """Bruit blanc gaussien des capteurs (écarts-types, 0 = capteur parfait)."""
+    speed_std: float = 0.0    # rad/s, winder speed measurement
+    tension_std: float = 0.0  # N, load cell
+
 
 @dataclass
 class SystemConfig:
@@ -20,6 +57,8 @@ class SystemConfig:
     # PET, Density=1390, Width=0.15m, Thickness=50um. Viscosity=5e7 (Calibrated Phase 1)
     material: MaterialProperties = field(default_factory=lambda: MaterialProperties("PET_Legacy", 1390.0, 4e9, 50e-6, width=0.15, viscosity=5e7))
     motor_specs: MotorSpecs = field(default_factory=lambda: MotorSpecs("Siemens_1FK7", 10.0, 300.0, 0.005))
+    friction: FrictionProperties = field(default_factory=FrictionProperties)  # Unwinder bearing friction
+    sensor_noise: SensorNoise = field(default_factory=SensorNoise)
     initial_radius: float = 0.2
     span_length: float = 1.5  # Adjusted to match validation setup
     
@@ -30,82 +69,362 @@ class SystemConfig:
     speed_ki: float = 5.0  # Speed Loop Integral
     tension_kp: float = 0.5 # Tension Loop Gain
     tension_ki: float = 2.0 # Tension Loop Integral
+    # Scheduled tension gains and notch frequency over (radius, line speed), read every control tick
+    # (see linearization.design_gain_schedule); None = fixed tension_kp / tension_ki
+    gain_schedule: Optional[GainSchedule] = None
 
+    # Multi-rate execution: dt is the plant step; control and estimators may run slower
+    # (integer multiples of dt, None = every plant step)
+    control_dt: Optional[float] = None
+    estimator_dt: Optional[float] = None
+
+    # Plant integration scheme: "explicit" (Euler), "semi_implicit" or "rosenbrock".
+    # The implicit schemes stay stable at 5-10 ms plant steps.
+    integrator: str = "explicit"
+    # Linear blocks (motor lag, span convection, roll geometry): "euler" or "exact" (zero-order hold)
+    discretization: str = "exact"
+    # Execution engine: "objects" (component objects) or "kernel" (flat state vector + pure step function)
+    engine: str = "objects"
+
+    # History logging (channel selection, decimation, min/max envelope, ring buffer)
+    logging_policy: LoggingPolicy = field(default_factory=LoggingPolicy)
     
+@dataclass(frozen=True, eq=False)
+class TwinCheckpoint:
+    """
+    Instantané compact d'un DigitalTwin en cours de simulation (sérialisable par pickle).
+
+    `state` suit la disposition kernel.STATE_FIELDS et couvre tous les blocs : procédé,
+    intégrateurs des régulateurs, états internes des observateurs et ordonnanceur.
+    `rng_state` est l'état du générateur du bruit capteur (None sans bruit) : un jumeau
+    restauré ou dérivé tire la même suite de bruit que l'original.
+    L'historique n'en fait pas partie : un jumeau restauré ou dérivé (fork) repart d'un
+    historique vide.
+    """
+    config: SystemConfig
+    state: np.ndarray
+    rng_state: Optional[Dict[str, Any]] = None
+
+    @property
+    def time(self) -> float:
+        return float(self.state[kernel.STATE_INDEX['time']])
+
+
+# Parameters that define the meaning of the state vector itself (tick period, roll geometry):
+# they cannot be changed when a twin is restored from a checkpoint
+_CHECKPOINT_STRUCTURAL = ('dt', 'control_dt', 'estimator_dt', 'initial_radius')
+
+
 class DigitalTwin:
     """
     Jumeau Numérique orienté Objet (Modular Design).
     Modèle inspiré de PowerSys : Blocs Séparés (Moteur, Charge, Span).
     """
-    def __init__(self, config: SystemConfig):
+    def __init__(self, config: SystemConfig, rng: Optional[np.random.Generator] = None,
+                 profiler: Optional[StageProfiler] = None):
+        """
+        Args:
+            config: Configuration du système
+            rng: Générateur aléatoire du bruit capteur (config.sensor_noise) ; un générateur
+                non initialisé est créé si le bruit est actif et qu'aucun n'est fourni.
+            profiler: Chronométrage par étage (voir profiling.StageProfiler) ; None = aucun coût
+        """
+        if config.integrator not in INTEGRATORS:
+            raise ValueError(f"Unknown integrator '{config.integrator}' (expected one of {INTEGRATORS})")
+        if config.engine not in kernel.ENGINES:
+            raise ValueError(f"Unknown engine '{config.engine}' (expected one of {kernel.ENGINES})")
         self.config = config
         self.time = 0.0
+        self.scheduler = MultiRateScheduler(config.dt, {
+            'control': config.control_dt or config.dt,
+            'estimator': config.estimator_dt or config.dt,
+        })
         
         # 1. Instantiate Components
         self.material = WebMaterial(config.material)
         
-        self.motor = Motor(config.motor_specs)
+        self.motor = Motor(config.motor_specs, discretization=config.discretization)
         
-        friction_winder = FrictionModel(coulomb_coeff=0.5, viscous_coeff=0.01, stiction_coeff=1.2, stribeck_velocity=0.5)
+        friction_winder = FrictionModel(**asdict(config.friction))
+        noise = config.sensor_noise
+        self.noisy_sensors = noise.speed_std > 0 or noise.tension_std > 0
+        self.rng = rng if rng is not None or not self.noisy_sensors else np.random.default_rng()
         
         # The Unwinder (Dérouleur)
         self.unwinder = Winder(
             name="Unwinder_01",
-            core_inertia=0.02,
-            core_radius=0.05,
+            core_inertia=constants.CORE_INERTIA,
+            core_radius=constants.CORE_RADIUS,
             material=self.material,
-            friction_model=friction_winder
+            friction_model=friction_winder,
+            discretization=config.discretization,
         )
         self.unwinder.set_initial_state(config.initial_radius, initial_speed=0.0)
         
         # The Web Span (Zone de tension)
         self.web_span = WebSpan(
             material=self.material,
-            props=SpanProperties(length=config.span_length, initial_tension=config.material.width * 100) # Dummy init
+            props=SpanProperties(length=config.span_length,
+                                 initial_tension=config.material.width * constants.INITIAL_TENSION_PER_WIDTH),
+            discretization=config.discretization,
         )
 
         # 2. Control System Elements
-        self.observer = FrictionObserver(FrictionModel(0,0,0,0), gain=20.0)
+        self.observer = FrictionObserver(FrictionModel(0,0,0,0), gain=constants.FRICTION_OBSERVER_GAIN)
         # Use actual inertia for observer initialization
         J_est = self.unwinder.get_total_inertia()
         
         self.tension_observer = TensionObserver(
             material_props=config.material,
             span_length=config.span_length,
-            dt=config.dt,
+            dt=self.scheduler.period('estimator'),
+            omega_min=constants.OBS_OMEGA_MIN,
+            omega_max=constants.OBS_OMEGA_MAX,
+            ema_alpha=constants.OBS_EMA_ALPHA,
+            tension_min=constants.OBS_TENSION_MIN,
+            tension_max=constants.OBS_TENSION_MAX,
+            min_radius=constants.OBS_MIN_RADIUS,
             friction_observer=None, # Disabled to avoid tension absorption
             J_nominal=J_est if J_est > 0.01 else 0.01,
         )
-        self.notch_filter = AdaptiveNotchFilter(20.0, 10.0, 1/config.dt)
+        self.notch_filter = AdaptiveNotchFilter(constants.NOTCH_BASE_FREQ, constants.NOTCH_Q_FACTOR,
+                                                1/self.scheduler.period('control'))
         self.speed_integrator = 0.0 # For Speed Control Loop
         self.tension_integrator = 0.0 # For Tension Control Loop
         self.prev_omega = 0.0
+        # Held estimator outputs (sample-and-hold between estimator ticks)
+        self.tension_estimate = None
+        self.friction_estimate = 0.0
         
-        # Data Logging
-        self.history = {
-            'time': [],
-            'omega': [],
-            'radius': [],
-            'tension': [],
-            'tension_est': [],
-            'tension_mode': [],
-            'torque': []
+        # Data Logging (preallocated NumPy columns, modes stored as int8 codes)
+        self.history = PolicyRecorder(
+            float_channels=('time', 'omega', 'radius', 'tension', 'tension_est', 'torque'),
+            category_channels={'tension_mode': TENSION_MODES},
+            policy=config.logging_policy,
+        )
+        # Event occurrences of the last run(events=...)
+        self.events: List[EventRecord] = []
+
+        # Flat-state engine: the state vector is authoritative, the objects above are a view
+        self.kernel_params = None
+        self.state = None
+        if config.engine == "kernel":
+            if self.noisy_sensors:
+                raise ValueError("Sensor noise requires the 'objects' engine")
+            self.kernel_params = kernel.make_params(config, (self.scheduler.divisors['control'], self.scheduler.divisors['estimator']))
+            self.state = self.pack_state()
+
+        # Opt-in per-stage timing: instance methods are swapped for timed wrappers
+        self.profiler = profiler
+        if config.engine == "kernel":
+            stages = {'kernel': (self, '_advance_kernel')}
+        else:
+            stages = {
+                'sensing': (self, '_sense'),
+                'tension_observer': (self.tension_observer, 'update'),
+                'friction_observer': (self.observer, 'update'),
+                'estimation': (self, '_estimate'),
+                'notch_filter': (self.notch_filter, 'adapt'),
+                'control': (self, '_control'),
+                'actuation': (self.motor, 'update'),
+                'plant': (self, '_plant'),
+            }
+        stages.update(step=(self, 'advance'), logging=(self.history, 'append'))
+        attach(profiler, stages)
+
+    def step(self, speed_ref: float, tension_ref: float, speed_ref_dot: Optional[float] = None) -> TwinSample:
+        """
+        Avance le jumeau d'un pas dt et enregistre l'échantillon dans l'historique.
+
+        Args:
+            speed_ref: Consigne vitesse ligne (m/s)
+            tension_ref: Consigne tension (N)
+            speed_ref_dot: Dérivée analytique de la consigne vitesse (m/s²). Si fournie, le
+                feedforward d'inertie utilise l'accélération exacte au lieu d'une différence finie.
+        """
+        sample = self.advance(speed_ref, tension_ref, speed_ref_dot)
+        self.history.append(sample[:6], sample[6:])
+        return sample
+
+    def advance(self, speed_ref: float, tension_ref: float, speed_ref_dot: Optional[float] = None) -> TwinSample:
+        """
+        Avance le jumeau d'un pas dt sans rien enregistrer (mêmes arguments que step()).
+
+        Pour les boucles d'exécution qui gèrent elles-mêmes la journalisation (temps réel,
+        avance rapide, flux).
+        """
+        if self.state is not None:
+            return self._advance_kernel(speed_ref, tension_ref, speed_ref_dot)
+
+        # Multi-rate execution: estimators and control run on their own ticks and
+        # their outputs (tension estimate, friction estimate, torque command) are held in between.
+        if self.scheduler.due('estimator'):
+            self._estimate(speed_ref)
+        if self.scheduler.due('control'):
+            self._control(speed_ref, tension_ref, speed_ref_dot)
+        real_tension, torque_applied_motor = self._plant(speed_ref)
+
+        self.scheduler.advance()
+        self.time += self.config.dt
+
+        estimate = self.tension_estimate
+        return TwinSample(self.time, self.unwinder.omega, self.unwinder.radius, real_tension,
+                          estimate.tension, torque_applied_motor, estimate.mode)
+
+    def _advance_kernel(self, speed_ref: float, tension_ref: float, speed_ref_dot: Optional[float] = None) -> TwinSample:
+        self.state = kernel.step(self.state, (speed_ref, tension_ref, speed_ref_dot), self.kernel_params)
+        self.unpack_state(self.state)
+        estimate = self.tension_estimate
+        return TwinSample(self.time, self.unwinder.omega, self.unwinder.radius, self.web_span.tension,
+                          estimate.tension, self.motor.current_torque, estimate.mode)
+
+    def checkpoint(self) -> TwinCheckpoint:
+        """Instantané de l'état dynamique complet (voir TwinCheckpoint)."""
+        state = self.state.copy() if self.state is not None else self.pack_state()
+        state.flags.writeable = False
+        rng_state = self.rng.bit_generator.state if self.rng is not None else None
+        return TwinCheckpoint(self.config, state, rng_state)
+
+    def restore(self, checkpoint: TwinCheckpoint):
+        """
+        Ramène le jumeau à l'état d'un checkpoint, générateur du bruit capteur compris
+        (l'historique est conservé tel quel).
+        """
+        for name in _CHECKPOINT_STRUCTURAL:
+            if getattr(checkpoint.config, name) != getattr(self.config, name):
+                raise ValueError(f"Checkpoint has a different '{name}' than this twin")
+        if checkpoint.state.shape != (kernel.STATE_SIZE,):
+            raise ValueError(f"Checkpoint state must have {kernel.STATE_SIZE} entries")
+        state = np.array(checkpoint.state, dtype=float)
+        if self.state is not None:
+            self.state = state
+        self.unpack_state(state)
+        if checkpoint.rng_state is not None and self.noisy_sensors:
+            # New generator: a generator shared with other twins is left untouched
+            bit_generator = getattr(np.random, checkpoint.rng_state['bit_generator'])()
+            bit_generator.state = checkpoint.rng_state
+            self.rng = np.random.Generator(bit_generator)
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint: TwinCheckpoint, **overrides) -> "DigitalTwin":
+        """
+        Nouveau jumeau repartant d'un checkpoint, avec d'éventuelles modifications de
+        configuration (gains, mode de commande, moteur, engine, ...).
+        """
+        structural = set(overrides).intersection(_CHECKPOINT_STRUCTURAL)
+        if structural:
+            raise ValueError(f"Cannot override {sorted(structural)} when restoring a checkpoint")
+        twin = cls(replace(checkpoint.config, **overrides) if overrides else checkpoint.config)
+        twin.restore(checkpoint)
+        return twin
+
+    def fork(self, **overrides) -> "DigitalTwin":
+        """
+        Branche indépendante partant de l'état courant (préfixe commun de simulation).
+
+        Example:
+            >>> twin.run()                      # warm-up
+            >>> branches = [twin.fork(tension_kp=kp) for kp in (0.2, 0.5, 1.0)]
+        """
+        return DigitalTwin.from_checkpoint(self.checkpoint(), **overrides)
+
+    def pack_state(self) -> np.ndarray:
+        """Rassemble tout l'état dynamique des objets dans un vecteur (disposition kernel.STATE_FIELDS)."""
+        estimate = self.tension_estimate
+        obs = self.tension_observer
+        values = {
+            'time': self.time,
+            'tick': self.scheduler.tick,
+            'omega': self.unwinder.omega,
+            'radius': self.unwinder.radius,
+            'angle': self.unwinder.angle,
+            'motor_torque': self.motor.current_torque,
+            'target_torque': self.motor.target_torque,
+            'span_strain': self.web_span.current_strain,
+            'tension': self.web_span.tension,
+            'prev_omega': self.prev_omega,
+            'obs_time': obs.current_time,
+            'obs_strain': obs.web_span.current_strain,
+            'obs_last_tension': obs.last_tension,
+            'obs_has_estimate': obs.has_estimate,
+            'fric_state': self.observer.state_estimate,
+            'fric_estimate': self.observer.estimated_friction,
+            'tension_est': estimate.tension if estimate is not None else 0.0,
+            'tension_mode': TENSION_MODES.index(estimate.mode) if estimate is not None else 0,
+            'speed_integrator': self.speed_integrator,
+            'tension_integrator': self.tension_integrator,
+            'prev_w_ref': getattr(self, 'prev_w_ref', 0.0),
+            'has_prev_w_ref': hasattr(self, 'prev_w_ref'),
+            'notch_freq': self.notch_filter.f0,
         }
+        return np.array([values[name] for name in kernel.STATE_FIELDS], dtype=float)
 
-    def step(self, speed_ref: float, tension_ref: float):
-        dt = self.config.dt
+    def unpack_state(self, state: np.ndarray):
+        """Répercute un vecteur d'état (kernel.STATE_FIELDS) sur les objets du jumeau."""
+        (time, tick, omega, radius, angle, motor_torque, target_torque, span_strain, tension,
+         prev_omega, obs_time, obs_strain, obs_last_tension, obs_has_estimate,
+         fric_state, fric_estimate, tension_est, tension_mode,
+         speed_integrator, tension_integrator, prev_w_ref, has_prev_w_ref, notch_freq) = state.tolist()
+
+        self.time = time
+        self.scheduler.tick = int(tick)
+        self.unwinder.omega = omega
+        self.unwinder.radius = radius
+        self.unwinder.angle = angle
+        self.motor.current_torque = motor_torque
+        self.motor.target_torque = target_torque
+        self.web_span.current_strain = span_strain
+        self.web_span.tension = tension
+        self.prev_omega = prev_omega
+
+        obs = self.tension_observer
+        obs.current_time = obs_time
+        obs.web_span.current_strain = obs_strain
+        obs.last_tension = obs_last_tension
+        obs.has_estimate = bool(obs_has_estimate)
+        self.observer.state_estimate = fric_state
+        self.observer.estimated_friction = fric_estimate
+        if obs.has_estimate:
+            estimate = self.tension_estimate
+            if estimate is None or estimate.tension != tension_est or estimate.timestamp != obs_time:
+                # Only the fields carried by the state vector are restored
+                self.tension_estimate = TensionEstimate(tension_est, 0.0, 0.0, TENSION_MODES[int(tension_mode)],
+                                                        0.0, 0.0, 0.0, obs_time)
+        else:
+            self.tension_estimate = None
+
+        self.speed_integrator = speed_integrator
+        self.tension_integrator = tension_integrator
+        if has_prev_w_ref:
+            self.prev_w_ref = prev_w_ref
+        elif hasattr(self, 'prev_w_ref'):
+            del self.prev_w_ref
+        if notch_freq != self.notch_filter.f0:
+            self.notch_filter.retune(notch_freq)
+
+    def _sense(self):
+        """Mesures virtuelles : vitesse dérouleur, rayon, inertie totale estimée."""
         G = self.config.gear_ratio
-        
-        # --- A. SENSING (Virtual Sensors) ---
         meas_speed_winder = self.unwinder.omega 
+        if self.noisy_sensors and self.config.sensor_noise.speed_std > 0:
+            meas_speed_winder += self.rng.normal(0.0, self.config.sensor_noise.speed_std)
         est_inertia_roll = self.unwinder.get_total_inertia()
         # Add Motor Inertia reflection: J_total = J_roll + J_motor * G^2
         # (Assuming perfect coupling)
         J_motor = self.config.motor_specs.rotor_inertia
         est_inertia_total = est_inertia_roll + J_motor * (G**2)
-        
-        meas_radius = self.unwinder.radius
+        return meas_speed_winder, self.unwinder.radius, est_inertia_total
+
+    def _estimate(self, speed_ref: float):
+        """Tâche estimateurs (cadence estimator_dt) : TensionObserver + FrictionObserver."""
+        dt = self.scheduler.period('estimator')
+        G = self.config.gear_ratio
+
+        # --- A. SENSING (Virtual Sensors) ---
+        meas_speed_winder, meas_radius, est_inertia_total = self._sense()
         meas_tension = self.web_span.tension # Measured by Load Cell on span
+        if self.noisy_sensors and self.config.sensor_noise.tension_std > 0:
+            meas_tension += self.rng.normal(0.0, self.config.sensor_noise.tension_std)
         v_unwinder_surface = self.unwinder.omega * self.unwinder.radius
         v_process = speed_ref
 
@@ -132,7 +451,7 @@ class DigitalTwin:
         # Update history for next step
         self.prev_omega = meas_speed_winder
 
-        tension_estimate = self.tension_observer.update(
+        self.tension_estimate = self.tension_observer.update(
             tau_motor=torque_for_obs,
             omega=meas_speed_winder,
             alpha=alpha_est,
@@ -141,9 +460,20 @@ class DigitalTwin:
             v_downstream=v_process,
             J_total=est_inertia_total,
             tension_measured=meas_tension,
+            dt=dt,
         )
-        meas_tension = tension_estimate.tension
-        
+
+        # Friction Compensation estimate (used by CLOSED_LOOP_TENSION and OPEN_LOOP_TORQUE)
+        if self.config.control_mode != "SPEED_LIMIT":
+            self.friction_estimate = self.observer.update(meas_speed_winder, torque_for_obs, dt, est_inertia_total)
+
+    def _control(self, speed_ref: float, tension_ref: float, speed_ref_dot: Optional[float] = None):
+        """Tâche commande (cadence control_dt) : calcule et applique la consigne de couple."""
+        dt = self.scheduler.period('control')
+        G = self.config.gear_ratio
+        meas_speed_winder, meas_radius, est_inertia_total = self._sense()
+        meas_tension = self.tension_estimate.tension
+
         # --- B. CONTROL (The "Brain") ---
         
         # 1. Torque Calculation Logic
@@ -190,16 +520,17 @@ class DigitalTwin:
             t_ff_tension = (tension_ref * meas_radius) / G
             
             # Friction Compensation
-            t_fric = self.observer.update(meas_speed_winder, self.motor.current_torque*G, dt, est_inertia_total) / G
+            t_fric = self.friction_estimate / G
             
             # Inertia Compensation
             w_ref_winder = speed_ref / meas_radius
             accel_comp = 0.0
+            if speed_ref_dot is not None:
+                # Exact d(v/R)/dt = v'/R - v*R'/R^2 from the profile derivative and roll geometry
+                accel_comp = speed_ref_dot / meas_radius - speed_ref * self.unwinder.get_radius_rate() / meas_radius**2
             # Simple Derivative
-            if hasattr(self, 'prev_w_ref'):
+            elif hasattr(self, 'prev_w_ref'):
                 accel_comp = (w_ref_winder - self.prev_w_ref) / dt
-            else:
-                self.prev_w_ref = w_ref_winder
             self.prev_w_ref = w_ref_winder # Actually update it!
             
             t_iner = (est_inertia_total * accel_comp) / G
@@ -211,8 +542,14 @@ class DigitalTwin:
             # Anti-windup clamping
             if self.tension_integrator > 10000: self.tension_integrator = 10000
             if self.tension_integrator < -10000: self.tension_integrator = -10000
-            
-            pid_output_force = (self.config.tension_kp * tension_error) + (self.config.tension_ki * self.tension_integrator)
+
+            kp, ki = self.config.tension_kp, self.config.tension_ki
+            if self.config.gain_schedule is not None:
+                kp, ki, notch_freq = self.config.gain_schedule.lookup(meas_radius, speed_ref)
+                if notch_freq != self.notch_filter.f0:
+                    self.notch_filter.retune(notch_freq)
+
+            pid_output_force = (kp * tension_error) + (ki * self.tension_integrator)
             
             # Convert Force Correction to Torque Correction
             t_closed_loop = (pid_output_force * meas_radius) / G
@@ -227,12 +564,12 @@ class DigitalTwin:
         else:
             # "OPEN_LOOP_TORQUE" (Legacy)
             # 1. Filter
-            self.notch_filter.adapt(est_inertia_total, base_inertia=1.0, base_freq=20.0)
+            self.notch_filter.adapt(est_inertia_total, base_inertia=1.0, base_freq=constants.NOTCH_BASE_FREQ)
             
             # 2. Compute Command
             t_tens = (tension_ref * meas_radius) / G
             # Friction Compensation (Reflected to Motor)
-            t_fric = self.observer.update(meas_speed_winder, self.motor.current_torque*G, dt, est_inertia_total) / G
+            t_fric = self.friction_estimate / G
             
             # Inertia Compensation: J * alpha_ref
             # Estimate alpha_ref from speed_ref derivative? 
@@ -262,12 +599,21 @@ class DigitalTwin:
             torque_cmd_total = -t_tens - t_fric + t_iner
             
         self.motor.set_torque_command(torque_cmd_total)
-        
+
+    def _plant(self, speed_ref: float):
+        """Physique (cadence dt) : moteur, span, arbre dérouleur. Retourne (tension, couple moteur)."""
+        dt = self.config.dt
+        G = self.config.gear_ratio
+        J_motor = self.config.motor_specs.rotor_inertia
+
+        if self.config.integrator != "explicit":
+            return self._plant_implicit(speed_ref)
+
         # --- C. ACTUATION & PLANT PHYSISCS (The "World") ---
         
         # 1. Motor Dynamics
         # Motor produces torque.
-        torque_applied_motor = self.motor.update(dt, meas_speed_winder*G)
+        torque_applied_motor = self.motor.update(dt, self.unwinder.omega*G)
         
         # Torque at Winder Shaft
         torque_at_winder = torque_applied_motor * G
@@ -316,25 +662,166 @@ class DigitalTwin:
         # self.unwinder.apply_dynamics(net_torque, dt) <--- skipping this to use correct J_total
         
         self.unwinder.update_geometric(dt)
-        
-        self.time += dt
-        
-        # Log
-        self.history['time'].append(self.time)
-        self.history['omega'].append(self.unwinder.omega)
-        self.history['radius'].append(self.unwinder.radius)
-        self.history['tension'].append(real_tension)
-        self.history['tension_est'].append(tension_estimate.tension)
-        self.history['tension_mode'].append(tension_estimate.mode)
-        self.history['torque'].append(torque_applied_motor)
 
+        return real_tension, torque_applied_motor
 
-    def run(self):
+    def _plant_implicit(self, speed_ref: float):
+        """Physique couplée (omega, strain, couple moteur) intégrée par un schéma implicite."""
+        dt = self.config.dt
+        G = self.config.gear_ratio
+        props = self.config.material
+        friction = self.unwinder.friction_model
+
+        inputs = PlantInputs(
+            target_torque=self.motor.target_torque,
+            v_downstream=speed_ref,
+            radius=self.unwinder.radius,
+            inertia=self.unwinder.get_total_inertia() + self.config.motor_specs.rotor_inertia * G**2,
+            gear_ratio=G,
+            torque_bandwidth=self.config.motor_specs.torque_bandwidth,
+            span_length=self.web_span.length,
+            section=props.thickness * props.width,
+            young_modulus=props.young_modulus,
+            viscosity=props.viscosity,
+            friction_coulomb=friction.Tc,
+            friction_viscous=friction.Kv,
+            friction_stiction=friction.Ts,
+            friction_stribeck=friction.vs,
+        )
+        state = PlantState(self.unwinder.omega, self.web_span.current_strain, self.motor.current_torque)
+        state, real_tension = IMPLICIT_STEPS[self.config.integrator](state, inputs, dt)
+
+        self.unwinder.omega = float(state.omega)
+        self.web_span.current_strain = float(state.strain)
+        self.web_span.tension = float(real_tension)
+        self.motor.current_torque = float(state.torque)
+
+        self.unwinder.update_geometric(dt)
+
+        return self.web_span.tension, self.motor.current_torque
+
+    def iter_steps(
+        self,
+        speed_ref: Reference = 5.0,
+        tension_ref: Reference = 100.0,
+        duration: Optional[float] = None,
+        block_size: int = 1,
+        record: bool = False,
+    ) -> Iterator[Union[TwinSample, np.ndarray]]:
+        """
+        Déroule la simulation sous forme de flux (mémoire constante).
+
+        Args:
+            speed_ref: Consigne vitesse ligne (m/s), constante ou fonction du temps
+            tension_ref: Consigne tension (N), constante ou fonction du temps
+            duration: Durée à simuler à partir de l'instant courant (None = flux infini)
+            block_size: 1 -> un TwinSample par pas ; k > 1 -> un tableau structuré
+                (SAMPLE_DTYPE) de k pas, le dernier bloc pouvant être plus court
+            record: Enregistre aussi les pas dans self.history
+
+        L'état vit dans le jumeau : on peut interrompre le flux (break / close()) puis
+        rappeler iter_steps() pour reprendre exactement là où la simulation s'est arrêtée.
+        """
+        if block_size < 1:
+            raise ValueError("block_size must be >= 1")
+        dt = self.config.dt
+        remaining = None if duration is None else int(round(duration / dt))
+        mode_code = {mode: i for i, mode in enumerate(TENSION_MODES)}
+        chunk = max(block_size, 1024)  # References are evaluated in bulk, chunk by chunk
+
+        block = np.empty(block_size, dtype=SAMPLE_DTYPE) if block_size > 1 else None
+        filled = 0
+        while remaining is None or remaining > 0:
+            n = chunk if remaining is None else min(chunk, remaining)
+            refs = sample_references(speed_ref, tension_ref, self.time, dt, n)
+            for i in range(n):
+                sample = self.advance(*self.reference_at(refs, i, tension_ref))
+                if record:
+                    self.history.append(sample[:6], sample[6:])
+
+                if block is None:
+                    yield sample
+                    continue
+                block[filled] = sample[:6] + (mode_code[sample.tension_mode],)
+                filled += 1
+                if filled == block_size:
+                    yield block.copy()
+                    filled = 0
+            if remaining is not None:
+                remaining -= n
+
+        if block is not None and filled:
+            yield block[:filled].copy()
+
+    def reference_at(self, refs: ReferenceArrays, i: int, tension_ref: Reference):
+        """
+        Arguments (speed_ref, tension_ref, speed_ref_dot) de advance()/step() pour le pas i d'un
+        bloc de consignes précalculé par profiles.sample_references ; une TaperTension est
+        appliquée au rayon courant.
+        """
+        tension = refs.tension[i]
+        if isinstance(tension_ref, TaperTension):
+            tension *= tension_ref.factor(self.unwinder.radius)
+        speed_dot = refs.speed_dot[i] if refs.speed_dot is not None else None
+        return refs.speed[i], tension, speed_dot
+
+    def run(self, speed_ref: Reference = 5.0, tension_ref: Reference = 100.0, events: Sequence[Event] = ()):
+        """
+        Simule `config.duration` secondes et retourne l'historique.
+
+        Les consignes (constantes, fonctions du temps ou Profile) sont évaluées en bloc
+        avant la boucle ; la boucle ne fait qu'indexer les tableaux.
+
+        Args:
+            events: Événements surveillés après chaque pas (voir simulation.events) ; les
+                déclenchements de ce run sont rangés dans self.events (vidé à chaque appel)
+                et un événement terminal arrête la simulation avant `duration`.
+        """
         steps = int(self.config.duration / self.config.dt)
-        for _ in range(steps):
-            self.step(speed_ref=5.0, tension_ref=100.0)
+        self.history.reserve(steps)
+        refs = sample_references(speed_ref, tension_ref, self.time, self.config.dt, steps)
+        self.events = []  # Records of this run only
+        if not events:
+            for i in range(steps):
+                self.step(*self.reference_at(refs, i, tension_ref))
+            return self.history
+
+        monitor = EventMonitor(events, start_time=self.time)
+        self.events = monitor.records
+        for i in range(steps):
+            sample = self.step(*self.reference_at(refs, i, tension_ref))
+            if monitor.check(self, sample):
+                break
         return self.history
 
+    def run_to_trace(
+        self,
+        path,
+        speed_ref: Reference = 5.0,
+        tension_ref: Reference = 100.0,
+        duration: Optional[float] = None,
+        chunk_size: int = 65536,
+        compression: Optional[str] = None,
+    ) -> TraceReader:
+        """
+        Simule en écrivant chaque pas dans un fichier de trace .pwt (mémoire bornée à un
+        bloc, quelle que soit la durée) ; self.history n'est pas rempli.
+
+        Args:
+            path: Fichier de trace
+            duration: Durée à simuler (défaut : config.duration)
+            chunk_size: Pas par bloc du fichier
+            compression: None ou "zlib"
+
+        Returns:
+            Lecteur de la trace écrite
+        """
+        duration = self.config.duration if duration is None else duration
+        with TraceWriter(path, chunk_size=chunk_size, compression=compression) as writer:
+            for block in self.iter_steps(speed_ref, tension_ref, duration, block_size=chunk_size):
+                writer.write(block, labels={'tension_mode': TENSION_MODES})
+        return TraceReader(path)
+
 if __name__ == "__main__":
     # Quick self-test
     sim = DigitalTwin(SystemConfig())
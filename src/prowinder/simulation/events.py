@@ -0,0 +1,183 @@
+"""
+Événements déclaratifs du jumeau numérique (détection de passage par zéro).
+
+Un événement est décrit par une fonction g(twin, sample) -> float évaluée après chaque pas
+de simulation : il se déclenche quand g change de signe (dans le sens `direction`).
+L'instant est localisé à l'intérieur du pas par interpolation linéaire entre les deux
+évaluations encadrantes. Une condition déjà remplie au premier pas du run (g >= 0 pour
+direction=+1, g <= 0 pour direction=-1) se déclenche à l'instant de départ ; un événement
+direction=0 n'a pas de côté « actif » et ne réagit qu'aux changements de signe. Un événement `terminal` arrête DigitalTwin.run() ; un `callback`
+éventuel est appelé à chaque déclenchement.
+
+Événements prédéfinis (picklables, utilisables dans les balayages et le Monte Carlo) :
+- slack(level)            : la tension de bande tombe à `level` (la loi matériau écrête à 0)
+- web_break(tension)      : la tension dépasse la charge de rupture
+- core_reached(margin)    : le rayon atteint le mandrin (butée de Winder.update_geometric)
+- torque_saturation()     : la consigne de couple atteint la limite moteur
+                            (motor.PEAK_TORQUE_RATIO x couple nominal)
+- limit(channel, low, high) : un canal d'échantillon sort de [low, high]
+- divergence()            : une valeur non finie (NaN, inf) apparaît dans l'échantillon
+
+Example:
+    >>> twin = DigitalTwin(config)
+    >>> twin.run(speed, tension, events=[slack(terminal=True), torque_saturation()])
+    >>> twin.events
+    [EventRecord(name='torque_saturation', time=0.0123, step=12, value=...), ...]
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+from prowinder.mechanics.motor import PEAK_TORQUE_RATIO
+
+# g(twin, sample) -> float; the event fires when g crosses zero
+EventFunction = Callable[[object, object], float]
+
+
+@dataclass
+class Event:
+    """
+    Événement déclaratif.
+
+    Args:
+        name: Nom reporté dans les EventRecord
+        function: g(twin, sample) ; doit être picklable pour les pools de processus
+        direction: +1 = montée (g passe de < 0 à >= 0), -1 = descente, 0 = les deux
+        terminal: Arrête la simulation au premier déclenchement
+        callback: Appelé avec (twin, record) à chaque déclenchement
+    """
+    name: str
+    function: EventFunction
+    direction: int = 0
+    terminal: bool = False
+    callback: Optional[Callable[[object, "EventRecord"], None]] = None
+
+
+@dataclass
+class EventRecord:
+    """Déclenchement d'un événement : instant localisé, indice du pas, valeur de g après le pas."""
+    name: str
+    time: float
+    step: int
+    value: float
+    terminal: bool = False
+
+
+class EventMonitor:
+    """Évalue une liste d'événements après chaque pas et enregistre les déclenchements."""
+
+    def __init__(self, events: Sequence[Event], start_time: float = 0.0):
+        for event in events:
+            if event.direction not in (-1, 0, 1):
+                raise ValueError(f"Event '{event.name}': direction must be -1, 0 or +1")
+        self.events = list(events)
+        self.records: List[EventRecord] = []
+        self._previous = [None] * len(self.events)
+        self._previous_time = start_time
+        self._step = 0
+
+    def check(self, twin, sample) -> bool:
+        """Traite le pas qui vient d'être simulé ; retourne True si un événement terminal s'est produit."""
+        stop = False
+        time = sample.time
+        for i, event in enumerate(self.events):
+            g = float(event.function(twin, sample))
+            g_prev = self._previous[i]
+            self._previous[i] = g
+            if math.isnan(g):
+                continue
+            if g_prev is None:
+                # First step: a condition already met counts as a crossing at the start time
+                if not ((event.direction > 0 and g >= 0.0) or (event.direction < 0 and g <= 0.0)):
+                    continue
+                fraction = 0.0
+            else:
+                if math.isnan(g_prev):
+                    continue
+                rising = g_prev < 0.0 <= g
+                falling = g_prev > 0.0 >= g
+                if not ((rising and event.direction >= 0) or (falling and event.direction <= 0)):
+                    continue
+                # Linear zero-crossing localization inside the step
+                fraction = g_prev / (g_prev - g) if g != g_prev else 1.0
+            record = EventRecord(event.name, self._previous_time + fraction * (time - self._previous_time),
+                                 self._step, g, event.terminal)
+            self.records.append(record)
+            if event.callback is not None:
+                event.callback(twin, record)
+            stop = stop or event.terminal
+        self._previous_time = time
+        self._step += 1
+        return stop
+
+
+# --- Predefined events (callable classes rather than closures: picklable) ---
+
+class _SampleChannel:
+    def __init__(self, channel: str, level: float):
+        self.channel, self.level = channel, level
+
+    def __call__(self, twin, sample) -> float:
+        return getattr(sample, self.channel) - self.level
+
+
+class _CoreDistance:
+    def __init__(self, margin: float):
+        self.margin = margin
+
+    def __call__(self, twin, sample) -> float:
+        return sample.radius - (twin.unwinder.core_radius + self.margin)
+
+
+class _TorqueMargin:
+    def __init__(self, fraction: float):
+        self.fraction = fraction
+
+    def __call__(self, twin, sample) -> float:
+        limit = twin.motor.specs.rated_torque * PEAK_TORQUE_RATIO  # Same peak limit as Motor.set_torque_command
+        return abs(twin.motor.target_torque) - self.fraction * limit
+
+
+class _NonFinite:
+    def __call__(self, twin, sample) -> float:
+        return -1.0 if all(math.isfinite(value) for value in sample[:6]) else 1.0
+
+
+def slack(level: float = 0.0, terminal: bool = False, callback=None) -> Event:
+    """Bande détendue : la tension réelle descend à `level` (N)."""
+    return Event("slack", _SampleChannel("tension", level), direction=-1, terminal=terminal, callback=callback)
+
+
+def web_break(breaking_tension: float, terminal: bool = True, callback=None) -> Event:
+    """Rupture de bande : la tension réelle dépasse `breaking_tension` (N)."""
+    return Event("web_break", _SampleChannel("tension", breaking_tension), direction=1, terminal=terminal,
+                 callback=callback)
+
+
+def core_reached(margin: float = 0.0, terminal: bool = True, callback=None) -> Event:
+    """Le rayon descend à `margin` (m) du mandrin."""
+    return Event("core_reached", _CoreDistance(margin), direction=-1, terminal=terminal, callback=callback)
+
+
+def torque_saturation(fraction: float = 1.0 - 1e-9, terminal: bool = False, callback=None) -> Event:
+    """La consigne de couple atteint `fraction` de la limite moteur (PEAK_TORQUE_RATIO x couple nominal)."""
+    return Event("torque_saturation", _TorqueMargin(fraction), direction=1, terminal=terminal, callback=callback)
+
+
+def limit(channel: str, low: Optional[float] = None, high: Optional[float] = None,
+          terminal: bool = True, callback=None) -> List[Event]:
+    """Sortie d'un canal d'échantillon (TwinSample) de [low, high] ; un événement par borne."""
+    events = []
+    if low is not None:
+        events.append(Event(f"{channel}_low", _SampleChannel(channel, low), direction=-1,
+                            terminal=terminal, callback=callback))
+    if high is not None:
+        events.append(Event(f"{channel}_high", _SampleChannel(channel, high), direction=1,
+                            terminal=terminal, callback=callback))
+    return events
+
+
+def divergence(terminal: bool = True, callback=None) -> Event:
+    """Simulation divergente : une voie numérique de l'échantillon n'est plus finie."""
+    return Event("divergence", _NonFinite(), direction=1, terminal=terminal, callback=callback)
@@ -0,0 +1,378 @@
+import numpy as np
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+
+@dataclass
+class LoggingPolicy:
+    """
+    Politique d'enregistrement de l'historique du jumeau numérique.
+
+    - channels : canaux à enregistrer (None = tous ; 'time' est toujours conservé)
+    - decimation : enregistre un pas sur k (le dernier de chaque bloc de k pas)
+    - envelope : conserve min/max/moyenne de chaque bloc pour ne pas masquer les transitoires
+    - ring_buffer : nombre de derniers échantillons pleine cadence conservés (0 = désactivé)
+    """
+    channels: Optional[Tuple[str, ...]] = None
+    decimation: int = 1
+    envelope: bool = False
+    ring_buffer: int = 0
+
+
+class HistoryRecorder(Mapping):
+    """
+    Historique de simulation colonnaire, préalloué par blocs.
+
+    - Les canaux numériques sont stockés dans un seul tableau float64 (ordre Fortran :
+      chaque colonne est contiguë) qui grandit par blocs de `chunk_size` échantillons.
+    - Les canaux de mode (chaînes répétitives, ex: 'torque'/'fusion'/'span') sont stockés
+      en codes de catégorie int8.
+
+    Se comporte comme le dictionnaire historique de DigitalTwin : `history['tension']`
+    renvoie une vue NumPy (sans copie) des échantillons enregistrés, `history['tension_mode']`
+    renvoie les libellés décodés.
+    """
+
+    def __init__(
+        self,
+        float_channels: Sequence[str],
+        category_channels: Optional[Dict[str, Sequence[str]]] = None,
+        chunk_size: int = 4096,
+    ):
+        category_channels = category_channels or {}
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        overlap = set(float_channels) & set(category_channels)
+        if overlap:
+            raise ValueError(f"Channels declared twice: {sorted(overlap)}")
+
+        self.chunk_size = chunk_size
+        self.float_channels = list(float_channels)
+        self.category_channels = list(category_channels)
+        self._column = {name: i for i, name in enumerate(self.float_channels)}
+        self._categories = {name: list(labels) for name, labels in category_channels.items()}
+        self._code_of = {name: {label: i for i, label in enumerate(labels)} for name, labels in self._categories.items()}
+
+        self._capacity = chunk_size
+        self._n = 0
+        self._values = np.empty((chunk_size, len(self.float_channels)), dtype=np.float64, order='F')
+        self._codes = {name: np.empty(chunk_size, dtype=np.int8) for name in self.category_channels}
+
+    # --- Recording ---
+
+    def reserve(self, n_samples: int):
+        """Garantit la place pour `n_samples` échantillons supplémentaires (une seule réallocation)."""
+        needed = self._n + n_samples
+        if needed > self._capacity:
+            self._resize(needed)
+
+    def _resize(self, capacity: int):
+        values = np.empty((capacity, self._values.shape[1]), dtype=np.float64, order='F')
+        values[:self._n] = self._values[:self._n]
+        self._values = values
+        for name, codes in self._codes.items():
+            grown = np.empty(capacity, dtype=np.int8)
+            grown[:self._n] = codes[:self._n]
+            self._codes[name] = grown
+        self._capacity = capacity
+
+    def _encode(self, name: str, label: str) -> int:
+        code_of = self._code_of[name]
+        code = code_of.get(label)
+        if code is None:
+            code = len(code_of)
+            if code > np.iinfo(np.int8).max:
+                raise ValueError(f"Too many categories for channel '{name}'")
+            code_of[label] = code
+            self._categories[name].append(label)
+        return code
+
+    def append(self, values: Sequence[float], labels: Sequence[str] = ()):
+        """
+        Ajoute un échantillon.
+
+        Args:
+            values: Valeurs des canaux numériques, dans l'ordre de `float_channels`
+            labels: Libellés des canaux de catégorie, dans l'ordre de `category_channels`
+        """
+        n = self._n
+        if n == self._capacity:
+            self._resize(self._capacity + self.chunk_size)
+        self._values[n] = values
+        for name, label in zip(self.category_channels, labels):
+            self._codes[name][n] = self._encode(name, label)
+        self._n = n + 1
+
+    def clear(self):
+        """Vide l'historique sans libérer la mémoire allouée."""
+        self._n = 0
+
+    # --- Access ---
+
+    @property
+    def n_samples(self) -> int:
+        return self._n
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name in self._column:
+            return self._values[:self._n, self._column[name]]
+        if name in self._codes:
+            return np.asarray(self._categories[name], dtype=object)[self._codes[name][:self._n]]
+        raise KeyError(name)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.float_channels
+        yield from self.category_channels
+
+    def __len__(self) -> int:
+        return len(self.float_channels) + len(self.category_channels)
+
+    def codes(self, name: str) -> np.ndarray:
+        """Vue sur les codes int8 d'un canal de catégorie."""
+        return self._codes[name][:self._n]
+
+    def categories(self, name: str) -> list:
+        """Libellés d'un canal de catégorie (l'indice est le code)."""
+        return list(self._categories[name])
+
+    @property
+    def nbytes(self) -> int:
+        """Mémoire allouée (octets)."""
+        return self._values.nbytes + sum(c.nbytes for c in self._codes.values())
+
+    def to_dataframe(self):
+        """
+        Exporte en pandas.DataFrame.
+
+        Les colonnes numériques partagent la mémoire de l'enregistreur (pas de copie) ;
+        les canaux de mode deviennent des colonnes `Categorical`.
+        """
+        import pandas as pd
+
+        df = pd.DataFrame(self._values[:self._n], columns=self.float_channels, copy=False)
+        for name in self.category_channels:
+            df[name] = pd.Categorical.from_codes(self.codes(name), categories=self._categories[name])
+        return df
+
+    def to_trace(self, path, **options) -> int:
+        """
+        Écrit l'historique dans un fichier de trace .pwt (voir trace_file.TraceWriter pour
+        les options : compression, chunk_size) ; retourne le nombre d'échantillons.
+        """
+        from prowinder.simulation.trace_file import write_trace
+
+        options.setdefault('time_channel', 'time' if 'time' in self._column else None)
+        columns = {name: self._values[:self._n, i] for name, i in self._column.items()}
+        columns.update({name: self.codes(name) for name in self.category_channels})
+        return write_trace(path, columns, labels=self._categories, **options)
+
+    @classmethod
+    def from_trace(cls, path, t_start: Optional[float] = None, t_end: Optional[float] = None):
+        """Recharge un historique (éventuellement une fenêtre temporelle) depuis un fichier .pwt."""
+        from prowinder.simulation.trace_file import TraceReader
+
+        trace = TraceReader(path)
+        if t_start is None and t_end is None:
+            start, stop = 0, trace.n_samples
+        else:
+            start, stop = trace.index_range(t_start, t_end)
+        recorder = cls(trace.numeric_channels, {name: trace.categories(name) for name in trace.category_channels})
+        recorder.reserve(stop - start)
+        n = stop - start
+        for name, i in recorder._column.items():
+            recorder._values[:n, i] = trace.codes(name, start, stop)
+        for name in recorder.category_channels:
+            recorder._codes[name][:n] = trace.codes(name, start, stop)
+        recorder._n = n
+        return recorder
+
+
+class RingBuffer(Mapping):
+    """
+    Tampon circulaire borné des derniers échantillons (mêmes canaux qu'un HistoryRecorder).
+
+    `ring['tension']` renvoie les échantillons du plus ancien au plus récent.
+    """
+
+    def __init__(self, float_channels: Sequence[str], category_channels: Dict[str, Sequence[str]], capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.float_channels = list(float_channels)
+        self.category_channels = list(category_channels)
+        self._column = {name: i for i, name in enumerate(self.float_channels)}
+        self._categories = {name: list(labels) for name, labels in category_channels.items()}
+        self._code_of = {name: {label: i for i, label in enumerate(labels)} for name, labels in self._categories.items()}
+        self._values = np.empty((capacity, len(self.float_channels)), dtype=np.float64, order='F')
+        self._codes = {name: np.empty(capacity, dtype=np.int8) for name in self.category_channels}
+        self._head = 0      # Next write position
+        self._count = 0     # Number of valid samples
+
+    # Same on-the-fly category extension as HistoryRecorder
+    _encode = HistoryRecorder._encode
+
+    def append(self, values: Sequence[float], labels: Sequence[str] = ()):
+        head = self._head
+        self._values[head] = values
+        for name, label in zip(self.category_channels, labels):
+            self._codes[name][head] = self._encode(name, label)
+        self._head = (head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+    def _order(self) -> np.ndarray:
+        start = (self._head - self._count) % self.capacity
+        return (start + np.arange(self._count)) % self.capacity
+
+    @property
+    def n_samples(self) -> int:
+        return self._count
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name in self._column:
+            return self._values[self._order(), self._column[name]]
+        if name in self._codes:
+            return np.asarray(self._categories[name], dtype=object)[self._codes[name][self._order()]]
+        raise KeyError(name)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.float_channels
+        yield from self.category_channels
+
+    def __len__(self) -> int:
+        return len(self.float_channels) + len(self.category_channels)
+
+    @property
+    def nbytes(self) -> int:
+        """Mémoire allouée (octets)."""
+        return self._values.nbytes + sum(c.nbytes for c in self._codes.values())
+
+
+class PolicyRecorder(HistoryRecorder):
+    """
+    HistoryRecorder piloté par une LoggingPolicy (sélection de canaux, décimation,
+    enveloppe min/max/moyenne par bloc, tampon circulaire pleine cadence).
+
+    `append` reçoit toujours l'échantillon complet (tous les canaux déclarés) à chaque pas ;
+    le filtrage est fait ici. Les enregistrements décimés sont accessibles comme pour
+    HistoryRecorder, l'enveloppe dans `envelope` et le tampon pleine cadence dans `recent`.
+    """
+
+    def __init__(
+        self,
+        float_channels: Sequence[str],
+        category_channels: Optional[Dict[str, Sequence[str]]] = None,
+        policy: Optional[LoggingPolicy] = None,
+        chunk_size: int = 4096,
+    ):
+        category_channels = category_channels or {}
+        policy = policy or LoggingPolicy()
+        if policy.decimation < 1:
+            raise ValueError("LoggingPolicy.decimation must be >= 1")
+        if policy.ring_buffer < 0:
+            raise ValueError("LoggingPolicy.ring_buffer must be >= 0")
+
+        all_float = list(float_channels)
+        if policy.channels is None:
+            selected = set(all_float) | set(category_channels)
+        else:
+            selected = set(policy.channels)
+            unknown = selected - set(all_float) - set(category_channels)
+            if unknown:
+                raise ValueError(f"Unknown logging channels: {sorted(unknown)}")
+            if 'time' in all_float:
+                selected.add('time')
+        kept_float = [name for name in all_float if name in selected]
+        kept_categories = {name: labels for name, labels in category_channels.items() if name in selected}
+
+        super().__init__(kept_float, kept_categories, chunk_size=chunk_size)
+        self.policy = policy
+
+        self._float_pick = None
+        if len(kept_float) != len(all_float):
+            self._float_pick = np.array([all_float.index(name) for name in kept_float], dtype=np.intp)
+        all_categories = list(category_channels)
+        self._label_pick = [all_categories.index(name) for name in kept_categories]
+        self._block_pos = 0
+
+        self.recent = None
+        if policy.ring_buffer > 0:
+            self.recent = RingBuffer(kept_float, kept_categories, policy.ring_buffer)
+
+        self.envelope = None
+        self._env_channels = [name for name in kept_float if name != 'time']
+        if policy.envelope:
+            env_names = ['time']
+            for name in self._env_channels:
+                env_names += [f"{name}_min", f"{name}_max", f"{name}_mean"]
+            self.envelope = HistoryRecorder(env_names, chunk_size=chunk_size)
+            self._env_pick = np.array([kept_float.index(name) for name in self._env_channels], dtype=np.intp)
+            n_env = len(self._env_channels)
+            self._env_min = np.empty(n_env)
+            self._env_max = np.empty(n_env)
+            self._env_sum = np.empty(n_env)
+            self._env_row = np.empty(1 + 3 * n_env)
+
+    def reserve(self, n_samples: int):
+        """Réserve la place pour `n_samples` pas de simulation (avant décimation)."""
+        n_records = n_samples // self.policy.decimation + 1
+        super().reserve(n_records)
+        if self.envelope is not None:
+            self.envelope.reserve(n_records)
+
+    def append(self, values: Sequence[float], labels: Sequence[str] = ()):
+        if self._float_pick is not None:
+            values = np.asarray(values, dtype=np.float64)[self._float_pick]
+        if len(self._label_pick) != len(labels):
+            labels = [labels[i] for i in self._label_pick]
+
+        if self.recent is not None:
+            self.recent.append(values, labels)
+
+        if self.envelope is not None:
+            block = np.asarray(values, dtype=np.float64)[self._env_pick]
+            if self._block_pos == 0:
+                self._env_min[:] = block
+                self._env_max[:] = block
+                self._env_sum[:] = block
+            else:
+                np.minimum(self._env_min, block, out=self._env_min)
+                np.maximum(self._env_max, block, out=self._env_max)
+                self._env_sum += block
+
+        self._block_pos += 1
+        if self._block_pos < self.policy.decimation:
+            return
+
+        # End of block: record the decimated sample (and its envelope)
+        if self.envelope is not None:
+            row = self._env_row
+            time_col = self._column.get('time')
+            row[0] = values[time_col] if time_col is not None else float(self.envelope.n_samples)
+            row[1::3] = self._env_min
+            row[2::3] = self._env_max
+            row[3::3] = self._env_sum / self._block_pos
+            self.envelope.append(row)
+        self._block_pos = 0
+        super().append(values, labels)
+
+    def clear(self):
+        super().clear()
+        self._block_pos = 0
+        if self.envelope is not None:
+            self.envelope.clear()
+        if self.recent is not None:
+            self.recent.clear()
+
+    @property
+    def nbytes(self) -> int:
+        total = super().nbytes
+        if self.envelope is not None:
+            total += self.envelope.nbytes
+        if self.recent is not None:
+            total += self.recent.nbytes
+        return total
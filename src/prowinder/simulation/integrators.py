@@ -0,0 +1,161 @@
+"""
+Intégrateurs du procédé couplé (arbre dérouleur, span, moteur) du jumeau numérique.
+
+L'état intégré est x = (omega, strain, torque) :
+- d(torque)/dt = bw * (T_ref - torque)                       (retard du variateur)
+- d(strain)/dt = (v_down - omega*R)/L - (omega*R/L) * strain  (span, strain_upstream = 0)
+- d(omega)/dt  = (G*torque + T(strain)*R - T_friction(omega)) / J_total
+
+avec T = max(0, (E*strain + eta*d(strain)/dt) * S) (Kelvin-Voigt). Le rayon, l'inertie et
+les consignes sont maintenus constants sur le pas.
+
+- 'explicit'      : Euler explicite historique de DigitalTwin (pas de calcul ici)
+- 'semi_implicit' : Euler linéairement implicite, x+ = x + h (I - hJ)^-1 f(x)
+- 'rosenbrock'    : Rosenbrock ROS2 (ordre 2, L-stable), gamma = 1 + 1/sqrt(2)
+
+Les deux schémas implicites utilisent la jacobienne analytique ; sa structure (le couple
+moteur ne dépend que de lui-même) réduit la résolution à un système 2x2 en forme close.
+Toutes les fonctions acceptent des scalaires ou des tableaux (N,) (BatchDigitalTwin).
+"""
+
+import math
+import numpy as np
+from typing import Callable, Dict, NamedTuple, Tuple
+
+INTEGRATORS = ("explicit", "semi_implicit", "rosenbrock")
+
+ROS2_GAMMA = 1.0 + 1.0 / math.sqrt(2.0)
+
+
+class PlantState(NamedTuple):
+    omega: float   # Winder speed (rad/s)
+    strain: float  # Span strain (-)
+    torque: float  # Motor shaft torque (Nm)
+
+
+class PlantInputs(NamedTuple):
+    """Paramètres et entrées du procédé, maintenus constants sur un pas."""
+    target_torque: float
+    v_downstream: float
+    radius: float
+    inertia: float
+    gear_ratio: float
+    torque_bandwidth: float
+    span_length: float
+    section: float
+    young_modulus: float
+    viscosity: float
+    friction_coulomb: float
+    friction_viscous: float
+    friction_stiction: float
+    friction_stribeck: float  # Must be > 0
+
+
+class PlantJacobian(NamedTuple):
+    """Termes non nuls de la jacobienne df/dx."""
+    ww: float
+    we: float
+    wt: float
+    ew: float
+    ee: float
+    tt: float
+
+
+def _friction(omega, p: PlantInputs):
+    """Couple de frottement (même loi que FrictionModel) et sa dérivée en omega."""
+    stribeck = (p.friction_stiction - p.friction_coulomb) * np.exp(-(omega / p.friction_stribeck) ** 2)
+    sign = np.sign(omega)
+    torque = (p.friction_coulomb + stribeck) * sign + p.friction_viscous * omega
+    # sign(omega) is treated as locally constant (its jump at 0 has no derivative)
+    d_torque = p.friction_viscous - 2.0 * stribeck * omega / p.friction_stribeck ** 2 * sign
+    return torque, d_torque
+
+
+def plant_rhs(x: PlantState, p: PlantInputs) -> Tuple[PlantState, float]:
+    """Retourne (dx/dt, tension du span) pour l'état x."""
+    omega, strain, torque = x
+    v_up = omega * p.radius
+    d_torque = (p.target_torque - torque) * p.torque_bandwidth
+    d_strain = (p.v_downstream - v_up) / p.span_length - (v_up / p.span_length) * strain
+    tension = np.maximum(0.0, (p.young_modulus * strain + p.viscosity * d_strain) * p.section)
+    friction, _ = _friction(omega, p)
+    d_omega = (torque * p.gear_ratio + tension * p.radius - friction) / p.inertia
+    return PlantState(d_omega, d_strain, d_torque), tension
+
+
+def plant_jacobian(x: PlantState, p: PlantInputs) -> PlantJacobian:
+    """Jacobienne analytique du procédé couplé en x."""
+    omega, strain, _ = x
+    R, L = p.radius, p.span_length
+    d_strain = (p.v_downstream - omega * R) / L - (omega * R / L) * strain
+    # Tension is clamped at 0 (slack web): no sensitivity while slack
+    taut = (p.young_modulus * strain + p.viscosity * d_strain) > 0.0
+
+    ew = -(R / L) * (1.0 + strain)
+    ee = -(omega * R / L)
+    dT_dw = taut * p.section * p.viscosity * ew
+    dT_de = taut * p.section * (p.young_modulus + p.viscosity * ee)
+    _, d_friction = _friction(omega, p)
+    return PlantJacobian(
+        ww=(R * dT_dw - d_friction) / p.inertia,
+        we=R * dT_de / p.inertia,
+        wt=p.gear_ratio / p.inertia,
+        ew=ew,
+        ee=ee,
+        tt=-p.torque_bandwidth,
+    )
+
+
+def _solve(jac: PlantJacobian, c: float, rhs: PlantState) -> PlantState:
+    """Résout (I - c*J) k = rhs."""
+    k_t = rhs.torque / (1.0 - c * jac.tt)
+    a11 = 1.0 - c * jac.ww
+    a12 = -c * jac.we
+    a21 = -c * jac.ew
+    a22 = 1.0 - c * jac.ee
+    b1 = rhs.omega + c * jac.wt * k_t
+    b2 = rhs.strain
+    det = a11 * a22 - a12 * a21
+    return PlantState((b1 * a22 - a12 * b2) / det, (a11 * b2 - a21 * b1) / det, k_t)
+
+
+def _axpy(x: PlantState, h: float, k: PlantState) -> PlantState:
+    return PlantState(x.omega + h * k.omega, x.strain + h * k.strain, x.torque + h * k.torque)
+
+
+def step_semi_implicit(x: PlantState, p: PlantInputs, h: float) -> Tuple[PlantState, float]:
+    """Euler linéairement implicite (Rosenbrock à 1 étage) : retourne (x+, tension)."""
+    f, _ = plant_rhs(x, p)
+    k = _solve(plant_jacobian(x, p), h, f)
+    x_new = _axpy(x, h, k)
+    _, tension = plant_rhs(x_new, p)
+    return x_new, tension
+
+
+def step_rosenbrock(x: PlantState, p: PlantInputs, h: float) -> Tuple[PlantState, float]:
+    """
+    Rosenbrock ROS2 (Verwer et al.) : retourne (x+, tension).
+
+    k1 = (I - gamma*h*J)^-1 f(x)
+    k2 = (I - gamma*h*J)^-1 (f(x + h*k1) - 2*k1)
+    x+ = x + 1.5*h*k1 + 0.5*h*k2
+    """
+    c = ROS2_GAMMA * h
+    jac = plant_jacobian(x, p)
+    f1, _ = plant_rhs(x, p)
+    k1 = _solve(jac, c, f1)
+    f2, _ = plant_rhs(_axpy(x, h, k1), p)
+    k2 = _solve(jac, c, PlantState(f2.omega - 2.0 * k1.omega, f2.strain - 2.0 * k1.strain, f2.torque - 2.0 * k1.torque))
+    x_new = PlantState(
+        x.omega + h * (1.5 * k1.omega + 0.5 * k2.omega),
+        x.strain + h * (1.5 * k1.strain + 0.5 * k2.strain),
+        x.torque + h * (1.5 * k1.torque + 0.5 * k2.torque),
+    )
+    _, tension = plant_rhs(x_new, p)
+    return x_new, tension
+
+
+IMPLICIT_STEPS: Dict[str, Callable[[PlantState, PlantInputs, float], Tuple[PlantState, float]]] = {
+    "semi_implicit": step_semi_implicit,
+    "rosenbrock": step_rosenbrock,
+}
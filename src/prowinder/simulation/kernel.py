@@ -0,0 +1,341 @@
+"""
+Noyau de calcul à vecteur d'état plat pour le jumeau numérique.
+
+Tout l'état dynamique de DigitalTwin (moteur, dérouleur, span, TensionObserver,
+FrictionObserver, intégrateurs des régulateurs, ordonnanceur) est rangé dans un unique
+vecteur float64 contigu, dont la disposition est donnée par STATE_FIELDS. La fonction pure
+`step(state, inputs, params) -> state` reproduit les équations de DigitalTwin sans aucun
+accès aux objets, ce qui rend l'état trivial à copier, sauvegarder ou partager entre
+processus (mémoire partagée, np.memmap).
+
+Sélection : SystemConfig(engine="kernel") ; les objets du jumeau restent une vue
+rafraîchie après chaque pas.
+"""
+
+import math
+import numpy as np
+from typing import NamedTuple, Optional, Sequence
+
+from prowinder.mechanics.motor import PEAK_TORQUE_RATIO
+from prowinder.simulation import constants
+from prowinder.simulation.integrators import IMPLICIT_STEPS, PlantInputs, PlantState
+
+ENGINES = ("objects", "kernel")
+
+# Integer codes for SystemConfig.control_mode (anything unknown falls back to open loop,
+# exactly like the else-branch of DigitalTwin)
+MODE_OPEN_LOOP_TORQUE = 0
+MODE_SPEED_LIMIT = 1
+MODE_CLOSED_LOOP_TENSION = 2
+
+
+def mode_code(control_mode: str) -> int:
+    if control_mode == "SPEED_LIMIT":
+        return MODE_SPEED_LIMIT
+    if control_mode == "CLOSED_LOOP_TENSION":
+        return MODE_CLOSED_LOOP_TENSION
+    return MODE_OPEN_LOOP_TORQUE
+
+
+STATE_FIELDS = (
+    # Clock
+    "time", "tick",
+    # Plant
+    "omega", "radius", "angle", "motor_torque", "target_torque", "span_strain", "tension",
+    # Estimators (TensionObserver, FrictionObserver)
+    "prev_omega", "obs_time", "obs_strain", "obs_last_tension", "obs_has_estimate",
+    "fric_state", "fric_estimate", "tension_est", "tension_mode",
+    # Controllers
+    "speed_integrator", "tension_integrator", "prev_w_ref", "has_prev_w_ref", "notch_freq",
+)
+STATE_SIZE = len(STATE_FIELDS)
+STATE_INDEX = {name: i for i, name in enumerate(STATE_FIELDS)}
+
+
+class KernelParams(NamedTuple):
+    """Paramètres figés du noyau (dérivés de SystemConfig une fois pour toutes)."""
+    dt: float
+    control_dt: float
+    estimator_dt: float
+    control_divisor: int
+    estimator_divisor: int
+    mode: int
+    integrator: str
+    exact: bool
+    gear_ratio: float
+    speed_kp: float
+    speed_ki: float
+    tension_kp: float
+    tension_ki: float
+    rotor_inertia: float
+    torque_limit: float
+    torque_bandwidth: float
+    motor_gain: float
+    young_modulus: float
+    viscosity: float
+    thickness: float
+    section: float
+    span_length: float
+    k_coil: float
+    core_inertia: float
+    core_radius: float
+    initial_radius: float
+    friction_coulomb: float
+    friction_viscous: float
+    friction_stiction: float
+    friction_stribeck: float
+    friction_observer_gain: float
+    obs_omega_min: float
+    obs_omega_max: float
+    obs_ema_alpha: float
+    obs_tension_min: float
+    obs_tension_max: float
+    obs_min_radius: float
+    notch_base_freq: float
+    notch_fs: float
+    gain_schedule: object  # control.gain_schedule.GainSchedule or None
+
+
+def make_params(config, divisors: Optional[Sequence[int]] = None) -> KernelParams:
+    """
+    Construit les paramètres du noyau depuis un SystemConfig.
+
+    Les constantes (mandrin, observateurs, coupe-bande) viennent de simulation.constants,
+    comme pour DigitalTwin et BatchDigitalTwin.
+    """
+    control_dt = config.control_dt or config.dt
+    estimator_dt = config.estimator_dt or config.dt
+    if divisors is None:
+        divisors = (int(round(control_dt / config.dt)), int(round(estimator_dt / config.dt)))
+    control_dt = config.dt * divisors[0]
+    estimator_dt = config.dt * divisors[1]
+
+    material = config.material
+    motor = config.motor_specs
+    tau = 1.0 / motor.torque_bandwidth
+    exact = config.discretization == "exact"
+    return KernelParams(
+        dt=config.dt,
+        control_dt=control_dt,
+        estimator_dt=estimator_dt,
+        control_divisor=divisors[0],
+        estimator_divisor=divisors[1],
+        mode=mode_code(config.control_mode),
+        integrator=config.integrator,
+        exact=exact,
+        gear_ratio=config.gear_ratio,
+        speed_kp=config.speed_kp,
+        speed_ki=config.speed_ki,
+        tension_kp=config.tension_kp,
+        tension_ki=config.tension_ki,
+        rotor_inertia=motor.rotor_inertia,
+        torque_limit=motor.rated_torque * PEAK_TORQUE_RATIO,
+        torque_bandwidth=motor.torque_bandwidth,
+        motor_gain=-math.expm1(-config.dt / tau) if exact else config.dt / tau,
+        young_modulus=material.young_modulus,
+        viscosity=material.viscosity,
+        thickness=material.thickness,
+        section=material.thickness * material.width,
+        span_length=config.span_length,
+        k_coil=0.5 * math.pi * material.density * material.width,
+        core_inertia=constants.CORE_INERTIA,
+        core_radius=constants.CORE_RADIUS,
+        initial_radius=config.initial_radius,
+        friction_coulomb=config.friction.coulomb_coeff,
+        friction_viscous=config.friction.viscous_coeff,
+        friction_stiction=config.friction.stiction_coeff,
+        friction_stribeck=config.friction.stribeck_velocity,
+        friction_observer_gain=constants.FRICTION_OBSERVER_GAIN,
+        obs_omega_min=constants.OBS_OMEGA_MIN,
+        obs_omega_max=constants.OBS_OMEGA_MAX,
+        obs_ema_alpha=constants.OBS_EMA_ALPHA,
+        obs_tension_min=constants.OBS_TENSION_MIN,
+        obs_tension_max=constants.OBS_TENSION_MAX,
+        obs_min_radius=constants.OBS_MIN_RADIUS,
+        notch_base_freq=constants.NOTCH_BASE_FREQ,
+        notch_fs=1.0 / control_dt,
+        gain_schedule=config.gain_schedule,
+    )
+
+
+def initial_state(params: KernelParams) -> np.ndarray:
+    """État initial identique à celui d'un DigitalTwin fraîchement construit."""
+    state = np.zeros(STATE_SIZE)
+    width = params.section / params.thickness
+    tension = width * constants.INITIAL_TENSION_PER_WIDTH  # Dummy initial span tension
+    state[STATE_INDEX["radius"]] = params.initial_radius
+    state[STATE_INDEX["tension"]] = tension
+    if params.section > 0:
+        state[STATE_INDEX["span_strain"]] = tension / (params.young_modulus * params.section)
+    state[STATE_INDEX["notch_freq"]] = params.notch_base_freq
+    return state
+
+
+def _clip(value: float, lo: float, hi: float) -> float:
+    return lo if value < lo else hi if value > hi else value
+
+
+def step(state: np.ndarray, inputs, params: KernelParams) -> np.ndarray:
+    """
+    Avance l'état d'un pas dt (fonction pure : `state` n'est pas modifié).
+
+    Args:
+        state: Vecteur d'état (STATE_FIELDS)
+        inputs: (speed_ref, tension_ref, speed_ref_dot) ; speed_ref_dot peut être None
+        params: Paramètres issus de make_params
+
+    Returns:
+        Nouveau vecteur d'état
+    """
+    (time, tick, omega, radius, angle, motor_torque, target_torque, span_strain, tension,
+     prev_omega, obs_time, obs_strain, obs_last_tension, obs_has_estimate,
+     fric_state, fric_estimate, tension_est, tension_mode,
+     speed_integrator, tension_integrator, prev_w_ref, has_prev_w_ref, notch_freq) = state.tolist()
+    speed_ref, tension_ref, speed_ref_dot = inputs
+    p = params
+    G = p.gear_ratio
+    tick_count = int(tick)
+
+    J_roll = p.core_inertia + p.k_coil * (pow(radius, 4) - pow(p.core_radius, 4))
+    J_total = J_roll + p.rotor_inertia * (G**2)
+
+    # --- A. ESTIMATORS (estimator_dt) ---
+    if tick_count % p.estimator_divisor == 0:
+        dt = p.estimator_dt
+        alpha_est = (omega - prev_omega) / dt
+        torque_for_obs = motor_torque * G
+        prev_omega = omega
+        v_up = omega * radius
+        obs_time += dt
+
+        # Torque balance estimate (friction_observer=None in the twin's TensionObserver)
+        J_used = max(J_total, 1e-6)
+        tension_tau = (J_used * alpha_est - torque_for_obs + 0.0) / radius if abs(radius) >= p.obs_min_radius else 0.0
+        tension_tau = _clip(tension_tau, p.obs_tension_min, p.obs_tension_max)
+
+        # Observer's own span model (Euler)
+        L = p.span_length
+        d_obs = (v_up / L) * (0.0 - obs_strain) + (speed_ref - v_up) / L
+        obs_strain += d_obs * dt
+        tension_span = max(0.0, (p.young_modulus * obs_strain + p.viscosity * d_obs) * p.section)
+        omega_abs = abs(omega)
+        if omega_abs >= p.obs_omega_max:
+            tension_span = tension
+
+        if omega_abs <= p.obs_omega_min:
+            weight = 0.0
+        elif omega_abs >= p.obs_omega_max:
+            weight = 1.0
+        else:
+            weight = (omega_abs - p.obs_omega_min) / (p.obs_omega_max - p.obs_omega_min)
+        tension_raw = _clip((1.0 - weight) * tension_tau + weight * tension_span, p.obs_tension_min, p.obs_tension_max)
+        if obs_has_estimate:
+            tension_est = (1.0 - p.obs_ema_alpha) * obs_last_tension + p.obs_ema_alpha * tension_raw
+        else:
+            tension_est = tension_raw
+            obs_has_estimate = 1.0
+        obs_last_tension = tension_est
+        tension_mode = 2.0 if weight >= 0.99 else 1.0 if weight > 0.01 else 0.0
+
+        if p.mode != MODE_SPEED_LIMIT:
+            correction = p.friction_observer_gain * (omega - fric_state)
+            fric_state += correction * dt
+            fric_estimate += -1.0 * correction * J_total * dt
+
+    # --- B. CONTROL (control_dt) ---
+    if tick_count % p.control_divisor == 0:
+        dt = p.control_dt
+        if p.mode == MODE_SPEED_LIMIT:
+            error = (speed_ref / radius) * 0.95 * G - omega * G
+            speed_integrator += error * dt
+            torque_cmd = p.speed_kp * error + p.speed_ki * speed_integrator
+            limit_braking = (tension_ref * radius) / G
+            if torque_cmd > 0: torque_cmd = 0
+            if torque_cmd < -limit_braking: torque_cmd = -limit_braking
+        elif p.mode == MODE_CLOSED_LOOP_TENSION:
+            t_ff_tension = (tension_ref * radius) / G
+            t_fric = fric_estimate / G
+            w_ref_winder = speed_ref / radius
+            accel_comp = 0.0
+            if speed_ref_dot is not None:
+                radius_rate = (omega / (2 * np.pi)) * p.thickness
+                accel_comp = speed_ref_dot / radius - speed_ref * radius_rate / radius**2
+            elif has_prev_w_ref:
+                accel_comp = (w_ref_winder - prev_w_ref) / dt
+            prev_w_ref = w_ref_winder
+            has_prev_w_ref = 1.0
+            t_iner = (J_total * accel_comp) / G
+            tension_error = tension_ref - tension_est
+            tension_integrator = _clip(tension_integrator + tension_error * dt, -10000, 10000)
+            kp, ki = p.tension_kp, p.tension_ki
+            if p.gain_schedule is not None:
+                kp, ki, notch_freq = p.gain_schedule.lookup(radius, speed_ref)
+            pid_output_force = (kp * tension_error) + (ki * tension_integrator)
+            t_closed_loop = (pid_output_force * radius) / G
+            torque_cmd = -(t_ff_tension + t_closed_loop) - t_fric + t_iner
+        else:
+            if J_total > 0:
+                new_freq = p.notch_base_freq * math.sqrt(1.0 / J_total)
+                new_freq = max(1.0, min(new_freq, p.notch_fs / 2.1))
+                if abs(new_freq - notch_freq) > 0.5:
+                    notch_freq = new_freq
+            t_tens = (tension_ref * radius) / G
+            t_fric = fric_estimate / G
+            accel_comp = (speed_ref / radius - omega) * 10.0
+            t_iner = (J_total * accel_comp) / G
+            torque_cmd = -t_tens - t_fric + t_iner
+        target_torque = _clip(torque_cmd, -p.torque_limit, p.torque_limit)
+
+    # --- C. PLANT (dt) ---
+    dt = p.dt
+    if p.integrator != "explicit":
+        inputs = PlantInputs(
+            target_torque, speed_ref, radius, J_total, G, p.torque_bandwidth,
+            p.span_length, p.section, p.young_modulus, p.viscosity,
+            p.friction_coulomb, p.friction_viscous, p.friction_stiction, p.friction_stribeck,
+        )
+        plant, tension = IMPLICIT_STEPS[p.integrator](PlantState(omega, span_strain, motor_torque), inputs, dt)
+        omega, span_strain, motor_torque = float(plant.omega), float(plant.strain), float(plant.torque)
+        tension = float(tension)
+    else:
+        motor_torque += (target_torque - motor_torque) * p.motor_gain
+        v_up = omega * radius
+        L = p.span_length
+        d_strain = (v_up / L) * (0.0 - span_strain) + (speed_ref - v_up) / L
+        if p.exact:
+            b = v_up / L
+            a = (speed_ref - v_up) / L + b * 0.0
+            x = b * dt
+            gain = -math.expm1(-x) / b if abs(x) > 1e-12 else dt
+            new_strain = span_strain + (a - b * span_strain) * gain
+            d_strain = (new_strain - span_strain) / dt
+            span_strain = new_strain
+        else:
+            span_strain += d_strain * dt
+        tension = max(0.0, (p.young_modulus * span_strain + p.viscosity * d_strain) * p.section)
+
+        stribeck = (p.friction_stiction - p.friction_coulomb) * math.exp(-(omega / p.friction_stribeck) ** 2)
+        sign = (omega > 0) - (omega < 0)
+        friction = (p.friction_coulomb + stribeck) * sign + p.friction_viscous * omega
+        net_torque = motor_torque * G + tension * radius - friction
+        omega += (net_torque / J_total) * dt
+
+    # Roll geometry
+    if radius > 0:
+        if p.exact:
+            angle += omega * dt
+            radius = p.initial_radius + p.thickness * angle / (2 * np.pi)
+            if radius < p.core_radius:
+                radius = p.core_radius
+                angle = (p.core_radius - p.initial_radius) * 2 * np.pi / p.thickness
+        else:
+            radius += (omega / (2 * np.pi)) * p.thickness * dt
+            if radius < p.core_radius:
+                radius = p.core_radius
+
+    return np.array((
+        time + dt, tick + 1.0, omega, radius, angle, motor_torque, target_torque, span_strain, tension,
+        prev_omega, obs_time, obs_strain, obs_last_tension, obs_has_estimate,
+        fric_state, fric_estimate, tension_est, tension_mode,
+        speed_integrator, tension_integrator, prev_w_ref, has_prev_w_ref, notch_freq,
+    ))
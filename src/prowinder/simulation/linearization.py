@@ -0,0 +1,356 @@
+"""
+Linéarisation du jumeau numérique et export en représentation d'état (python-control).
+
+Modèle continu petits signaux autour d'un point de fonctionnement (rayon R, vitesse ligne v,
+tension T0) ; le rayon est un paramètre lent, figé. États :
+
+    omega  : vitesse du dérouleur (rad/s)      J(R) d(omega)/dt = G tau + T R - C_frottement(omega)
+    strain : déformation du span               d(eps)/dt = (v - omega R (1 + eps)) / L
+    torque : couple moteur (retard variateur)  d(tau)/dt = wb (tau_cmd - tau)
+    + l'intégrateur de la boucle PI du mode de commande (tension ou vitesse)
+
+avec T = E S eps + eta S d(eps)/dt (Kelvin-Voigt). Entrées : vitesse ligne et consigne de
+tension ; sorties : tension, vitesse, couple. La compensation d'inertie par la dérivée de la
+consigne (feedforward) n'agit pas sur la stabilité et n'est pas modélisée ; la tension
+mesurée est supposée parfaite (observateur en régime de fusion).
+
+Toutes les matrices sont calculées en bloc pour une grille de (R, v) : A a la forme
+grille + (n, n), et pôles, réponses fréquentielles et marges sont vectorisés sur la grille.
+python-control n'est importé que pour l'export (LinearModel.to_statespace).
+
+Example:
+    >>> R, v = np.meshgrid(np.linspace(0.05, 0.3, 50), np.linspace(0.5, 10.0, 20), indexing='ij')
+    >>> model = linearize(SystemConfig(), R, v)
+    >>> model.poles().real.max(axis=-1)             # (50, 20) : stabilité sur toute la bobine
+    >>> margins = stability_margins(SystemConfig(), R, v)
+    >>> sys = model.to_statespace((10, 5))          # control.StateSpace d'un point
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from prowinder.control.gain_schedule import GainSchedule
+from prowinder.mechanics.friction import FrictionModel
+from prowinder.simulation import kernel
+from prowinder.simulation.digital_twin import SystemConfig
+
+PLANT_STATES = ("omega", "strain", "torque")
+INPUTS = ("line_speed", "tension_ref")
+OUTPUTS = ("tension", "omega", "torque")
+# Integrator state of each control mode (open loop torque control has none)
+CONTROLLER_STATES = {"CLOSED_LOOP_TENSION": ("tension_integrator",), "SPEED_LIMIT": ("speed_integrator",)}
+
+
+@dataclass
+class LinearModel:
+    """
+    Modèles d'état (A, B, C, D) sur une grille de points de fonctionnement.
+
+    A: grille + (n, n), B: grille + (n, m), C: grille + (p, n), D: grille + (p, m).
+    """
+    A: np.ndarray
+    B: np.ndarray
+    C: np.ndarray
+    D: np.ndarray
+    states: Tuple[str, ...]
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Forme de la grille de points de fonctionnement."""
+        return self.A.shape[:-2]
+
+    def poles(self) -> np.ndarray:
+        """Valeurs propres de A, forme grille + (n,)."""
+        return np.linalg.eigvals(self.A)
+
+    def is_stable(self) -> np.ndarray:
+        return self.poles().real.max(axis=-1) < 0.0
+
+    def frequency_response(self, omega: Sequence[float]) -> np.ndarray:
+        """H(j w) = C (j w I - A)^-1 B + D, forme grille + (len(omega), p, m)."""
+        w = np.asarray(omega, dtype=float)
+        n = self.A.shape[-1]
+        s = (1j * w)[:, None, None] * np.eye(n)
+        # Broadcast the grid against the frequency axis: (..., nw, n, n) solves
+        X = np.linalg.solve(s - self.A[..., None, :, :], self.B[..., None, :, :])
+        return self.C[..., None, :, :] @ X + self.D[..., None, :, :]
+
+    def bode(self, omega: Sequence[float], output: str = "tension", input: str = "line_speed"):
+        """Gain (dB) et phase (degrés, déroulée) d'un transfert, forme grille + (len(omega),)."""
+        H = self.frequency_response(omega)[..., self.outputs.index(output), self.inputs.index(input)]
+        return 20.0 * np.log10(np.abs(H)), np.degrees(np.unwrap(np.angle(H), axis=-1))
+
+    def to_statespace(self, index: Tuple[int, ...] = ()):
+        """Export d'un point de la grille en control.StateSpace (noms d'états/entrées/sorties conservés)."""
+        import control  # Only needed for the export
+
+        index = tuple(np.atleast_1d(index)) if index != () else ()
+        return control.ss(self.A[index], self.B[index], self.C[index], self.D[index],
+                          states=list(self.states), inputs=list(self.inputs), outputs=list(self.outputs))
+
+
+@dataclass
+class StabilityMargins:
+    """Marges de la boucle principale sur la grille (inf si pas de croisement)."""
+    gain_margin: np.ndarray       # Linear factor
+    phase_margin: np.ndarray      # Degrees
+    gain_crossover: np.ndarray    # rad/s, |L| = 1
+    phase_crossover: np.ndarray   # rad/s, angle(L) = -180 deg
+
+    @property
+    def gain_margin_db(self) -> np.ndarray:
+        return 20.0 * np.log10(self.gain_margin)
+
+
+def _friction_slope(p: kernel.KernelParams, omega: np.ndarray) -> np.ndarray:
+    """dC_frottement/d(omega) au point de fonctionnement (différence centrée)."""
+    model = FrictionModel(p.friction_coulomb, p.friction_viscous, p.friction_stiction, p.friction_stribeck)
+    h = 1e-6 * np.maximum(np.abs(omega), 1.0)
+    return (model.compute_torque(omega + h) - model.compute_torque(omega - h)) / (2.0 * h)
+
+
+def _blocks(config: SystemConfig, radius, speed, tension):
+    """Matrices du procédé (entrées tau_cmd, v) et du régulateur, vectorisées sur la grille."""
+    R, v = np.broadcast_arrays(np.asarray(radius, dtype=float), np.asarray(speed, dtype=float))
+    T0 = np.broadcast_to(np.asarray(tension, dtype=float), R.shape)
+    p = kernel.make_params(config)  # Same constants as the twin (core, friction, ...)
+    G = p.gear_ratio
+    L = p.span_length
+    EA, etaA = p.young_modulus * p.section, p.viscosity * p.section
+    wb = p.torque_bandwidth
+
+    # Operating point
+    strain0 = T0 / EA
+    omega0 = v / ((1.0 + strain0) * R)
+    J = p.core_inertia + p.k_coil * (R**4 - p.core_radius**4) + p.rotor_inertia * G**2
+
+    # Plant: x = (omega, strain, torque), u = (tau_cmd, v)
+    grid = R.shape
+    Ap = np.zeros(grid + (3, 3))
+    Bp = np.zeros(grid + (3, 2))
+    Ap[..., 1, 0] = -R * (1.0 + strain0) / L
+    Ap[..., 1, 1] = -omega0 * R / L
+    Bp[..., 1, 1] = 1.0 / L
+    # Tension output T = EA*eps + etaA*d(eps)/dt
+    CT = etaA * Ap[..., 1, :]
+    CT[..., 1] += EA
+    DT = etaA * Bp[..., 1, :]
+    Ap[..., 0, :] = (R[..., None] * CT) / J[..., None]
+    Ap[..., 0, 0] -= _friction_slope(p, omega0) / J
+    Ap[..., 0, 2] += G / J
+    Bp[..., 0, :] = (R[..., None] * DT) / J[..., None]
+    Ap[..., 2, 2] = -wb
+    Bp[..., 2, 0] = wb
+    Cp = np.zeros(grid + (3, 3))
+    Dp = np.zeros(grid + (3, 2))
+    Cp[..., 0, :], Dp[..., 0, :] = CT, DT
+    Cp[..., 1, 0] = 1.0
+    Cp[..., 2, 2] = 1.0
+
+    # Controller: xc = integrator(s), inputs (T, omega, v, T_ref), output tau_cmd
+    mode = config.control_mode
+    nc = len(CONTROLLER_STATES.get(mode, ()))
+    Ac = np.zeros(grid + (nc, nc))
+    Bc = np.zeros(grid + (nc, 4))
+    Cc = np.zeros(grid + (1, nc))
+    Dc = np.zeros(grid + (1, 4))
+    if mode == "CLOSED_LOOP_TENSION":
+        # tau_cmd = -(R/G) * (T_ref + kp (T_ref - T) + ki I), dI/dt = T_ref - T
+        kp, ki = p.tension_kp, p.tension_ki
+        if config.gain_schedule is not None:
+            gains = config.gain_schedule.interpolate(R, v)
+            kp, ki = gains[..., 0], gains[..., 1]
+        Bc[..., 0, 0], Bc[..., 0, 3] = -1.0, 1.0
+        Cc[..., 0, 0] = -ki * R / G
+        Dc[..., 0, 0] = kp * R / G
+        Dc[..., 0, 3] = -(1.0 + kp) * R / G
+    elif mode == "SPEED_LIMIT":
+        # tau_cmd = kp G (0.95 v/R - omega) + ki S, dS/dt = G (0.95 v/R - omega); torque limit inactive
+        kp, ki = p.speed_kp, p.speed_ki
+        Bc[..., 0, 1], Bc[..., 0, 2] = -G, 0.95 * G / R
+        Cc[..., 0, 0] = ki
+        Dc[..., 0, 1], Dc[..., 0, 2] = -kp * G, 0.95 * kp * G / R
+    else:
+        # Open loop: tau_cmd = -(T_ref R)/G + J (v/R - omega) * 10 / G
+        Dc[..., 0, 1], Dc[..., 0, 2] = -10.0 * J / G, 10.0 * J / (G * R)
+        Dc[..., 0, 3] = -R / G
+    return (Ap, Bp, Cp, Dp), (Ac, Bc, Cc, Dc), CONTROLLER_STATES.get(mode, ())
+
+
+def linearize(config: SystemConfig, radius, speed, tension: Optional[float] = None) -> LinearModel:
+    """
+    Modèle en boucle fermée (procédé + régulateur du mode config.control_mode).
+
+    Args:
+        config: Configuration du jumeau
+        radius: Rayon(s) de bobine (m), scalaire ou tableau
+        speed: Vitesse(s) ligne (m/s), diffusée(s) avec `radius`
+        tension: Tension de fonctionnement (N), défaut 100 N
+
+    Returns:
+        LinearModel (entrées line_speed, tension_ref ; sorties tension, omega, torque)
+    """
+    tension = 100.0 if tension is None else tension
+    (Ap, Bp, Cp, Dp), (Ac, Bc, Cc, Dc), controller_states = _blocks(config, radius, speed, tension)
+    grid = Ap.shape[:-2]
+    nc = Ac.shape[-1]
+
+    # Controller inputs (T, omega, v, T_ref) as functions of (x, u): y_meas = Cm x + Dm u
+    # with x = (plant, controller) and u = (v, T_ref); the plant has no feedthrough from tau_cmd.
+    n = 3 + nc
+    Cm = np.zeros(grid + (4, n))
+    Dm = np.zeros(grid + (4, 2))
+    Cm[..., 0, :3], Dm[..., 0, 0] = Cp[..., 0, :], Dp[..., 0, 1]
+    Cm[..., 1, 0] = 1.0
+    Dm[..., 2, 0] = 1.0
+    Dm[..., 3, 1] = 1.0
+    # tau_cmd = Cc xc + Dc y_meas
+    K = Dc @ Cm
+    K[..., 3:] += Cc
+    Kd = Dc @ Dm
+
+    A = np.zeros(grid + (n, n))
+    B = np.zeros(grid + (n, 2))
+    A[..., :3, :3] = Ap
+    A[..., :3, :] += Bp[..., :, :1] @ K
+    B[..., :3, :] = Bp[..., :, :1] @ Kd
+    B[..., :3, 0] += Bp[..., :, 1]
+    A[..., 3:, :] = Bc @ Cm
+    A[..., 3:, 3:] += Ac
+    B[..., 3:, :] = Bc @ Dm
+
+    C = np.zeros(grid + (3, n))
+    C[..., :, :3] = Cp
+    D = np.zeros(grid + (3, 2))
+    D[..., :, 0] = Dp[..., :, 1]
+    return LinearModel(A, B, C, D, PLANT_STATES + controller_states, INPUTS, OUTPUTS)
+
+
+def loop_model(config: SystemConfig, radius, speed, tension: Optional[float] = None) -> LinearModel:
+    """
+    Boucle ouverte coupée à la consigne de couple : entrée tau_cmd (procédé), sortie tau_cmd
+    recalculée par le régulateur (références nulles). Le transfert de boucle est L = -H.
+    """
+    tension = 100.0 if tension is None else tension
+    (Ap, Bp, Cp, Dp), (Ac, Bc, Cc, Dc), controller_states = _blocks(config, radius, speed, tension)
+    grid = Ap.shape[:-2]
+    nc = Ac.shape[-1]
+    n = 3 + nc
+
+    Cm = np.zeros(grid + (4, n))
+    Cm[..., 0, :3] = Cp[..., 0, :]
+    Cm[..., 1, 0] = 1.0
+    A = np.zeros(grid + (n, n))
+    A[..., :3, :3] = Ap
+    A[..., 3:, :] = Bc @ Cm
+    A[..., 3:, 3:] += Ac
+    B = np.zeros(grid + (n, 1))
+    B[..., :3, :] = Bp[..., :, :1]
+    C = Dc @ Cm
+    C[..., 3:] += Cc
+    D = np.zeros(grid + (1, 1))
+    return LinearModel(A, B, C, D, PLANT_STATES + controller_states, ("tau_cmd",), ("tau_cmd_feedback",))
+
+
+def stability_margins(config: SystemConfig, radius, speed, tension: Optional[float] = None,
+                      omega: Optional[Sequence[float]] = None, sample_delay: bool = True) -> StabilityMargins:
+    """
+    Marges de gain et de phase de la boucle principale, en un seul passage vectorisé.
+
+    Les croisements sont localisés sur une grille de fréquences logarithmique (interpolation
+    linéaire en log de la fréquence). S'il y en a plusieurs, la marge retenue est la plus
+    critique, comme control.stability_margins.
+
+    Args:
+        omega: Grille de fréquences (rad/s), défaut 1e-2 .. 1e5 (2000 points)
+        sample_delay: Ajoute le retard du bloqueur d'ordre 0 de la commande (control_dt / 2)
+    """
+    w = np.logspace(-2, 5, 2000) if omega is None else np.asarray(omega, dtype=float)
+    model = loop_model(config, radius, speed, tension)
+    Lw = -model.frequency_response(w)[..., 0, 0]
+    if sample_delay:
+        Lw = Lw * np.exp(-0.5j * w * kernel.make_params(config).control_dt)
+    log_gain = np.log(np.abs(Lw))
+    phase = np.degrees(np.unwrap(np.angle(Lw), axis=-1))
+    logw = np.log(w)
+
+    def interpolate(values, frac):
+        """Valeur interpolée dans chaque intervalle de la grille de fréquences."""
+        return values[..., :-1] + frac * (values[..., 1:] - values[..., :-1])
+
+    def fraction(values, level):
+        a, b = values[..., :-1] - level, values[..., 1:] - level
+        crossed = np.signbit(a) != np.signbit(b)
+        return crossed, np.where(crossed, a / np.where(crossed, a - b, 1.0), 0.0)
+
+    # Gain crossovers |L| = 1: phase margin = angle(L) + 180 wrapped to [-180, 180), smallest |PM| kept
+    crossed, frac = fraction(log_gain, 0.0)
+    margins = np.where(crossed, interpolate(phase, frac) % 360.0 - 180.0, np.inf)
+    k = np.argmin(np.abs(margins), axis=-1)[..., None]
+    has_gc = crossed.any(axis=-1)
+    phase_margin = np.where(has_gc, np.take_along_axis(margins, k, axis=-1)[..., 0], np.inf)
+    gain_crossover = np.where(has_gc, np.exp(np.take_along_axis(interpolate(logw, frac), k, axis=-1)[..., 0]),
+                              np.inf)
+
+    # Phase crossovers angle(L) = -180 deg (mod 360): gain margin = 1/|L|, smallest |log GM| kept
+    turns = np.floor((phase + 180.0) / 360.0)
+    crossed = turns[..., :-1] != turns[..., 1:]
+    level = 360.0 * np.maximum(turns[..., :-1], turns[..., 1:]) - 180.0
+    a, b = phase[..., :-1], phase[..., 1:]
+    frac = np.where(crossed, (level - a) / np.where(crossed, b - a, 1.0), 0.0)
+    gains = np.where(crossed, -interpolate(log_gain, frac), np.inf)
+    k = np.argmin(np.abs(gains), axis=-1)[..., None]
+    has_pc = crossed.any(axis=-1)
+    gain_margin = np.where(has_pc, np.exp(np.take_along_axis(gains, k, axis=-1)[..., 0]), np.inf)
+    phase_crossover = np.where(has_pc, np.exp(np.take_along_axis(interpolate(logw, frac), k, axis=-1)[..., 0]),
+                               np.inf)
+    return StabilityMargins(gain_margin, phase_margin, gain_crossover, phase_crossover)
+
+
+def design_gain_schedule(config: SystemConfig, radius: Sequence[float], speed: Sequence[float],
+                         tension: Optional[float] = None, separation: float = 10.0,
+                         peak_gain: float = 0.5, kp_max: float = 0.8) -> GainSchedule:
+    """
+    Conception hors ligne des gains de la boucle de tension sur une grille (rayon, vitesse).
+
+    En chaque point, le procédé force -> tension P(s) (couple moteur -(R/G) F, retard variateur,
+    inertie J(R), span) a un gain statique unitaire et une résonance bobine/span à
+    wn = R sqrt(E S / (L J(R))), qui descend quand la bobine grossit (J ~ R^4) :
+    - notch_freq = wn / 2 pi (limitée comme AdaptiveNotchFilter.adapt) ;
+    - kp borne le pic de résonance de la boucle : kp max|P| <= peak_gain (et kp <= kp_max) ;
+    - ki place la coupure de kp + ki/s à wc = wn / separation : ki = wc sqrt(1 - kp²).
+
+    Args:
+        radius: Grille régulière des rayons (m)
+        speed: Grille régulière des vitesses ligne (m/s)
+        tension: Tension de fonctionnement (N), défaut 100 N
+
+    Returns:
+        GainSchedule à placer dans SystemConfig.gain_schedule
+    """
+    if not 0.0 < kp_max < 1.0:
+        raise ValueError("kp_max must be in (0, 1): the crossover is set by ki only below unit kp")
+    radius_grid = np.asarray(radius, dtype=float)
+    speed_grid = np.asarray(speed, dtype=float)
+    R, v = np.meshgrid(radius_grid, speed_grid, indexing='ij')
+    tension = 100.0 if tension is None else tension
+    (Ap, Bp, Cp, Dp), _, _ = _blocks(config, R, v, tension)
+    p = kernel.make_params(config)
+    G = p.gear_ratio
+    J = p.core_inertia + p.k_coil * (R**4 - p.core_radius**4) + p.rotor_inertia * G**2
+    wn = R * np.sqrt(p.young_modulus * p.section / (p.span_length * J))
+
+    # Force correction -> tension, peak gain over a grid covering every resonance
+    plant = LinearModel(Ap, Bp[..., :1] * (-R / G)[..., None, None], Cp[..., :1, :], Dp[..., :1, :1],
+                        PLANT_STATES, ("force",), ("tension",))
+    w = np.logspace(np.log10(wn.min()) - 1.0, np.log10(wn.max()) + 1.0, 400)
+    peak = np.abs(plant.frequency_response(w)[..., 0, 0]).max(axis=-1)
+
+    kp = np.minimum(kp_max, peak_gain / np.maximum(peak, 1.0))
+    ki = (wn / separation) * np.sqrt(1.0 - kp**2)
+    notch = np.clip(wn / (2.0 * np.pi), 1.0, 1.0 / (2.1 * p.control_dt))
+    return GainSchedule.from_grid(radius_grid, speed_grid, np.stack([kp, ki, notch], axis=-1))
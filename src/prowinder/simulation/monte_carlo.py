@@ -0,0 +1,311 @@
+"""
+Étude Monte Carlo de robustesse du jumeau numérique (tolérances matière, frottement,
+moteur, bruit capteur).
+
+Chaque paramètre incertain est décrit par une distribution, indexée par son chemin pointé
+dans SystemConfig ("material.thickness", "friction.coulomb_coeff", "sensor_noise.tension_std").
+Le tirage i utilise son propre générateur, issu de SeedSequence(seed).spawn(...)[i] : il ne
+dépend que de (seed, i), quel que soit le nombre de processus ou le découpage en paquets.
+Ce même générateur alimente ensuite le bruit capteur de la simulation.
+
+Les statistiques sont agrégées en flux, dans l'ordre des tirages : moyenne/écart-type
+(Welford), percentiles par l'algorithme P² (mémoire O(1)) et taux de défaillance.
+
+Example:
+    >>> study = MonteCarloStudy(SystemConfig(duration=2.0), {
+    ...     "material.thickness": Normal(50e-6, 1e-6),
+    ...     "friction.coulomb_coeff": Uniform(0.3, 0.8),
+    ... }, limits={"tension_max_error": 10.0})
+    >>> result = study.run(10000, seed=42)
+    >>> result.failure_rate, result.percentiles["tension_rms_error"][95]
+"""
+
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from prowinder.simulation.digital_twin import Reference, SystemConfig
+from prowinder.simulation.events import Event
+from prowinder.simulation.sweep import KpiFunction, apply_overrides, default_kpis, evaluate_config
+
+
+class Distribution:
+    """Loi de tirage d'un paramètre."""
+
+    def sample(self, rng: np.random.Generator) -> float:
+        raise NotImplementedError
+
+
+@dataclass
+class Normal(Distribution):
+    """Loi normale, éventuellement bornée (valeurs écrêtées à [low, high])."""
+    mean: float
+    std: float
+    low: float = -math.inf
+    high: float = math.inf
+
+    def sample(self, rng: np.random.Generator) -> float:
+        return float(min(max(rng.normal(self.mean, self.std), self.low), self.high))
+
+
+@dataclass
+class Uniform(Distribution):
+    low: float
+    high: float
+
+    def sample(self, rng: np.random.Generator) -> float:
+        return float(rng.uniform(self.low, self.high))
+
+
+def tolerance(nominal: float, relative: float, sigmas: float = 3.0) -> Normal:
+    """Tolérance ±relative interprétée à `sigmas` écarts-types, bornée à la tolérance."""
+    delta = abs(nominal) * relative
+    return Normal(nominal, delta / sigmas, nominal - delta, nominal + delta)
+
+
+class P2Quantile:
+    """
+    Estimation de quantile en flux par l'algorithme P² (Jain & Chlamtac, 1985).
+
+    Cinq marqueurs dont les hauteurs sont ajustées par interpolation parabolique :
+    mémoire et coût constants par observation.
+    """
+
+    def __init__(self, p: float):
+        if not 0.0 < p < 1.0:
+            raise ValueError("Quantile must be in (0, 1)")
+        self.p = p
+        self.count = 0
+        self._heights: List[float] = []
+        self._positions = [0.0, 1.0, 2.0, 3.0, 4.0]
+        self._desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def update(self, x: float):
+        self.count += 1
+        q = self._heights
+        if self.count <= 5:
+            q.append(x)
+            q.sort()
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        n = self._positions
+        for i in range(k + 1, 5):
+            n[i] += 1.0
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in (1, 2, 3):
+            d = self._desired[i] - n[i]
+            if (d >= 1.0 and n[i + 1] - n[i] > 1.0) or (d <= -1.0 and n[i - 1] - n[i] < -1.0):
+                d = 1.0 if d > 0 else -1.0
+                candidate = self._parabolic(i, d)
+                if q[i - 1] < candidate < q[i + 1]:
+                    q[i] = candidate
+                else:
+                    j = i + int(d)
+                    q[i] += d * (q[j] - q[i]) / (n[j] - n[i])
+                n[i] += d
+
+    def _parabolic(self, i: int, d: float) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self) -> float:
+        if self.count == 0:
+            return math.nan
+        if self.count <= 5:
+            return float(np.percentile(self._heights, 100 * self.p))
+        return self._heights[2]
+
+
+class RunningStats:
+    """Moyenne, écart-type, min et max en flux (Welford)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+@dataclass
+class MonteCarloResult:
+    """Statistiques agrégées d'une étude ; `samples` (colonnes) si keep_samples."""
+    n_samples: int
+    n_failures: int
+    mean: Dict[str, float]
+    std: Dict[str, float]
+    min: Dict[str, float]
+    max: Dict[str, float]
+    percentiles: Dict[str, Dict[float, float]]
+    samples: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    @property
+    def failure_rate(self) -> float:
+        return self.n_failures / self.n_samples if self.n_samples else 0.0
+
+
+# Per-process context installed once by the pool initializer (pool workers only)
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(study: "MonteCarloStudy", seed: int):
+    _WORKER.update(study=study, seed=seed)
+
+
+def _run_chunk(indices: Sequence[int]):
+    study, seed = _WORKER['study'], _WORKER['seed']
+    return [study.run_sample(i, seed) for i in indices]
+
+
+class MonteCarloStudy:
+    """
+    Étude Monte Carlo : distributions des paramètres, consignes, KPI et critères de défaillance.
+
+    Args:
+        base_config: Configuration nominale
+        distributions: {chemin pointé: Distribution}
+        speed_ref, tension_ref: Consignes communes (constantes ou profils picklables)
+        kpis: Fonction (history, références) -> dict de KPI (défaut : sweep.default_kpis)
+        limits: {KPI: borne supérieure} ; un tirage est défaillant si un KPI dépasse sa borne
+            ou n'est pas fini (simulation divergente)
+        quantiles: Percentiles (en %) suivis en flux pour chaque KPI
+        events: Événements picklables (simulation.events) ; un tirage arrêté par un
+            événement terminal (rupture, bande détendue, ...) est compté défaillant sans
+            simuler le reste de sa durée
+    """
+
+    def __init__(self, base_config: SystemConfig, distributions: Mapping[str, Distribution],
+                 speed_ref: Reference = 5.0, tension_ref: Reference = 100.0,
+                 kpis: KpiFunction = default_kpis, limits: Optional[Mapping[str, float]] = None,
+                 quantiles: Sequence[float] = (5.0, 50.0, 95.0, 99.0), events: Sequence[Event] = ()):
+        self.base_config = base_config
+        self.distributions = dict(distributions)
+        self.speed_ref = speed_ref
+        self.tension_ref = tension_ref
+        self.kpis = kpis
+        self.limits = dict(limits or {})
+        self.quantiles = tuple(quantiles)
+        self.events = tuple(events)
+        # Fail fast on unknown parameter paths
+        apply_overrides(base_config, self.draw(np.random.default_rng(0)))
+
+    def draw(self, rng: np.random.Generator) -> Dict[str, float]:
+        """Tire un jeu de paramètres (ordre de déclaration des distributions)."""
+        return {name: dist.sample(rng) for name, dist in self.distributions.items()}
+
+    def run_sample(self, index: int, seed: int):
+        """Simule le tirage `index` ; retourne (paramètres, KPI)."""
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+        parameters = self.draw(rng)
+        config = apply_overrides(self.base_config, parameters)
+        try:
+            # A diverged sample stops at its first non-finite step, before NaN reaches
+            # the estimators: kpis is None and the sample counts as a failure
+            kpis, _, _ = evaluate_config(config, self.speed_ref, self.tension_ref, self.kpis, rng=rng,
+                                         events=self.events, stop_on_divergence=True)
+        except (FloatingPointError, OverflowError):
+            kpis = None  # Numeric blow-up raised before a non-finite sample was produced
+        return parameters, kpis
+
+    def is_failure(self, kpis: Optional[Mapping[str, float]]) -> bool:
+        if kpis is None or kpis.get('terminated', 0.0) > 0.0:
+            return True
+        # 'event_time' is NaN when no event fired: not a divergence
+        if not all(math.isfinite(v) for name, v in kpis.items() if name != 'event_time'):
+            return True
+        return any(kpis[name] > limit for name, limit in self.limits.items())
+
+    def run(self, n_samples: int, seed: int = 0, processes: Optional[int] = None,
+            chunksize: Optional[int] = None, keep_samples: bool = True) -> MonteCarloResult:
+        """
+        Exécute `n_samples` tirages (en parallèle si processes > 1) et agrège en flux.
+
+        Le résultat ne dépend que de `seed` : les tirages sont consommés dans leur ordre,
+        quel que soit le nombre de processus.
+        """
+        if processes is None:
+            processes = os.cpu_count() or 1
+        processes = max(1, min(processes, n_samples))
+        if chunksize is None:
+            chunksize = max(1, n_samples // (8 * processes))
+        chunks = [range(start, min(start + chunksize, n_samples)) for start in range(0, n_samples, chunksize)]
+
+        stats: Dict[str, RunningStats] = {}
+        quantiles: Dict[str, Dict[float, P2Quantile]] = {}
+        rows: List[Dict[str, float]] = []
+        n_failures = 0
+
+        def consume(outputs):
+            nonlocal n_failures
+            for parameters, kpis in outputs:
+                failed = self.is_failure(kpis)
+                n_failures += failed
+                if kpis is not None:
+                    for name, value in kpis.items():
+                        if not math.isfinite(value):
+                            continue
+                        if name not in stats:
+                            stats[name] = RunningStats()
+                            quantiles[name] = {q: P2Quantile(q / 100.0) for q in self.quantiles}
+                        stats[name].update(value)
+                        for estimator in quantiles[name].values():
+                            estimator.update(value)
+                if keep_samples:
+                    rows.append({**parameters, **(kpis or {}), 'failed': failed})
+
+        if processes == 1:
+            for chunk in chunks:
+                consume([self.run_sample(i, seed) for i in chunk])
+        else:
+            from concurrent.futures import ProcessPoolExecutor  # Not needed by the workers themselves
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(self, seed)) as pool:
+                # map() yields chunks in submission order: statistics are reproducible
+                for outputs in pool.map(_run_chunk, chunks):
+                    consume(outputs)
+
+        # Diverged samples have no KPI: their columns are NaN-filled
+        names = list(dict.fromkeys(name for row in rows for name in row))
+        samples = {name: np.array([row.get(name, math.nan) for row in rows]) for name in names}
+        return MonteCarloResult(
+            n_samples=n_samples,
+            n_failures=n_failures,
+            mean={k: s.mean for k, s in stats.items()},
+            std={k: s.std for k, s in stats.items()},
+            min={k: s.min for k, s in stats.items()},
+            max={k: s.max for k, s in stats.items()},
+            percentiles={k: {q: est.value for q, est in qs.items()} for k, qs in quantiles.items()},
+            samples=samples,
+        )
@@ -0,0 +1,232 @@
+"""
+Simulation multi-échelle : avance quasi-statique sur les paliers de vitesse, jumeau
+dynamique complet autour des changements de consigne.
+
+Sur un palier (consignes constantes, régime établi), la dynamique rapide (moteur, span,
+régulateurs) est à l'équilibre et seul l'état lent évolue : rayon, inertie, couple
+d'équilibre (feedforward). La variété lente est intégrée en forme close par grands pas :
+
+    omega = v / ((1 + eps) R)            (span établi : v_amont = v / (1 + eps), eps = T / (E S))
+    dR/dt = e omega / (2 pi)              (géométrie de Winder)  =>  R² += e v H / (pi (1 + eps))
+    tau_moteur = (J(R) d(omega)/dt - T R + C_frottement(omega)) / G
+
+puis l'état complet du jumeau est replacé sur l'équilibre (via TwinCheckpoint), ce qui
+permet au jumeau dynamique de reprendre sans transitoire notable. La tension suit la
+consigne (TaperTension compris) plus l'écart statique mesuré à l'entrée du palier : exact
+en boucle fermée, approché en boucle ouverte où cet écart dérive avec le rayon.
+
+Bascule automatique :
+- quasi-statique quand les consignes sont constantes sur le pas suivant (plus `lead_time`)
+  et que la tension simulée reste dans une bande `tension_band` depuis `settle_time` ;
+- dynamique dès qu'un changement de consigne est à moins de `lead_time` : le jumeau complet
+  traverse la rampe puis se stabilise avant de repasser en quasi-statique.
+
+Example:
+    >>> twin = DigitalTwin(SystemConfig(initial_radius=0.05))
+    >>> speed = SCurveRamp(0.0, 5.0, t_start=0.0) + SpliceSlowdown(1200.0, depth=3.0, dwell=5.0)
+    >>> result = QuasiStaticRunner(twin, macro_dt=1.0).run(speed, 100.0, duration=2400.0)
+    >>> result.history['radius'][-1], result.segments
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+
+from prowinder.simulation import kernel
+from prowinder.simulation.digital_twin import DigitalTwin, Reference, TwinCheckpoint
+from prowinder.simulation.history import HistoryRecorder
+from prowinder.simulation.profiles import ReferenceArrays, TaperTension, sample_references
+
+CHANNELS = ('time', 'omega', 'radius', 'tension', 'tension_est', 'torque', 'inertia', 'quasi_static')
+
+
+@dataclass
+class MultiScaleResult:
+    """
+    Résultat d'une simulation multi-échelle.
+
+    history : échantillons dynamiques (chaque pas dt) et quasi-statiques (chaque grand pas),
+    distingués par le canal 'quasi_static' (0/1) ; segments : (début, fin, 'dynamic' ou
+    'quasi_static').
+    """
+    history: HistoryRecorder
+    dynamic_steps: int = 0
+    macro_steps: int = 0
+    skipped_steps: int = 0
+    segments: List[Tuple[float, float, str]] = field(default_factory=list)
+
+    @property
+    def speedup(self) -> float:
+        """Pas dt simulés par pas réellement calculé."""
+        computed = self.dynamic_steps + self.macro_steps
+        return (self.dynamic_steps + self.skipped_steps) / computed if computed else 1.0
+
+
+class QuasiStaticRunner:
+    """
+    Pilote un DigitalTwin en alternant dynamique complète et avance quasi-statique.
+
+    Args:
+        twin: Jumeau à faire avancer (son état est modifié en place)
+        macro_dt: Pas de la variété lente (s), arrondi à un multiple de dt
+        settle_time: Durée de stabilité de la tension exigée avant un grand pas (s)
+        lead_time: Le jumeau dynamique reprend cette durée avant un changement de consigne (s)
+        tension_band: Variation de tension tolérée (crête à crête, N) pour juger le régime établi
+        reference_tol: Variation relative des consignes considérée comme constante
+    """
+
+    def __init__(self, twin: DigitalTwin, macro_dt: float = 1.0, settle_time: float = 0.5,
+                 lead_time: float = 0.5, tension_band: float = 0.5, reference_tol: float = 1e-9):
+        dt = twin.config.dt
+        self.twin = twin
+        self.macro_steps = max(1, int(round(macro_dt / dt)))
+        self.settle_steps = max(1, int(round(settle_time / dt)))
+        self.lead_steps = max(0, int(round(lead_time / dt)))
+        self.tension_band = tension_band
+        self.reference_tol = reference_tol
+
+    # --- Regime detection ---
+
+    def _steady(self, refs: ReferenceArrays) -> bool:
+        """Consignes constantes (vitesse > 0) sur toute la fenêtre."""
+        speed, tension = refs.speed, refs.tension
+        if speed[0] <= 0.0:
+            return False
+        tol = self.reference_tol
+        if np.ptp(speed) > tol * max(abs(speed[0]), 1.0) or np.ptp(tension) > tol * max(abs(tension[0]), 1.0):
+            return False
+        return refs.speed_dot is None or np.max(np.abs(refs.speed_dot)) <= tol * max(abs(speed[0]), 1.0)
+
+    # --- Slow manifold ---
+
+    def _tension_ref(self, refs: ReferenceArrays, i: int, tension_ref: Reference, radius: float) -> float:
+        tension = refs.tension[i]
+        if isinstance(tension_ref, TaperTension):
+            tension *= tension_ref.factor(radius)
+        return float(tension)
+
+    def _macro_step(self, n: int, refs: ReferenceArrays, tension_ref: Reference, offset: float):
+        """Avance de n pas dt sur la variété lente et replace le jumeau à l'équilibre."""
+        twin = self.twin
+        config = twin.config
+        props = config.material
+        G = config.gear_ratio
+        H = n * config.dt
+        v = float(refs.speed[0])
+        thickness = props.thickness
+        winder = twin.unwinder
+
+        # Radius: exact integration of dR/dt = e * omega / (2 pi) at constant line speed
+        strain = twin.web_span.current_strain
+        R_old = winder.radius
+        R = math.sqrt(max(R_old**2 + thickness * v * H / (math.pi * (1.0 + strain)), winder.core_radius**2))
+
+        tension = self._tension_ref(refs, 0, tension_ref, R) + offset
+        strain = tension / (props.young_modulus * props.thickness * props.width)
+        omega = v / ((1.0 + strain) * R)
+        alpha = -omega * (thickness * omega / (2.0 * math.pi)) / R
+
+        winder.radius = R
+        winder.omega = omega
+        J_total = winder.get_total_inertia() + config.motor_specs.rotor_inertia * G**2
+        torque = (J_total * alpha - tension * R + winder.get_friction_torque()) / G
+
+        state = twin.checkpoint().state.copy()
+        index = kernel.STATE_INDEX
+
+        def put(name, value):
+            state[index[name]] = value
+
+        put('time', state[index['time']] + H)
+        put('tick', state[index['tick']] + n)
+        put('angle', state[index['angle']] + 2.0 * math.pi * (R - R_old) / thickness)
+        put('radius', R)
+        put('omega', omega)
+        put('prev_omega', omega)
+        put('fric_state', omega)
+        put('motor_torque', torque)
+        put('target_torque', torque)
+        put('span_strain', strain)
+        put('tension', tension)
+        put('obs_time', state[index['obs_time']] + H)
+        put('obs_strain', strain)
+        put('obs_last_tension', tension)
+        put('tension_est', tension)
+        if state[index['has_prev_w_ref']]:
+            put('prev_w_ref', v / R)
+        # The integral term holds a torque bias (friction mismatch): keep that torque, not the force
+        put('tension_integrator', state[index['tension_integrator']] * R_old / R)
+        twin.restore(TwinCheckpoint(config, state))
+        return omega, R, tension, torque, J_total
+
+    # --- Main loop ---
+
+    def run(self, speed_ref: Reference = 5.0, tension_ref: Reference = 100.0,
+            duration: float = None) -> MultiScaleResult:
+        """
+        Simule `duration` secondes (défaut : config.duration) à partir de l'état courant du jumeau.
+        """
+        twin = self.twin
+        config = twin.config
+        dt = config.dt
+        G = config.gear_ratio
+        J_motor = config.motor_specs.rotor_inertia * G**2
+        remaining = int(round((config.duration if duration is None else duration) / dt))
+        result = MultiScaleResult(HistoryRecorder(CHANNELS, chunk_size=16384))
+        history = result.history
+
+        # Settling tracker: tension peak-to-peak since the last reset, reset on any reference change
+        stable_steps, t_min, t_max = 0, math.inf, -math.inf
+        offset = 0.0
+        previous = None
+        segment_start, segment_kind = twin.time, None
+
+        def enter(kind):
+            nonlocal segment_start, segment_kind
+            if kind != segment_kind:
+                if segment_kind is not None:
+                    result.segments.append((segment_start, twin.time, segment_kind))
+                segment_start, segment_kind = twin.time, kind
+
+        while remaining > 0:
+            if stable_steps >= self.settle_steps:
+                n = min(self.macro_steps, remaining)
+                refs = sample_references(speed_ref, tension_ref, twin.time, dt, n + self.lead_steps)
+                if self._steady(refs):
+                    if segment_kind != 'quasi_static':
+                        # Steady-state error of the current control mode is carried along the manifold
+                        offset = twin.web_span.tension - self._tension_ref(refs, 0, tension_ref, twin.unwinder.radius)
+                    enter('quasi_static')
+                    omega, R, tension, torque, J_total = self._macro_step(n, refs, tension_ref, offset)
+                    history.append([twin.time, omega, R, tension, tension, torque, J_total, 1.0])
+                    result.macro_steps += 1
+                    result.skipped_steps += n
+                    remaining -= n
+                    continue
+                stable_steps = 0  # A reference change is ahead: stay dynamic until it has settled
+
+            enter('dynamic')
+            n = min(self.settle_steps, remaining)
+            refs = sample_references(speed_ref, tension_ref, twin.time, dt, n)
+            for i in range(n):
+                sample = twin.advance(*twin.reference_at(refs, i, tension_ref))
+                inertia = twin.unwinder.get_total_inertia() + J_motor
+                history.append([sample.time, sample.omega, sample.radius, sample.tension,
+                                sample.tension_est, sample.torque, inertia, 0.0])
+
+                reference = (refs.speed[i], refs.tension[i])  # Base references (before any taper)
+                if reference != previous:
+                    stable_steps, t_min, t_max = 0, math.inf, -math.inf
+                previous = reference
+                t_min, t_max = min(t_min, sample.tension), max(t_max, sample.tension)
+                if t_max - t_min > self.tension_band:
+                    stable_steps, t_min, t_max = 0, sample.tension, sample.tension
+                stable_steps += 1
+            result.dynamic_steps += n
+            remaining -= n
+
+        if segment_kind is not None:
+            result.segments.append((segment_start, twin.time, segment_kind))
+        return result
@@ -0,0 +1,233 @@
+"""
+Profils de consigne (vitesse ligne, tension) pour le jumeau numérique.
+
+Les profils sont évalués en bloc sur une grille temporelle (tableaux NumPy) avant la
+simulation et fournissent leurs dérivées 1ère et 2nde analytiques, ce qui permet un
+feedforward d'inertie exact au lieu d'une différence finie bruitée.
+
+- SCurveRamp : rampe à jerk limité (accélération trapézoïdale)
+- SpliceSlowdown : ralentissement pour raccord (descente, palier, remontée)
+- TaperTension : tension dégressive en fonction du rayon (taper linéaire ou hyperbolique)
+"""
+
+import math
+import numpy as np
+from typing import Callable, NamedTuple, Optional, Tuple, Union
+
+Derivatives = Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]
+
+
+class Profile:
+    """Profil temporel : valeur et dérivées analytiques évaluées sur un tableau de temps."""
+
+    def evaluate(self, t: np.ndarray) -> Derivatives:
+        """Retourne (valeur, dérivée 1ère, dérivée 2nde) ; les dérivées peuvent être None."""
+        raise NotImplementedError
+
+    def __call__(self, t: float) -> float:
+        return float(self.evaluate(np.asarray([t], dtype=float))[0][0])
+
+    def __add__(self, other) -> "SumProfile":
+        return SumProfile(self, as_profile(other))
+
+    __radd__ = __add__
+
+
+class ConstantProfile(Profile):
+    def __init__(self, value: float):
+        self.value = float(value)
+
+    def evaluate(self, t: np.ndarray) -> Derivatives:
+        zeros = np.zeros_like(t, dtype=float)
+        return np.full_like(t, self.value, dtype=float), zeros, zeros
+
+
+class FunctionProfile(Profile):
+    """Adapte une fonction scalaire f(t) ; pas de dérivées analytiques (None)."""
+
+    def __init__(self, func: Callable[[float], float]):
+        self.func = func
+
+    def evaluate(self, t: np.ndarray) -> Derivatives:
+        return np.array([self.func(ti) for ti in t], dtype=float), None, None
+
+
+class SumProfile(Profile):
+    """Somme de profils (ex: rampe de démarrage + ralentissement de raccord)."""
+
+    def __init__(self, *profiles: Profile):
+        self.profiles = profiles
+
+    def evaluate(self, t: np.ndarray) -> Derivatives:
+        value = np.zeros_like(t, dtype=float)
+        d1 = np.zeros_like(t, dtype=float)
+        d2 = np.zeros_like(t, dtype=float)
+        for profile in self.profiles:
+            v, dv, ddv = profile.evaluate(t)
+            value += v
+            if dv is None or ddv is None or d1 is None:
+                d1 = d2 = None
+            else:
+                d1 += dv
+                d2 += ddv
+        return value, d1, d2
+
+
+class SCurveRamp(Profile):
+    """
+    Rampe à jerk limité de `start` vers `end` débutant à `t_start`.
+
+    L'accélération suit un trapèze (montée à jerk constant, palier à max_accel, descente) ;
+    si l'écart est trop faible pour atteindre max_accel, le palier disparaît (profil triangulaire).
+
+    Parameters
+    ----------
+    start, end : float
+        Valeurs initiale et finale (ex: m/s)
+    t_start : float
+        Instant de début de rampe (s)
+    max_accel : float
+        Dérivée 1ère maximale (ex: m/s²)
+    max_jerk : float
+        Dérivée 2nde maximale (ex: m/s³)
+    """
+
+    def __init__(self, start: float, end: float, t_start: float = 0.0, max_accel: float = 1.0, max_jerk: float = 5.0):
+        if max_accel <= 0 or max_jerk <= 0:
+            raise ValueError("max_accel and max_jerk must be positive")
+        self.start = float(start)
+        self.end = float(end)
+        self.t_start = float(t_start)
+        self.sign = 1.0 if end >= start else -1.0
+
+        delta = abs(self.end - self.start)
+        if delta >= max_accel ** 2 / max_jerk:
+            self.t_jerk = max_accel / max_jerk
+            self.t_accel = delta / max_accel - self.t_jerk
+        else:
+            self.t_jerk = math.sqrt(delta / max_jerk)
+            self.t_accel = 0.0
+        self.jerk = max_jerk
+        self.peak_accel = max_jerk * self.t_jerk
+
+    @property
+    def duration(self) -> float:
+        return 2.0 * self.t_jerk + self.t_accel
+
+    @property
+    def t_end(self) -> float:
+        return self.t_start + self.duration
+
+    def evaluate(self, t: np.ndarray) -> Derivatives:
+        t = np.asarray(t, dtype=float)
+        j, a, tj, ta = self.jerk, self.peak_accel, self.t_jerk, self.t_accel
+        tau = t - self.t_start
+
+        phase1 = (tau >= 0) & (tau < tj)
+        phase2 = (tau >= tj) & (tau < tj + ta)
+        phase3 = (tau >= tj + ta) & (tau < 2 * tj + ta)
+        done = tau >= 2 * tj + ta
+        u = tau - tj - ta  # Time inside the jerk-down phase
+
+        progress = np.select(
+            [phase1, phase2, phase3, done],
+            [0.5 * j * tau ** 2,
+             0.5 * j * tj ** 2 + a * (tau - tj),
+             0.5 * j * tj ** 2 + a * ta + a * u - 0.5 * j * u ** 2,
+             abs(self.end - self.start)],
+            default=0.0,
+        )
+        accel = np.select([phase1, phase2, phase3], [j * tau, np.full_like(tau, a), a - j * u], default=0.0)
+        jerk = np.select([phase1, phase3], [np.full_like(tau, j), np.full_like(tau, -j)], default=0.0)
+
+        s = self.sign
+        return self.start + s * progress, s * accel, s * jerk
+
+
+class SpliceSlowdown(SumProfile):
+    """
+    Ralentissement de raccord (splice) : écart de vitesse à ajouter à un profil de base.
+
+    Descend de `depth` à partir de `t_start` (rampe à jerk limité), reste au palier pendant
+    `dwell` secondes puis remonte à la vitesse de base.
+    """
+
+    def __init__(self, t_start: float, depth: float, dwell: float, max_accel: float = 1.0, max_jerk: float = 5.0):
+        down = SCurveRamp(0.0, -depth, t_start, max_accel, max_jerk)
+        up = SCurveRamp(0.0, depth, down.t_end + dwell, max_accel, max_jerk)
+        super().__init__(down, up)
+        self.t_start = t_start
+        self.t_end = up.t_end
+
+
+class TaperTension:
+    """
+    Consigne de tension dégressive en fonction du rayon de bobine.
+
+    T(R) = T_base(t) * f(R), avec :
+    - 'hyperbolic' : f(R) = 1 - taper * (R - R_core) / R
+    - 'linear'     : f(R) = 1 - taper * (R - R_core) / (R_max - R_core)
+
+    Le rayon est un état de la simulation : f(R) est évaluée en forme close à chaque pas
+    (ou en bloc sur un tableau de rayons), avec ses dérivées analytiques df/dR et d²f/dR².
+    """
+
+    def __init__(self, base: Union[float, Profile], taper: float, core_radius: float,
+                 max_radius: Optional[float] = None, law: str = "hyperbolic"):
+        if law not in ("hyperbolic", "linear"):
+            raise ValueError(f"Unknown taper law '{law}'")
+        if law == "linear" and (max_radius is None or max_radius <= core_radius):
+            raise ValueError("Linear taper requires max_radius > core_radius")
+        self.base = as_profile(base)
+        self.taper = taper
+        self.core_radius = core_radius
+        self.max_radius = max_radius
+        self.law = law
+
+    def factor(self, R):
+        if self.law == "hyperbolic":
+            return 1.0 - self.taper * (R - self.core_radius) / R
+        return 1.0 - self.taper * (R - self.core_radius) / (self.max_radius - self.core_radius)
+
+    def factor_derivatives(self, R) -> Derivatives:
+        """Retourne (f(R), df/dR, d²f/dR²)."""
+        R = np.asarray(R, dtype=float)
+        if self.law == "hyperbolic":
+            R_core = self.core_radius
+            return self.factor(R), -self.taper * R_core / R ** 2, 2.0 * self.taper * R_core / R ** 3
+        slope = -self.taper / (self.max_radius - self.core_radius)
+        return self.factor(R), np.full_like(R, slope), np.zeros_like(R)
+
+    def evaluate(self, t: np.ndarray) -> Derivatives:
+        """Consigne de base (avant taper) sur la grille temporelle."""
+        return self.base.evaluate(t)
+
+
+def as_profile(reference) -> Profile:
+    """Convertit une consigne (constante, fonction de t ou Profile) en Profile."""
+    if isinstance(reference, (Profile, TaperTension)):
+        return reference
+    if callable(reference):
+        return FunctionProfile(reference)
+    return ConstantProfile(reference)
+
+
+class ReferenceArrays(NamedTuple):
+    """Consignes précalculées pour n pas consécutifs."""
+    time: np.ndarray
+    speed: np.ndarray
+    speed_dot: Optional[np.ndarray]    # None if the speed profile has no analytic derivative
+    tension: np.ndarray
+
+
+def sample_references(speed, tension, t0: float, dt: float, n_steps: int) -> ReferenceArrays:
+    """
+    Évalue en bloc les consignes vitesse/tension aux instants t0 + k*dt (k = 0..n_steps-1).
+
+    Pour un TaperTension, seule la consigne de base est échantillonnée : le facteur f(R)
+    dépend du rayon simulé et s'applique pas à pas.
+    """
+    t = t0 + dt * np.arange(n_steps)
+    speed_values, speed_dot, _ = as_profile(speed).evaluate(t)
+    tension_values, _, _ = as_profile(tension).evaluate(t)
+    return ReferenceArrays(t, speed_values, speed_dot, tension_values)
@@ -0,0 +1,152 @@
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Log2 latency buckets: bucket k holds durations in [2^k, 2^(k+1)) ns (bucket 0 also holds 0 ns);
+# 40 buckets reach ~18 minutes, far beyond any single stage call
+N_BUCKETS = 40
+
+
+class StageStats:
+    """Compteurs agrégés d'un étage : nombre d'appels, temps total/min/max et histogramme log2."""
+
+    __slots__ = ('calls', 'total_ns', 'min_ns', 'max_ns', 'buckets')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.buckets = [0] * N_BUCKETS
+
+    def add(self, ns: int):
+        self.calls += 1
+        self.total_ns += ns
+        if self.min_ns is None or ns < self.min_ns:
+            self.min_ns = ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.buckets[min(max(ns, 1).bit_length() - 1, N_BUCKETS - 1)] += 1
+
+
+class StageProfiler:
+    """
+    Chronométrage par étage du pas de simulation (perf_counter_ns, compteurs agrégés).
+
+    Les temps sont exclusifs : le temps d'un étage imbriqué dans un autre (ex: 'sensing'
+    appelé par 'control') n'est compté que dans l'étage imbriqué. La somme des étages est
+    donc le temps total passé dans le pas.
+
+    Rien n'est chronométré tant que le profileur n'est pas attaché : DigitalTwin remplace
+    ses méthodes d'étage par des versions chronométrées uniquement si `profiler` est fourni
+    (coût nul sinon).
+
+    Example:
+        >>> profiler = StageProfiler()
+        >>> DigitalTwin(SystemConfig(), profiler=profiler).run()
+        >>> print(profiler.report())
+        >>> edges_ns, counts = profiler.histogram('tension_observer')
+    """
+
+    def __init__(self, clock: Callable[[], int] = time.perf_counter_ns):
+        self.clock = clock
+        self.stats: Dict[str, StageStats] = {}
+        # Time spent in nested stages, one accumulator per open stage
+        self._children: List[int] = []
+
+    def wrap(self, stage: str, function: Callable) -> Callable:
+        """Version chronométrée de `function`, comptée dans l'étage `stage`."""
+        stats = self.stats.setdefault(stage, StageStats())
+        clock = self.clock
+        children = self._children
+
+        def timed(*args, **kwargs):
+            children.append(0)
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                stats.add(elapsed - children.pop())
+                if children:
+                    children[-1] += elapsed
+
+        timed.__wrapped__ = function
+        return timed
+
+    def reset(self):
+        for stage in list(self.stats):
+            self.stats[stage] = StageStats()
+
+    @property
+    def total_ns(self) -> int:
+        return sum(s.total_ns for s in self.stats.values())
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Par étage : appels, temps total (ms), moyenne/min/max (µs) et part du temps total."""
+        total = self.total_ns or 1
+        return {
+            stage: {
+                'calls': s.calls,
+                'total_ms': s.total_ns / 1e6,
+                'mean_us': s.total_ns / s.calls / 1e3 if s.calls else 0.0,
+                'min_us': (s.min_ns or 0) / 1e3,
+                'max_us': s.max_ns / 1e3,
+                'share': s.total_ns / total,
+            }
+            for stage, s in self.stats.items()
+        }
+
+    def histogram(self, stage: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Histogramme des durées d'appel d'un étage.
+
+        Returns:
+            (edges_ns, counts) : N_BUCKETS + 1 bornes (puissances de 2, en ns) et N_BUCKETS effectifs
+        """
+        edges = np.concatenate(([0.0], 2.0 ** np.arange(1, N_BUCKETS + 1)))
+        return edges, np.array(self.stats[stage].buckets, dtype=np.int64)
+
+    def percentile(self, stage: str, q: float) -> float:
+        """Percentile approché (µs, borne haute du bucket log2 qui le contient)."""
+        edges, counts = self.histogram(stage)
+        if counts.sum() == 0:
+            return 0.0
+        cumulative = np.cumsum(counts)
+        index = int(np.searchsorted(cumulative, q / 100.0 * cumulative[-1]))
+        return float(edges[min(index + 1, N_BUCKETS)]) / 1e3
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """Export sérialisable en JSON : résumé et histogramme (effectifs non nuls) de chaque étage."""
+        summary = self.summary()
+        out = {}
+        for stage, s in self.stats.items():
+            out[stage] = dict(summary[stage])
+            out[stage]['histogram_ns'] = {str(1 << k if k else 0): count for k, count in enumerate(s.buckets) if count}
+        return out
+
+    def report(self, sort: bool = True) -> str:
+        """Tableau texte des étages (triés par temps total décroissant)."""
+        summary = self.summary()
+        stages = sorted(summary, key=lambda s: -summary[s]['total_ms']) if sort else list(summary)
+        lines = [f"{'stage':20s} {'calls':>9s} {'total ms':>10s} {'mean us':>9s} {'p99 us':>9s} {'max us':>9s} {'share':>6s}"]
+        for stage in stages:
+            s = summary[stage]
+            lines.append(f"{stage:20s} {s['calls']:9d} {s['total_ms']:10.2f} {s['mean_us']:9.2f} "
+                         f"{self.percentile(stage, 99):9.1f} {s['max_us']:9.1f} {100 * s['share']:5.1f}%")
+        return "\n".join(lines)
+
+
+def attach(profiler: Optional[StageProfiler], stages: Dict[str, Tuple[object, str]]):
+    """
+    Remplace, sur les instances, les méthodes listées par leur version chronométrée.
+
+    Args:
+        stages: {nom d'étage: (objet, nom de méthode)} ; les attributs d'instance masquent
+            les méthodes de classe, les autres instances ne sont pas affectées.
+    """
+    if profiler is None:
+        return
+    for stage, (obj, method) in stages.items():
+        setattr(obj, method, profiler.wrap(stage, getattr(obj, method)))
@@ -0,0 +1,224 @@
+"""
+Exécution cadencée temps réel (soft real-time) du jumeau numérique.
+
+Le jumeau avance d'un pas par période d'horloge murale (par défaut SystemConfig.dt), pour
+les essais automate dans la boucle (PLC-in-the-loop). L'attente de chaque échéance est
+hybride : sommeil du système jusqu'à `spin` secondes avant l'échéance, puis attente active
+sur l'horloge monotone, ce qui réduit la gigue au prix d'un cœur occupé.
+
+Statistiques par cycle : latence de réveil (début réel - échéance), gigue de période,
+temps de calcul et dépassements d'échéance (calcul non terminé avant l'échéance suivante).
+
+Politiques de rattrapage quand le cycle est en retard d'au moins une période :
+- "catch_up" : les pas en retard s'enchaînent sans attente (tous enregistrés) ;
+- "skip_logging" : idem, mais les pas en retard ne sont pas enregistrés dans l'historique ;
+- "substep" : les pas manqués sont exécutés en bloc dans le cycle courant, seul le dernier
+  est enregistré et transmis au callback (le temps simulé reste calé sur l'horloge) ;
+- "slip" : l'échéancier repart de l'instant courant, le temps simulé prend du retard.
+
+Example:
+    >>> runner = PacedRunner(DigitalTwin(SystemConfig(dt=1e-3)), policy="skip_logging")
+    >>> report = runner.run(speed_ref=5.0, duration=10.0, on_cycle=plc.exchange)
+    >>> report.summary()['latency_p99_us'], report.sustainable()
+"""
+
+import gc
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from prowinder.simulation.digital_twin import DigitalTwin, Reference, TwinSample
+from prowinder.simulation.profiles import sample_references
+
+PACING_POLICIES = ("catch_up", "skip_logging", "substep", "slip")
+
+
+@dataclass
+class PacingReport:
+    """Mesures par cycle d'une exécution cadencée (durées en ns)."""
+    period_ns: int
+    latency_ns: np.ndarray   # Wake-up time - deadline (>= 0)
+    start_ns: np.ndarray     # Cycle start, relative to the first deadline
+    compute_ns: np.ndarray   # Time spent stepping the twin (and in the callback)
+    steps: np.ndarray        # Twin steps executed by the cycle (> 1 only with "substep")
+    overrun: np.ndarray      # Cycle finished after the next deadline
+    logged: np.ndarray       # Cycle recorded in the twin history
+
+    @property
+    def cycles(self) -> int:
+        return len(self.latency_ns)
+
+    @property
+    def jitter_ns(self) -> np.ndarray:
+        """Écart des intervalles entre débuts de cycle à la période nominale."""
+        return np.diff(self.start_ns) - self.period_ns
+
+    def max_consecutive_overruns(self) -> int:
+        longest = current = 0
+        for flag in self.overrun:
+            current = current + 1 if flag else 0
+            longest = max(longest, current)
+        return longest
+
+    def summary(self) -> Dict[str, float]:
+        """Latence, gigue et calcul (µs), dépassements et cadence effective."""
+        us = lambda x, q: float(np.percentile(x, q)) / 1e3 if len(x) else 0.0
+        jitter = np.abs(self.jitter_ns)
+        # Wall time until the end of the period(s) of the last cycle
+        elapsed = (self.start_ns[-1] + self.steps[-1] * self.period_ns) if self.cycles else 0
+        steps = int(self.steps.sum())
+        return {
+            'cycles': self.cycles,
+            'steps': steps,
+            'latency_mean_us': float(np.mean(self.latency_ns)) / 1e3 if self.cycles else 0.0,
+            'latency_p99_us': us(self.latency_ns, 99),
+            'latency_max_us': us(self.latency_ns, 100),
+            'jitter_p99_us': us(jitter, 99),
+            'jitter_max_us': us(jitter, 100),
+            'compute_mean_us': float(np.mean(self.compute_ns)) / 1e3 if self.cycles else 0.0,
+            'compute_p99_us': us(self.compute_ns, 99),
+            'overruns': int(self.overrun.sum()),
+            'overrun_ratio': float(self.overrun.mean()) if self.cycles else 0.0,
+            'max_consecutive_overruns': self.max_consecutive_overruns(),
+            'unlogged_cycles': int(self.cycles - self.logged.sum()),
+            'achieved_rate_hz': steps / (elapsed / 1e9) if elapsed > 0 else 0.0,
+        }
+
+    def sustainable(self, max_overrun_ratio: float = 0.0, max_latency: Optional[float] = None) -> bool:
+        """
+        Vrai si la cadence a été tenue : taux de dépassement <= max_overrun_ratio et
+        latence maximale <= max_latency (s, défaut : une période).
+        """
+        limit_ns = self.period_ns if max_latency is None else max_latency * 1e9
+        summary = self.summary()
+        return summary['overrun_ratio'] <= max_overrun_ratio and summary['latency_max_us'] * 1e3 <= limit_ns
+
+
+class PacedRunner:
+    """
+    Cadence un DigitalTwin sur l'horloge monotone (perf_counter_ns).
+
+    Args:
+        twin: Jumeau à cadencer (sa configuration fixe le pas simulé dt)
+        period: Période murale (s) ; défaut config.dt (temps réel strict)
+        policy: Politique de rattrapage (voir PACING_POLICIES)
+        spin: Marge d'attente active avant chaque échéance (s)
+        disable_gc: Suspend le ramasse-miettes cyclique pendant l'exécution (pauses imprévisibles)
+        cpu: Cœur sur lequel épingler le processus (Linux, os.sched_setaffinity) ; None = inchangé
+        clock, sleep: Horloge (ns) et sommeil (s), remplaçables pour les tests
+    """
+
+    def __init__(self, twin: DigitalTwin, period: Optional[float] = None, policy: str = "catch_up",
+                 spin: float = 200e-6, disable_gc: bool = True, cpu: Optional[int] = None,
+                 clock: Callable[[], int] = time.perf_counter_ns, sleep: Callable[[float], None] = time.sleep):
+        if policy not in PACING_POLICIES:
+            raise ValueError(f"Unknown pacing policy '{policy}' (expected one of {PACING_POLICIES})")
+        self.twin = twin
+        self.period_ns = int(round((period or twin.config.dt) * 1e9))
+        if self.period_ns <= 0:
+            raise ValueError("period must be positive")
+        self.policy = policy
+        self.spin_ns = int(spin * 1e9)
+        self.disable_gc = disable_gc
+        self.cpu = cpu
+        self.clock = clock
+        self.sleep = sleep
+
+    def _wait_until(self, deadline: int) -> int:
+        clock = self.clock
+        remaining = deadline - clock()
+        if remaining > self.spin_ns:
+            self.sleep((remaining - self.spin_ns) / 1e9)
+        now = clock()
+        while now < deadline:
+            now = clock()
+        return now
+
+    def run(self, speed_ref: Reference = 5.0, tension_ref: Reference = 100.0, duration: float = 1.0,
+            on_cycle: Optional[Callable[[TwinSample], None]] = None) -> PacingReport:
+        """
+        Simule `duration` secondes de temps simulé en les cadençant sur l'horloge murale.
+
+        Args:
+            speed_ref, tension_ref: Consignes (constantes, fonctions du temps ou Profile)
+            duration: Durée simulée (s)
+            on_cycle: Appelé à chaque cycle avec le dernier échantillon (échange avec l'automate) ;
+                son temps d'exécution est compté dans le calcul du cycle
+
+        Returns:
+            PacingReport
+        """
+        twin = self.twin
+        n = int(round(duration / twin.config.dt))
+        refs = sample_references(speed_ref, tension_ref, twin.time, twin.config.dt, n)
+        twin.history.reserve(n)
+
+        latency = np.zeros(n, dtype=np.int64)
+        start = np.zeros(n, dtype=np.int64)
+        compute = np.zeros(n, dtype=np.int64)
+        steps = np.zeros(n, dtype=np.int32)
+        overrun = np.zeros(n, dtype=bool)
+        logged = np.zeros(n, dtype=bool)
+
+        gc_was_enabled = gc.isenabled()
+        affinity = self._pin()
+        if self.disable_gc:
+            gc.disable()
+        try:
+            clock, period = self.clock, self.period_ns
+            origin = deadline = clock()
+            k = cycle = 0
+            while k < n:
+                wake = self._wait_until(deadline)
+                late = wake - deadline
+                missed = late // period  # Further deadlines already elapsed
+                count = min(1 + missed, n - k) if self.policy == "substep" else 1
+                log = not (missed and self.policy == "skip_logging")
+
+                for i in range(count - 1):
+                    twin.advance(*twin.reference_at(refs, k + i, tension_ref))
+                step_args = twin.reference_at(refs, k + count - 1, tension_ref)
+                sample = twin.step(*step_args) if log else twin.advance(*step_args)
+                if on_cycle is not None:
+                    on_cycle(sample)
+                done = clock()
+
+                latency[cycle], start[cycle], compute[cycle] = late, wake - origin, done - wake
+                steps[cycle], logged[cycle] = count, log
+                if self.policy == "slip" and missed:
+                    deadline = wake
+                deadline += count * period
+                overrun[cycle] = done > deadline
+                k += count
+                cycle += 1
+        finally:
+            if self.disable_gc and gc_was_enabled:
+                gc.enable()
+            if affinity is not None:
+                os.sched_setaffinity(0, affinity)
+
+        return PacingReport(period, latency[:cycle], start[:cycle], compute[:cycle],
+                            steps[:cycle], overrun[:cycle], logged[:cycle])
+
+    def _pin(self):
+        """Épingle le processus sur self.cpu ; retourne l'affinité précédente (ou None)."""
+        if self.cpu is None or not hasattr(os, 'sched_setaffinity'):
+            return None
+        previous = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, {self.cpu})
+        return previous
+
+
+if __name__ == "__main__":
+    # Sustainability check of a 1 kHz loop on this machine
+    import sys
+    from prowinder.simulation.digital_twin import SystemConfig
+
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    report = PacedRunner(DigitalTwin(SystemConfig(dt=1e-3))).run(duration=seconds)
+    for key, value in report.summary().items():
+        print(f"{key:26s} {value:.3f}" if isinstance(value, float) else f"{key:26s} {value}")
+    print("1 kHz sustainable:", report.sustainable())
@@ -0,0 +1,363 @@
+"""
+Rejeu hors ligne des estimateurs sur des traces variateur enregistrées.
+
+Une trace est une suite de blocs (chunks) colonnaires avec les canaux :
+    time (s), torque (N.m, couple moteur), omega (rad/s), line_speed (m/s), tension (N, cellule de charge)
+et éventuellement radius (m) ou tout autre canal mesuré. Les blocs peuvent venir d'un
+dictionnaire de tableaux, d'un fichier de trace .pwt (blocs mappés en mémoire, voir
+trace_file), d'un fichier .npz, d'un CSV lu par morceaux, ou de n'importe quel itérable de
+blocs : la trace n'est jamais chargée en entier.
+
+Seuls les canaux lus par les estimateurs sont décodés ; les autres colonnes (horodatage
+texte, état machine, ...) sont ignorées.
+
+Le moteur calcule les canaux dérivés (dt, alpha = d(omega)/dt) en conservant l'état d'un
+bloc à l'autre, puis fait passer chaque bloc dans les adaptateurs d'estimateurs, dans
+l'ordre : les sorties d'un adaptateur ("radius.radius", ...) sont des entrées possibles
+des suivants. Les sorties sont écrites en colonnes NumPy, ou transmises bloc par bloc à un
+`sink` pour les traces qui ne tiennent pas en mémoire.
+
+Limites : le découpage en blocs borne la mémoire et vectorise la lecture et les canaux
+dérivés, mais les estimateurs sont des objets à état appelés échantillon par échantillon
+(boucle Python dans chaque adaptateur). Le seul parallélisme est un fichier par processus
+avec replay_many() ; une trace unique se rejoue sur un seul cœur.
+
+Example:
+    >>> engine = ReplayEngine({
+    ...     'radius': RadiusReplay(RadiusCalculator(R0=0.05, film_thickness=50e-6, roller_length=1.0), 50e-6),
+    ...     'tension': TensionReplay(TensionObserver(material, span_length=1.5), radius='radius.radius'),
+    ... })
+    >>> out = engine.run('logs/2026-03-02.csv', chunk_size=100_000)
+    >>> out['tension.tension'], out['radius.confidence']
+    >>> with TraceWriter('replay.pwt') as writer:   # Outputs streamed to a trace file
+    ...     engine.run(TraceReader('log.pwt').iter_chunks(TRACE_CHANNELS, t_start=3600.0), sink=writer.write)
+"""
+
+import os
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from prowinder.control.inertia_estimator import InertiaEstimator
+from prowinder.control.observers import FrictionObserver
+from prowinder.control.radius_estimator import RadiusCalculator
+from prowinder.control.tension_observer import TENSION_MODES, TensionObserver
+from prowinder.simulation.trace_file import TraceReader
+
+TRACE_CHANNELS = ("time", "torque", "omega", "line_speed", "tension")
+
+Chunk = Mapping[str, np.ndarray]
+# A channel given by name (trace, derived or upstream estimator output) or a constant value
+ChannelOrValue = Union[str, float]
+
+
+def iter_chunks(source, chunk_size: int = 65536,
+                channels: Optional[Sequence[str]] = None) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Découpe une source de trace en blocs colonnaires float64.
+
+    Args:
+        source: dict de tableaux, TraceReader, chemin .pwt, .npz ou .csv (en-tête = noms
+            de canaux), ou itérable de blocs (dicts de tableaux) déjà découpés
+        chunk_size: Nombre d'échantillons par bloc (dict, npz, csv ; un .pwt garde ses blocs)
+        channels: Canaux à lire (les autres ne sont pas décodés) ; None = tous les canaux
+            numériques, les colonnes non numériques (texte, dates) étant ignorées
+    """
+    wanted = None if channels is None else set(channels)
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if path.endswith(".pwt"):
+            yield from _trace_chunks(TraceReader(path), wanted)
+        elif path.endswith(".npz"):
+            with np.load(path) as data:
+                names = [name for name in data.files if wanted is None or name in wanted]
+                yield from _slice_columns({name: data[name] for name in names}, chunk_size, wanted)
+        elif path.endswith(".csv"):
+            import pandas as pd  # Only needed for CSV traces
+            usecols = None if wanted is None else (lambda name: name in wanted)
+            for frame in pd.read_csv(path, chunksize=chunk_size, usecols=usecols):
+                yield _numeric({name: frame[name].to_numpy() for name in frame.columns}, wanted)
+        else:
+            raise ValueError(f"Unsupported trace format '{path}' (expected .pwt, .npz or .csv)")
+    elif isinstance(source, TraceReader):
+        yield from _trace_chunks(source, wanted)
+    elif isinstance(source, Mapping):
+        yield from _slice_columns(source, chunk_size, wanted)
+    else:
+        for chunk in source:
+            yield _numeric(chunk, wanted)
+
+
+def _numeric(columns: Mapping[str, np.ndarray], wanted: Optional[set]) -> Dict[str, np.ndarray]:
+    """Colonnes float64 ; une colonne non numérique est ignorée, sauf si elle est demandée."""
+    out = {}
+    for name, column in columns.items():
+        if wanted is not None and name not in wanted:
+            continue
+        column = np.asarray(column)
+        if column.dtype.kind not in "biuf":
+            if wanted is None:
+                continue  # Timestamp strings, status text, ...
+            raise ValueError(f"Trace channel '{name}' is not numeric (dtype {column.dtype})")
+        out[name] = column.astype(float, copy=False)
+    return out
+
+
+def _trace_chunks(trace: TraceReader, wanted: Optional[set]) -> Iterator[Dict[str, np.ndarray]]:
+    # Stored chunks are replayed as is; category channels are not estimator inputs
+    names = [name for name in trace.numeric_channels if wanted is None or name in wanted]
+    for chunk in trace.iter_chunks(names):
+        yield {name: np.asarray(column, dtype=float) for name, column in chunk.items()}
+
+
+def _slice_columns(columns: Mapping[str, np.ndarray], chunk_size: int,
+                   wanted: Optional[set]) -> Iterator[Dict[str, np.ndarray]]:
+    n = len(next(iter(columns.values())))
+    for start in range(0, n, chunk_size):
+        yield _numeric({name: column[start:start + chunk_size] for name, column in columns.items()}, wanted)
+
+
+def _column(chunk: Chunk, spec: ChannelOrValue, n: int) -> list:
+    """Canal `spec` du bloc (ou valeur constante) sous forme de liste Python (boucles rapides)."""
+    if isinstance(spec, str):
+        return chunk[spec].tolist()
+    return [float(spec)] * n
+
+
+class EstimatorReplay:
+    """
+    Adaptateur d'un estimateur pour le rejeu : lit des canaux du bloc, appelle l'estimateur
+    échantillon par échantillon et retourne ses sorties en colonnes.
+
+    Les sous-classes définissent `outputs` (noms des canaux produits) et process().
+    """
+    outputs: Tuple[str, ...] = ()
+
+    def inputs(self) -> Tuple[str, ...]:
+        """Canaux nommés requis dans chaque bloc."""
+        return ()
+
+    def process(self, chunk: Chunk) -> Dict[str, np.ndarray]:
+        raise NotImplementedError
+
+
+class RadiusReplay(EstimatorReplay):
+    """RadiusCalculator.estimate (la vitesse ligne est convertie en m/min)."""
+    outputs = ("radius", "confidence")
+
+    def __init__(self, calculator: RadiusCalculator, film_thickness: ChannelOrValue):
+        self.calculator = calculator
+        self.film_thickness = film_thickness
+
+    def inputs(self):
+        return ("line_speed", "omega", "dt") + ((self.film_thickness,) if isinstance(self.film_thickness, str) else ())
+
+    def process(self, chunk):
+        n = len(chunk["omega"])
+        estimate = self.calculator.estimate
+        radius, confidence = [], []
+        for v, w, e, dt in zip((chunk["line_speed"] * 60.0).tolist(), chunk["omega"].tolist(),
+                               _column(chunk, self.film_thickness, n), chunk["dt"].tolist()):
+            result = estimate(v, w, e, dt)
+            radius.append(result.radius)
+            confidence.append(result.confidence)
+        return {"radius": np.array(radius), "confidence": np.array(confidence)}
+
+
+class TensionReplay(EstimatorReplay):
+    """
+    TensionObserver.update. La bande amont défile à omega * R, la bande aval à la vitesse
+    ligne ; la tension mesurée (cellule de charge) est transmise à l'observateur.
+    """
+    outputs = ("tension", "confidence", "mode", "friction")
+
+    def __init__(self, observer: TensionObserver, radius: ChannelOrValue = "radius",
+                 inertia: Optional[ChannelOrValue] = None, gear_ratio: float = 1.0,
+                 use_load_cell: bool = True):
+        self.observer = observer
+        self.radius = radius
+        self.inertia = inertia
+        self.gear_ratio = gear_ratio
+        self.use_load_cell = use_load_cell
+
+    def inputs(self):
+        named = [spec for spec in (self.radius, self.inertia) if isinstance(spec, str)]
+        return ("torque", "omega", "alpha", "line_speed", "dt") + (("tension",) if self.use_load_cell else ()) + tuple(named)
+
+    def process(self, chunk):
+        n = len(chunk["omega"])
+        update = self.observer.update
+        radius = _column(chunk, self.radius, n)
+        inertia = _column(chunk, self.inertia, n) if self.inertia is not None else [None] * n
+        measured = chunk["tension"].tolist() if self.use_load_cell else [None] * n
+        tension, confidence, mode, friction = [], [], [], []
+        mode_code = {m: i for i, m in enumerate(TENSION_MODES)}
+        for tau, w, alpha, v, dt, R, J, T in zip((chunk["torque"] * self.gear_ratio).tolist(), chunk["omega"].tolist(),
+                                                 chunk["alpha"].tolist(), chunk["line_speed"].tolist(),
+                                                 chunk["dt"].tolist(), radius, inertia, measured):
+            estimate = update(tau_motor=tau, omega=w, alpha=alpha, R=R, v_upstream=w * R, v_downstream=v,
+                              J_total=J, dt=dt, tension_measured=T)
+            tension.append(estimate.tension)
+            confidence.append(estimate.confidence)
+            mode.append(mode_code[estimate.mode])
+            friction.append(estimate.friction_est)
+        return {"tension": np.array(tension), "confidence": np.array(confidence),
+                "mode": np.array(mode, dtype=np.int8), "friction": np.array(friction)}
+
+
+class InertiaReplay(EstimatorReplay):
+    """InertiaEstimator.update (pas d'échantillonnage fixé par l'estimateur)."""
+    outputs = ("J_total", "f_coulomb", "f_viscous", "confidence")
+
+    def __init__(self, estimator: InertiaEstimator, radius: ChannelOrValue = "radius",
+                 tension: ChannelOrValue = "tension"):
+        self.estimator = estimator
+        self.radius = radius
+        self.tension = tension
+
+    def inputs(self):
+        return ("torque", "omega", "alpha") + tuple(s for s in (self.radius, self.tension) if isinstance(s, str))
+
+    def process(self, chunk):
+        n = len(chunk["omega"])
+        update = self.estimator.update
+        columns = {name: [] for name in self.outputs}
+        for tau, w, alpha, T, R in zip(chunk["torque"].tolist(), chunk["omega"].tolist(), chunk["alpha"].tolist(),
+                                       _column(chunk, self.tension, n), _column(chunk, self.radius, n)):
+            estimate = update(tau, w, alpha, T, R)
+            for name in self.outputs:
+                columns[name].append(getattr(estimate, name))
+        return {name: np.array(values) for name, values in columns.items()}
+
+
+class FrictionReplay(EstimatorReplay):
+    """FrictionObserver.update ; l'inertie est une constante ou un canal (ex: 'inertia.J_total')."""
+    outputs = ("friction",)
+
+    def __init__(self, observer: FrictionObserver, inertia: ChannelOrValue):
+        self.observer = observer
+        self.inertia = inertia
+
+    def inputs(self):
+        return ("torque", "omega", "dt") + ((self.inertia,) if isinstance(self.inertia, str) else ())
+
+    def process(self, chunk):
+        n = len(chunk["omega"])
+        update = self.observer.update
+        friction = [update(w, tau, dt, J) for w, tau, dt, J in zip(chunk["omega"].tolist(), chunk["torque"].tolist(),
+                                                                    chunk["dt"].tolist(), _column(chunk, self.inertia, n))]
+        return {"friction": np.array(friction, dtype=float)}
+
+
+class ReplayEngine:
+    """
+    Fait passer une trace, bloc par bloc, dans une suite ordonnée d'estimateurs.
+
+    Args:
+        estimators: {nom: adaptateur} ; les sorties sont nommées "nom.canal"
+        dt: Pas supposé pour le tout premier échantillon (défaut : second pas de temps de la trace)
+    """
+
+    def __init__(self, estimators: Mapping[str, EstimatorReplay], dt: Optional[float] = None):
+        self.estimators = dict(estimators)
+        self.dt = dt
+        self._last_time: Optional[float] = None
+        self._last_omega = 0.0
+
+    def _derive(self, chunk: Dict[str, np.ndarray]):
+        """Canaux dérivés dt et alpha, continus d'un bloc au suivant."""
+        t = chunk["time"]
+        omega = chunk["omega"]
+        if self._last_time is None:
+            first_dt = self.dt if self.dt is not None else (t[1] - t[0] if len(t) > 1 else 1e-3)
+            prev_t = np.concatenate(([t[0] - first_dt], t[:-1]))
+            prev_w = np.concatenate(([omega[0]], omega[:-1]))
+        else:
+            prev_t = np.concatenate(([self._last_time], t[:-1]))
+            prev_w = np.concatenate(([self._last_omega], omega[:-1]))
+        dt = t - prev_t
+        chunk["dt"] = dt
+        chunk["alpha"] = np.divide(omega - prev_w, dt, out=np.zeros_like(dt), where=dt > 0)
+        self._last_time = float(t[-1])
+        self._last_omega = float(omega[-1])
+
+    def channels(self) -> List[str]:
+        """Canaux de trace lus par le moteur et ses estimateurs (hors canaux dérivés et sorties)."""
+        produced = tuple(f"{name}." for name in self.estimators)
+        names = ["time", "omega"]
+        for estimator in self.estimators.values():
+            names.extend(channel for channel in estimator.inputs()
+                         if channel not in ("dt", "alpha") and not channel.startswith(produced))
+        return list(dict.fromkeys(names))
+
+    def process_chunk(self, chunk: Chunk) -> Dict[str, np.ndarray]:
+        """Rejoue un bloc ; retourne 'time' et les sorties "nom.canal" du bloc."""
+        chunk = dict(chunk)
+        missing = [name for name in ("time", "omega") if name not in chunk]
+        if missing:
+            raise ValueError(f"Trace chunk is missing channels {missing}")
+        self._derive(chunk)
+        out = {"time": chunk["time"]}
+        for name, estimator in self.estimators.items():
+            missing = [channel for channel in estimator.inputs() if channel not in chunk]
+            if missing:
+                raise ValueError(f"Estimator '{name}' needs channels {missing}")
+            for channel, column in estimator.process(chunk).items():
+                chunk[f"{name}.{channel}"] = out[f"{name}.{channel}"] = column
+        return out
+
+    def run(self, source, chunk_size: int = 65536,
+            sink: Optional[Callable[[Dict[str, np.ndarray]], None]] = None) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Rejoue toute une trace.
+
+        Args:
+            source: Voir iter_chunks()
+            chunk_size: Échantillons par bloc
+            sink: Reçoit les sorties de chaque bloc (rien n'est conservé en mémoire) ;
+                None = sorties concaténées et retournées
+
+        Returns:
+            Colonnes de sortie ('time', "nom.canal", ...) ou None si `sink` est fourni
+        """
+        parts: List[Dict[str, np.ndarray]] = []
+        for chunk in iter_chunks(source, chunk_size, self.channels()):
+            out = self.process_chunk(chunk)
+            if sink is not None:
+                sink(out)
+            else:
+                parts.append(out)
+        if sink is not None:
+            return None
+        if not parts:
+            return {}
+        return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+def _replay_source(args):
+    factory, source, chunk_size = args
+    return ReplayEngine(factory()).run(source, chunk_size)
+
+
+def replay_many(sources: Sequence, factory: Callable[[], Mapping[str, EstimatorReplay]],
+                chunk_size: int = 65536, processes: Optional[int] = None) -> List[Dict[str, np.ndarray]]:
+    """
+    Rejoue plusieurs traces indépendantes (ex: un fichier par jour) en parallèle.
+
+    Args:
+        sources: Traces (voir iter_chunks)
+        factory: Fonction picklable (niveau module) créant des estimateurs neufs pour chaque trace
+        processes: Nombre de processus (None = nombre de cœurs, 0 ou 1 = exécution locale)
+
+    Returns:
+        Sorties de chaque trace, dans l'ordre de `sources`
+    """
+    tasks = [(factory, source, chunk_size) for source in sources]
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(tasks))
+    if processes <= 1:
+        return [_replay_source(task) for task in tasks]
+    from concurrent.futures import ProcessPoolExecutor  # Not needed by the workers themselves
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(_replay_source, tasks))
@@ -0,0 +1,44 @@
+from typing import Dict
+
+
+class MultiRateScheduler:
+    """
+    Ordonnanceur multi-cadence à la manière des classes de tâches d'un automate.
+
+    Le pas de base (`base_dt`) est celui de la physique ; chaque classe de tâche
+    (commande, estimateurs, ...) s'exécute tous les `divisor` pas de base et ses sorties
+    sont maintenues (échantillonneur-bloqueur) entre deux exécutions.
+
+    Examples
+    --------
+    >>> sched = MultiRateScheduler(1e-4, {"control": 1e-3, "estimator": 1e-2})
+    >>> sched.divisors
+    {'control': 10, 'estimator': 100}
+    """
+
+    def __init__(self, base_dt: float, periods: Dict[str, float]):
+        if base_dt <= 0:
+            raise ValueError("base_dt must be positive")
+        self.base_dt = base_dt
+        self.divisors: Dict[str, int] = {}
+        for name, period in periods.items():
+            ratio = period / base_dt
+            divisor = int(round(ratio))
+            if divisor < 1 or abs(ratio - divisor) > 1e-6 * max(ratio, 1.0):
+                raise ValueError(f"Period of task '{name}' ({period}) must be an integer multiple of dt ({base_dt})")
+            self.divisors[name] = divisor
+        self.tick = 0
+
+    def period(self, name: str) -> float:
+        """Période effective (s) d'une classe de tâche."""
+        return self.base_dt * self.divisors[name]
+
+    def due(self, name: str) -> bool:
+        """Vrai si la tâche doit s'exécuter au pas de base courant."""
+        return self.tick % self.divisors[name] == 0
+
+    def advance(self):
+        self.tick += 1
+
+    def reset(self):
+        self.tick = 0
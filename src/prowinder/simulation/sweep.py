@@ -0,0 +1,203 @@
+"""
+Balayage de paramètres du jumeau numérique sur un pool de processus.
+
+Chaque point du balayage est un dictionnaire de surcharges de SystemConfig ; les champs
+imbriqués s'écrivent en notation pointée ("material.young_modulus", "motor_specs.rated_torque").
+Les processus de travail reçoivent une seule fois la configuration de base, les consignes
+et la fonction de KPI (initializer du pool), puis traitent les points par paquets (chunks).
+Le résultat est rassemblé en colonnes NumPy (une colonne par paramètre, par KPI, et un
+tableau (n_runs, n_steps) par trajectoire demandée).
+
+Example:
+    >>> points = grid(tension_kp=[0.2, 0.5, 1.0], **{"material.young_modulus": [2e9, 4e9]})
+    >>> result = run_sweep(SystemConfig(duration=2.0), points, processes=4)
+    >>> result.best("tension_rms_error")
+"""
+
+import itertools
+import math
+import os
+from dataclasses import dataclass, field, fields, is_dataclass, replace
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from prowinder.simulation.digital_twin import DigitalTwin, Reference, SystemConfig
+from prowinder.simulation.events import Event, divergence
+from prowinder.simulation.profiles import ReferenceArrays, as_profile
+
+# KPI function: (history, sampled references) -> {name: value}. Must be picklable
+# (module-level function) to be sent to the worker processes.
+KpiFunction = Callable[[Mapping[str, np.ndarray], ReferenceArrays], Dict[str, float]]
+
+
+def grid(**axes: Sequence[Any]) -> List[Dict[str, Any]]:
+    """Produit cartésien des axes : grid(a=[1, 2], b=[3]) -> [{'a': 1, 'b': 3}, {'a': 2, 'b': 3}]."""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[name] for name in names))]
+
+
+def apply_overrides(config: SystemConfig, overrides: Mapping[str, Any]) -> SystemConfig:
+    """Copie de `config` avec les surcharges appliquées (clés pointées pour les champs imbriqués)."""
+    for key, value in overrides.items():
+        config = _replace_path(config, key.split("."), value, key)
+    return config
+
+
+def _replace_path(obj, path: List[str], value, key: str):
+    if not is_dataclass(obj) or path[0] not in {f.name for f in fields(obj)}:
+        raise ValueError(f"Unknown configuration parameter '{key}'")
+    if len(path) == 1:
+        return replace(obj, **{path[0]: value})
+    return replace(obj, **{path[0]: _replace_path(getattr(obj, path[0]), path[1:], value, key)})
+
+
+def default_kpis(history: Mapping[str, np.ndarray], references: ReferenceArrays) -> Dict[str, float]:
+    """KPI de tension et d'effort ; les erreurs sont calculées sur la 2nde moitié du run (régime établi)."""
+    tension = history['tension']
+    error = tension - references.tension
+    settled = error[len(error) // 2:]
+    return {
+        'final_tension': float(tension[-1]),
+        'tension_rms_error': float(np.sqrt(np.mean(settled ** 2))),
+        'tension_max_error': float(np.max(np.abs(settled))),
+        'tension_peak': float(np.max(tension)),
+        'torque_peak': float(np.max(np.abs(history['torque']))),
+        'final_radius': float(history['radius'][-1]),
+    }
+
+
+@dataclass
+class SweepResult:
+    """Résultat en colonnes : paramètres, KPI et trajectoires optionnelles (une ligne par run)."""
+    parameters: Dict[str, np.ndarray]
+    kpis: Dict[str, np.ndarray]
+    trajectories: Dict[str, np.ndarray] = field(default_factory=dict)
+    time: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        columns = next(iter(self.kpis.values()), None)
+        return 0 if columns is None else len(columns)
+
+    def best(self, kpi: str, minimize: bool = True) -> Dict[str, Any]:
+        """Paramètres et KPI du meilleur run selon `kpi`."""
+        values = self.kpis[kpi]
+        i = int(np.argmin(values) if minimize else np.argmax(values))
+        row = {name: column[i] for name, column in self.parameters.items()}
+        row.update({name: column[i] for name, column in self.kpis.items()})
+        return row
+
+    def to_dataframe(self):
+        """DataFrame pandas (paramètres + KPI) ; pandas n'est importé qu'ici."""
+        import pandas as pd
+        return pd.DataFrame({**self.parameters, **self.kpis})
+
+
+# Per-process context installed once by the pool initializer (pool workers only)
+_WORKER: Dict[str, Any] = {}
+
+
+def _context(base_config: SystemConfig, speed_ref: Reference, tension_ref: Reference,
+             kpis: KpiFunction, channels: Sequence[str], events: Sequence[Event] = ()) -> Dict[str, Any]:
+    return dict(base_config=base_config, speed_ref=speed_ref, tension_ref=tension_ref,
+                kpis=kpis, channels=tuple(channels), events=tuple(events))
+
+
+def _init_worker(*setup):
+    _WORKER.update(_context(*setup))
+
+
+def evaluate_config(config: SystemConfig, speed_ref: Reference, tension_ref: Reference, kpis: KpiFunction,
+                    channels: Sequence[str] = (), rng: Optional[np.random.Generator] = None,
+                    events: Sequence[Event] = (), stop_on_divergence: bool = False):
+    """
+    Simule une configuration et retourne (KPI, trajectoires, temps ou None).
+
+    Avec des événements, les KPI sont calculés sur la partie simulée et complétés par
+    'terminated' (1.0 si un événement terminal a arrêté le run) et 'event_time' (instant
+    du premier événement, NaN si aucun).
+
+    Avec `stop_on_divergence`, le run s'arrête au premier échantillon non fini
+    (events.divergence) et les KPI valent None.
+    """
+    twin = DigitalTwin(config, rng=rng)
+    monitored = tuple(events) + ((divergence(),) if stop_on_divergence else ())
+    history = twin.run(speed_ref=speed_ref, tension_ref=tension_ref, events=monitored)
+    if stop_on_divergence and any(record.name == 'divergence' for record in twin.events):
+        return None, {}, None
+    # References at the start of each recorded step (works with decimated histories too)
+    t = history['time'] - config.dt
+    speed, speed_dot, _ = as_profile(speed_ref).evaluate(t)
+    references = ReferenceArrays(t, speed, speed_dot, as_profile(tension_ref).evaluate(t)[0])
+    trajectories = {name: np.array(history[name]) for name in channels}
+    values = kpis(history, references)
+    if events:
+        values['terminated'] = float(any(record.terminal for record in twin.events))
+        values['event_time'] = twin.events[0].time if twin.events else math.nan
+    return values, trajectories, (history['time'] if channels else None)
+
+
+def _evaluate_point(ctx: Mapping[str, Any], overrides: Mapping[str, Any]):
+    config = apply_overrides(ctx['base_config'], overrides)
+    return evaluate_config(config, ctx['speed_ref'], ctx['tension_ref'], ctx['kpis'], ctx['channels'],
+                           events=ctx['events'])
+
+
+def _run_point(overrides: Mapping[str, Any]):
+    return _evaluate_point(_WORKER, overrides)
+
+
+def run_sweep(
+    base_config: SystemConfig,
+    points: Iterable[Mapping[str, Any]],
+    speed_ref: Reference = 5.0,
+    tension_ref: Reference = 100.0,
+    kpis: KpiFunction = default_kpis,
+    trajectories: Sequence[str] = (),
+    processes: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    events: Sequence[Event] = (),
+) -> SweepResult:
+    """
+    Simule chaque point (surcharges de `base_config`) et agrège les résultats en colonnes.
+
+    Args:
+        base_config: Configuration commune
+        points: Surcharges par run, ex: grid(...) ou liste de dicts
+        speed_ref, tension_ref: Consignes communes (constantes ou profils picklables)
+        kpis: Fonction (history, références) -> dict de KPI
+        trajectories: Canaux d'historique à conserver, ex: ('tension', 'torque').
+            Tous les runs doivent alors avoir le même nombre de pas.
+        processes: Nombre de processus (None = nombre de cœurs, 0 ou 1 = exécution locale)
+        chunksize: Points par paquet envoyé à un processus (défaut : ~4 paquets par processus)
+        events: Événements picklables (simulation.events) ; un événement terminal arrête le
+            run concerné (KPI 'terminated' et 'event_time'). Incompatible avec `trajectories`
+            si un run peut s'arrêter tôt (longueurs différentes).
+
+    Returns:
+        SweepResult
+    """
+    points = [dict(p) for p in points]
+    setup = (base_config, speed_ref, tension_ref, kpis, tuple(trajectories), tuple(events))
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(points))
+
+    if processes <= 1:
+        # Local run: explicit context, the module-level worker state is left alone
+        ctx = _context(*setup)
+        outputs = [_evaluate_point(ctx, p) for p in points]
+    else:
+        if chunksize is None:
+            chunksize = max(1, len(points) // (4 * processes))
+        from concurrent.futures import ProcessPoolExecutor  # Not needed by the workers themselves
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=setup) as pool:
+            outputs = list(pool.map(_run_point, points, chunksize=chunksize))
+
+    names = list(dict.fromkeys(key for p in points for key in p))
+    parameters = {name: np.array([p.get(name) for p in points]) for name in names}
+    kpi_names = list(outputs[0][0]) if outputs else []
+    kpi_columns = {name: np.array([out[0][name] for out in outputs], dtype=float) for name in kpi_names}
+    trajectory_columns = {name: np.stack([out[1][name] for out in outputs]) for name in trajectories} if outputs else {}
+    time = outputs[0][2] if outputs and trajectories else None
+    return SweepResult(parameters, kpi_columns, trajectory_columns, time)
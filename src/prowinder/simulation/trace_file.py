@@ -0,0 +1,373 @@
+"""
+Format de trace binaire colonnaire (.pwt) pour les longues simulations et les journaux de production.
+
+Disposition du fichier :
+    MAGIC | bloc 0 | bloc 1 | ... | index JSON | longueur de l'index (uint64) | MAGIC
+
+Chaque bloc contient `chunk_size` échantillons, colonne par colonne (octets bruts
+little-endian alignés sur 8 octets, ou compressés zlib). L'index en fin de fichier décrit
+les canaux (type, libellés des canaux de catégorie) et, pour chaque bloc, son nombre
+d'échantillons, l'emplacement de chaque colonne et le premier/dernier instant : c'est
+l'index temporel creux. Extraire une fenêtre [t0, t1] ne lit que les blocs concernés ; les
+colonnes non compressées sont des vues sur le fichier mappé en mémoire (aucune copie).
+
+Les canaux de catégorie (ex: 'tension_mode') sont stockés en codes int8, comme dans
+HistoryRecorder. Le temps doit être croissant pour que l'index soit valide.
+
+Example:
+    >>> with TraceWriter("run.pwt", compression="zlib") as writer:
+    ...     for block in twin.iter_steps(duration=3600.0, block_size=65536):
+    ...         writer.write(block, labels={'tension_mode': TENSION_MODES})
+    >>> trace = TraceReader("run.pwt")
+    >>> window = trace.window(1800.0, 1810.0, channels=('tension', 'radius'))
+"""
+
+import json
+import os
+import struct
+import zlib
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MAGIC = b"PWTRACE1"
+FORMAT_VERSION = 1
+COMPRESSIONS = (None, "zlib")
+_FOOTER = struct.Struct("<Q")
+_ALIGN = 8
+
+
+class TraceWriter:
+    """
+    Écriture en flux d'un fichier de trace, bloc par bloc (mémoire bornée à un bloc).
+
+    Les canaux sont fixés par la première écriture. Le fichier n'est lisible qu'après
+    close() (l'index est écrit en dernier) : utiliser le gestionnaire de contexte.
+
+    Args:
+        path: Fichier de sortie (écrasé)
+        chunk_size: Échantillons par bloc (granularité de l'index temporel et de la lecture)
+        compression: None (colonnes mappables sans copie) ou "zlib"
+        level: Niveau de compression zlib
+        time_channel: Canal de temps indexé (None = pas d'index temporel)
+    """
+
+    def __init__(self, path, chunk_size: int = 65536, compression: Optional[str] = None,
+                 level: int = 6, time_channel: Optional[str] = "time"):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression '{compression}' (expected one of {COMPRESSIONS})")
+        self.path = os.fspath(path)
+        self.chunk_size = chunk_size
+        self.compression = compression
+        self.level = level
+        self.time_channel = time_channel
+
+        self._file = open(self.path, "wb")
+        self._file.write(MAGIC)
+        self._dtypes: Optional[Dict[str, np.dtype]] = None
+        self._labels: Dict[str, List[str]] = {}
+        self._pending: Dict[str, List[np.ndarray]] = {}
+        self._n_pending = 0
+        self._chunks: List[dict] = []
+        self._last_time = -np.inf
+        self.n_samples = 0
+
+    # --- Channels ---
+
+    def _declare(self, columns: Dict[str, np.ndarray], labels: Mapping[str, Sequence[str]]):
+        self._dtypes = {}
+        for name, column in columns.items():
+            if name in labels or column.dtype.kind in "OUS":
+                self._dtypes[name] = np.dtype(np.int8)
+                self._labels[name] = list(labels.get(name, ()))
+            elif column.dtype.kind in "biuf":
+                self._dtypes[name] = column.dtype.newbyteorder("<")
+            else:
+                raise ValueError(f"Unsupported dtype {column.dtype} for channel '{name}'")
+        if self.time_channel is not None and self.time_channel not in self._dtypes:
+            raise ValueError(f"Time channel '{self.time_channel}' is missing")
+        self._pending = {name: [] for name in self._dtypes}
+
+    def _encode(self, name: str, column: np.ndarray) -> np.ndarray:
+        """Libellés -> codes int8 (catégories étendues à la volée)."""
+        if column.dtype.kind not in "OUS":
+            return column.astype(np.int8, copy=False)
+        known = self._labels[name]
+        code_of = {label: i for i, label in enumerate(known)}
+        values, inverse = np.unique(column.astype(str), return_inverse=True)
+        for label in values.tolist():
+            if label not in code_of:
+                code_of[label] = len(known)
+                known.append(label)
+        if len(known) > np.iinfo(np.int8).max + 1:
+            raise ValueError(f"Too many categories for channel '{name}'")
+        return np.array([code_of[label] for label in values.tolist()], dtype=np.int8)[inverse]
+
+    # --- Writing ---
+
+    def write(self, columns, labels: Optional[Mapping[str, Sequence[str]]] = None):
+        """
+        Ajoute des échantillons.
+
+        Args:
+            columns: Mapping {canal: tableau} (ex: sorties de ReplayEngine, historique) ou
+                tableau structuré (ex: blocs de DigitalTwin.iter_steps)
+            labels: {canal: libellés} pour les canaux fournis en codes entiers (l'indice est
+                le code) ; les canaux de chaînes sont codés automatiquement
+        """
+        if self._file is None:
+            raise ValueError("Trace writer is closed")
+        if isinstance(columns, np.ndarray):
+            columns = {name: columns[name] for name in columns.dtype.names}
+        columns = {name: np.asarray(column) for name, column in columns.items()}
+        labels = labels or {}
+        if self._dtypes is None:
+            self._declare(columns, labels)
+        if set(columns) != set(self._dtypes):
+            raise ValueError(f"Channels {sorted(columns)} do not match the trace channels {sorted(self._dtypes)}")
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) != 1:
+            raise ValueError("All channels must have the same length")
+        n = lengths.pop()
+        if n == 0:
+            return
+
+        if self.time_channel is not None:
+            t = columns[self.time_channel]
+            if t[0] < self._last_time or np.any(np.diff(t) < 0):
+                raise ValueError("Time channel must be non-decreasing")
+            self._last_time = float(t[-1])
+
+        for name, dtype in self._dtypes.items():
+            if name in self._labels:
+                if name in labels:
+                    self._labels[name] = list(labels[name])  # Label lists may grow between writes
+                column = self._encode(name, columns[name])
+            else:
+                column = columns[name].astype(dtype, copy=False)
+            self._pending[name].append(column)
+        self._n_pending += n
+        self.n_samples += n
+
+        while self._n_pending >= self.chunk_size:
+            self._flush(self.chunk_size)
+
+    def _flush(self, n: int):
+        """Écrit les `n` premiers échantillons en attente sous forme d'un bloc."""
+        f = self._file
+        chunk = {"n": n, "columns": {}}
+        for name, parts in self._pending.items():
+            data = parts[0] if len(parts) == 1 else np.concatenate(parts)
+            self._pending[name] = [data[n:]] if len(data) > n else []
+            block = np.ascontiguousarray(data[:n]).tobytes()
+            codec = None
+            if self.compression == "zlib":
+                block = zlib.compress(block, self.level)
+                codec = "zlib"
+            f.write(b"\0" * (-f.tell() % _ALIGN))
+            chunk["columns"][name] = [f.tell(), len(block), codec]
+            f.write(block)
+            if name == self.time_channel:
+                chunk["t0"] = float(data[0])
+                chunk["t1"] = float(data[n - 1])
+        self._n_pending -= n
+        self._chunks.append(chunk)
+
+    def close(self):
+        """Écrit le dernier bloc et l'index ; le fichier devient lisible."""
+        if self._file is None:
+            return
+        if self._n_pending:
+            self._flush(self._n_pending)
+        index = {
+            "version": FORMAT_VERSION,
+            "time_channel": self.time_channel,
+            "channels": [{"name": name, "dtype": dtype.str, "labels": self._labels.get(name)}
+                         for name, dtype in (self._dtypes or {}).items()],
+            "chunks": self._chunks,
+        }
+        footer = json.dumps(index).encode("utf-8")
+        self._file.write(footer)
+        self._file.write(_FOOTER.pack(len(footer)))
+        self._file.write(MAGIC)
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class TraceReader(Mapping):
+    """
+    Lecture d'un fichier de trace mappé en mémoire.
+
+    Se comporte comme un historique : `trace['tension']` renvoie la colonne entière
+    (libellés décodés pour les canaux de catégorie), window() une fenêtre temporelle et
+    iter_chunks() les blocs successifs, sans charger le fichier.
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        size = os.path.getsize(self.path)
+        tail = len(MAGIC) + _FOOTER.size
+        if size < len(MAGIC) + tail:
+            raise ValueError(f"'{self.path}' is not a complete trace file (missing header or index)")
+        self._map = np.memmap(self.path, dtype=np.uint8, mode="r")
+        if bytes(self._map[:len(MAGIC)]) != MAGIC or bytes(self._map[-len(MAGIC):]) != MAGIC:
+            raise ValueError(f"'{self.path}' is not a complete trace file (missing header or index)")
+        (length,) = _FOOTER.unpack(bytes(self._map[size - tail:size - len(MAGIC)]))
+        index = json.loads(bytes(self._map[size - tail - length:size - tail]).decode("utf-8"))
+        if index["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported trace format version {index['version']}")
+
+        self.time_channel = index["time_channel"]
+        self._dtypes = {c["name"]: np.dtype(c["dtype"]) for c in index["channels"]}
+        self._labels = {c["name"]: c["labels"] for c in index["channels"] if c["labels"] is not None}
+        self._chunks = index["chunks"]
+        counts = np.array([c["n"] for c in self._chunks], dtype=np.int64)
+        self._starts = np.concatenate(([0], np.cumsum(counts)))
+        if self.time_channel is not None and self._chunks:
+            self._t0 = np.array([c["t0"] for c in self._chunks])
+            self._t1 = np.array([c["t1"] for c in self._chunks])
+
+    @property
+    def n_samples(self) -> int:
+        return int(self._starts[-1])
+
+    @property
+    def n_chunks(self) -> int:
+        return len(self._chunks)
+
+    @property
+    def numeric_channels(self) -> List[str]:
+        return [name for name in self._dtypes if name not in self._labels]
+
+    @property
+    def category_channels(self) -> List[str]:
+        return list(self._labels)
+
+    def categories(self, name: str) -> list:
+        """Libellés d'un canal de catégorie (l'indice est le code)."""
+        return list(self._labels[name])
+
+    # --- Raw access ---
+
+    def _chunk_column(self, k: int, name: str) -> np.ndarray:
+        offset, nbytes, codec = self._chunks[k]["columns"][name]
+        raw = self._map[offset:offset + nbytes]
+        if codec == "zlib":
+            return np.frombuffer(zlib.decompress(raw), dtype=self._dtypes[name])
+        return raw.view(self._dtypes[name])
+
+    def _decode(self, name: str, codes: np.ndarray) -> np.ndarray:
+        if name in self._labels:
+            return np.asarray(self._labels[name], dtype=object)[codes]
+        return codes
+
+    def codes(self, name: str, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Échantillons [start, stop) d'un canal, sans décodage des catégories."""
+        if name not in self._dtypes:
+            raise KeyError(name)
+        stop = self.n_samples if stop is None else min(stop, self.n_samples)
+        if stop <= start:
+            return np.empty(0, dtype=self._dtypes[name])
+        first = int(np.searchsorted(self._starts, start, side="right")) - 1
+        last = int(np.searchsorted(self._starts, stop, side="left"))
+        parts = []
+        for k in range(first, last):
+            base = self._starts[k]
+            column = self._chunk_column(k, name)
+            parts.append(column[max(start - base, 0):min(stop - base, len(column))])
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def column(self, name: str, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Échantillons [start, stop) d'un canal (libellés décodés pour les catégories)."""
+        return self._decode(name, self.codes(name, start, stop))
+
+    # --- Time index ---
+
+    def index_range(self, t_start: Optional[float] = None, t_end: Optional[float] = None) -> Tuple[int, int]:
+        """Plage d'échantillons [start, stop) telle que t_start <= t <= t_end."""
+        if self.time_channel is None:
+            raise ValueError("Trace has no time index")
+        if not self._chunks:
+            return 0, 0
+        start, stop = 0, self.n_samples
+        if t_start is not None:
+            k = int(np.searchsorted(self._t1, t_start, side="left"))  # First chunk ending at/after t_start
+            if k == len(self._chunks):
+                return stop, stop
+            t = self._chunk_column(k, self.time_channel)
+            start = int(self._starts[k] + np.searchsorted(t, t_start, side="left"))
+        if t_end is not None:
+            k = int(np.searchsorted(self._t0, t_end, side="right")) - 1  # Last chunk starting at/before t_end
+            if k < 0:
+                return start, start
+            t = self._chunk_column(k, self.time_channel)
+            stop = int(self._starts[k] + np.searchsorted(t, t_end, side="right"))
+        return start, max(start, stop)
+
+    def window(self, t_start: Optional[float] = None, t_end: Optional[float] = None,
+               channels: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Canaux (tous par défaut) sur la fenêtre temporelle [t_start, t_end]."""
+        start, stop = self.index_range(t_start, t_end)
+        return {name: self.column(name, start, stop) for name in (channels or self._dtypes)}
+
+    def iter_chunks(self, channels: Optional[Sequence[str]] = None, t_start: Optional[float] = None,
+                    t_end: Optional[float] = None, decode: bool = True) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Blocs successifs (tels que stockés) limités à la fenêtre [t_start, t_end].
+
+        Args:
+            decode: False = canaux de catégorie rendus en codes int8
+        """
+        channels = list(channels or self._dtypes)
+        start, stop = (0, self.n_samples) if t_start is None and t_end is None else self.index_range(t_start, t_end)
+        for k in range(len(self._chunks)):
+            base, end = int(self._starts[k]), int(self._starts[k + 1])
+            if end <= start or base >= stop:
+                continue
+            lo, hi = max(start, base) - base, min(stop, end) - base
+            chunk = {}
+            for name in channels:
+                values = self._chunk_column(k, name)[lo:hi]
+                chunk[name] = self._decode(name, values) if decode else values
+            yield chunk
+
+    # --- Mapping ---
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.column(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._dtypes)
+
+    def __len__(self) -> int:
+        return len(self._dtypes)
+
+    def close(self):
+        """Libère le mappage (les vues déjà retournées le maintiennent ouvert)."""
+        self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def write_trace(path, columns, labels: Optional[Mapping[str, Sequence[str]]] = None, **options) -> int:
+    """Écrit des colonnes en une fois ; retourne le nombre d'échantillons (options : voir TraceWriter)."""
+    with TraceWriter(path, **options) as writer:
+        writer.write(columns, labels)
+        return writer.n_samples
+
+
+def read_trace(path) -> TraceReader:
+    return TraceReader(path)
@@ -0,0 +1,73 @@
+import numpy as np
+import os
+import sys
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.simulation.digital_twin import DigitalTwin, SystemConfig
+from prowinder.simulation.batch_twin import BatchDigitalTwin, TENSION_MODES
+from prowinder.mechanics.material import MaterialProperties
+from prowinder.mechanics.motor import MotorSpecs
+
+
+def _speed_profile(t):
+    return 5.0 * min(t / 0.5, 1.0)
+
+
+def _configs():
+    return [
+        SystemConfig(control_mode="CLOSED_LOOP_TENSION"),
+        SystemConfig(control_mode="OPEN_LOOP_TORQUE", initial_radius=0.3, span_length=2.0),
+        SystemConfig(control_mode="SPEED_LIMIT", gear_ratio=3.0,
+                     motor_specs=MotorSpecs("Servo", 40.0, 300.0, 0.01)),
+        SystemConfig(control_mode="CLOSED_LOOP_TENSION", tension_kp=1.0, tension_ki=5.0,
+                     material=MaterialProperties("Paper", 1200.0, 3e9, 100e-6, width=1.0, viscosity=1e7)),
+    ]
+
+
+def test_batch_matches_scalar_twins():
+    configs = _configs()
+    twins = [DigitalTwin(c) for c in configs]
+    batch = BatchDigitalTwin(configs)
+
+    dt = configs[0].dt
+    for i in range(1500):
+        v_ref = _speed_profile(i * dt)
+        for twin in twins:
+            twin.step(speed_ref=v_ref, tension_ref=100.0)
+        batch.step(speed_ref=v_ref, tension_ref=100.0)
+
+    for k, twin in enumerate(twins):
+        np.testing.assert_allclose(batch.omega[k], twin.unwinder.omega, rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(batch.radius[k], twin.unwinder.radius, rtol=1e-12)
+        np.testing.assert_allclose(batch.tension[k], twin.web_span.tension, rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(batch.motor_torque[k], twin.motor.current_torque, rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(batch.tension_est[k], twin.history['tension_est'][-1], rtol=1e-9, atol=1e-6)
+        assert TENSION_MODES[batch.tension_mode[k]] == twin.history['tension_mode'][-1]
+
+
+def test_per_machine_references():
+    configs = [SystemConfig(), SystemConfig()]
+    batch = BatchDigitalTwin(configs)
+    twin_a, twin_b = DigitalTwin(configs[0]), DigitalTwin(configs[1])
+    for _ in range(200):
+        batch.step(speed_ref=np.array([2.0, 4.0]), tension_ref=np.array([80.0, 120.0]))
+        twin_a.step(speed_ref=2.0, tension_ref=80.0)
+        twin_b.step(speed_ref=4.0, tension_ref=120.0)
+    np.testing.assert_allclose(batch.tension, [twin_a.web_span.tension, twin_b.web_span.tension], rtol=1e-9)
+
+
+def test_run_history_shapes():
+    batch = BatchDigitalTwin.replicate(SystemConfig(duration=0.05), 8)
+    history = batch.run()
+    assert history['time'].shape == (50,)
+    assert history['tension'].shape == (50, 8)
+    assert history['tension_mode'].dtype == np.int8
+
+
+def test_mismatched_dt_rejected():
+    with pytest.raises(ValueError):
+        BatchDigitalTwin([SystemConfig(dt=0.001), SystemConfig(dt=0.002)])
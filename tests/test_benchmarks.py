@@ -0,0 +1,61 @@
+import os
+import sys
+
+# Add src and the benchmark scripts to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts/benchmarks')))
+
+from run_benchmarks import compare, run
+
+
+def _report(**results):
+    return {'meta': {}, 'results': results}
+
+
+def test_compare_flags_regressions_in_both_directions():
+    baseline = _report(
+        step={'kind': 'latency', 'mean_us': 10.0},
+        throughput={'kind': 'throughput', 'steps_per_s': 1000.0},
+        script={'kind': 'wall_time', 'wall_s': 1.0},
+    )
+    faster = _report(
+        step={'kind': 'latency', 'mean_us': 8.0},
+        throughput={'kind': 'throughput', 'steps_per_s': 1200.0},
+        script={'kind': 'wall_time', 'wall_s': 1.1},
+        new={'kind': 'latency', 'mean_us': 1.0},  # Not in the baseline: ignored
+    )
+    assert compare(faster, baseline, threshold=20.0) == []
+
+    slower = _report(
+        step={'kind': 'latency', 'mean_us': 13.0},
+        throughput={'kind': 'throughput', 'steps_per_s': 700.0},
+        script={'kind': 'wall_time', 'wall_s': 1.1},
+    )
+    assert compare(slower, baseline, threshold=20.0) == ['step', 'throughput']
+
+
+def test_compare_flags_failing_validation_scripts():
+    baseline = _report(ok={'kind': 'wall_time', 'wall_s': 1.0, 'returncode': 0},
+                       known={'kind': 'wall_time', 'wall_s': 1.0, 'returncode': 1})
+    current = _report(ok={'kind': 'wall_time', 'wall_s': 0.5, 'returncode': 2},
+                      known={'kind': 'wall_time', 'wall_s': 0.5, 'returncode': 1},
+                      new={'kind': 'wall_time', 'wall_s': 0.5, 'returncode': 1})
+    # Faster but failing: a script that stops early must not pass as a speed-up;
+    # 'known' fails with the code recorded in the baseline and is not a regression
+    assert compare(current, baseline, threshold=20.0) == ['ok', 'new']
+
+
+def test_failures_recorded_in_the_baseline_keep_the_comparison_green():
+    baseline = _report(script={'kind': 'wall_time', 'wall_s': 1.0, 'returncode': 1})
+    assert compare(_report(script={'kind': 'wall_time', 'wall_s': 5.0, 'returncode': 1}), baseline, 20.0) == []
+    # A different failure code is a change of behaviour
+    assert compare(_report(script={'kind': 'wall_time', 'wall_s': 1.0, 'returncode': 2}), baseline, 20.0) == ['script']
+
+
+def test_quick_run_produces_primary_metrics():
+    report = run(calls=50, steps=50, validation=False, only=['twin', 'notch'])
+    assert set(report['results']) == {'twin.step', 'twin.throughput.objects', 'twin.throughput.kernel',
+                                      'notch_filter.process'}
+    step = report['results']['twin.step']
+    assert 0 < step['mean_us'] and step['p50_us'] <= step['p99_us']
+    assert report['results']['twin.throughput.kernel']['steps_per_s'] > 0
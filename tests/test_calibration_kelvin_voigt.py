@@ -1,5 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
 from prowinder.mechanics.material import MaterialProperties, WebMaterial
 from prowinder.mechanics.web_span import WebSpan, SpanProperties
 
@@ -61,6 +60,7 @@ def test_kelvin_voigt_step_response():
         
     # 3. Plotting
     try:
+        import matplotlib.pyplot as plt  # Only needed for plotting
         plt.figure(figsize=(10, 6))
         plt.plot(time, results_hooke, label='Hooke (eta=0)')
         plt.plot(time, results_kv, label=f'Kelvin-Voigt (eta={viscosity_val:.0e})', linestyle='--')
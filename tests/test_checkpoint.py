@@ -0,0 +1,103 @@
+import numpy as np
+import os
+import pickle
+import sys
+import time
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.simulation.digital_twin import DigitalTwin, SensorNoise, SystemConfig, TwinCheckpoint
+from prowinder.simulation.profiles import SCurveRamp
+
+
+def _run(twin, n, speed=4.0, tension=90.0):
+    return np.array([twin.step(speed, tension).tension for _ in range(n)])
+
+
+@pytest.mark.parametrize("engine", ["objects", "kernel"])
+def test_fork_continues_exactly(engine):
+    config = SystemConfig(engine=engine, control_dt=2e-3)
+    reference = DigitalTwin(config)
+    _run(reference, 500)
+    expected = _run(reference, 500)
+
+    twin = DigitalTwin(config)
+    _run(twin, 500)
+    branch = twin.fork()
+    np.testing.assert_array_equal(_run(branch, 500), expected)
+    assert branch.history.n_samples == 500
+
+
+def test_restore_rewinds():
+    twin = DigitalTwin(SystemConfig())
+    _run(twin, 300)
+    snapshot = twin.checkpoint()
+    first = _run(twin, 200)
+
+    twin.restore(snapshot)
+    assert twin.time == pytest.approx(snapshot.time)
+    np.testing.assert_array_equal(_run(twin, 200), first)
+
+
+def test_branches_are_independent():
+    twin = DigitalTwin(SystemConfig())
+    ramp = SCurveRamp(0.0, 2.0, 0.0, 1.0, 5.0)
+    for k in range(2500):
+        twin.step(ramp(k * twin.config.dt), 60.0)
+    base_state = twin.pack_state()
+
+    # Same tension step on two branches with different tension loop gains
+    soft = twin.fork(tension_kp=0.1)
+    stiff = twin.fork(tension_kp=2.0)
+    _run(soft, 300, speed=2.0, tension=80.0)
+    _run(stiff, 300, speed=2.0, tension=80.0)
+
+    assert abs(stiff.history['tension'][-1] - 80.0) < abs(soft.history['tension'][-1] - 80.0)
+    np.testing.assert_array_equal(twin.pack_state(), base_state)
+
+
+def test_checkpoint_is_serializable_and_compact():
+    twin = DigitalTwin(SystemConfig(engine="kernel"))
+    _run(twin, 200)
+    snapshot = twin.checkpoint()
+    clone = pickle.loads(pickle.dumps(snapshot))
+
+    assert isinstance(clone, TwinCheckpoint)
+    assert snapshot.state.nbytes < 256
+    np.testing.assert_array_equal(_run(DigitalTwin.from_checkpoint(clone), 100), _run(twin, 100))
+
+
+def test_forking_is_cheap():
+    twin = DigitalTwin(SystemConfig())
+    _run(twin, 100)
+    snapshot = twin.checkpoint()
+    start = time.perf_counter()
+    branches = [DigitalTwin.from_checkpoint(snapshot, tension_ki=0.01 * i) for i in range(200)]
+    assert time.perf_counter() - start < 1.0
+    assert len({b.config.tension_ki for b in branches}) == 200
+
+
+def test_structural_changes_are_rejected():
+    snapshot = DigitalTwin(SystemConfig()).checkpoint()
+    with pytest.raises(ValueError):
+        DigitalTwin.from_checkpoint(snapshot, dt=2e-3)
+    with pytest.raises(ValueError):
+        DigitalTwin(SystemConfig(initial_radius=0.3)).restore(snapshot)
+
+
+def test_forks_replay_the_sensor_noise():
+    config = SystemConfig(sensor_noise=SensorNoise(speed_std=0.05, tension_std=1.0))
+    twin = DigitalTwin(config, rng=np.random.default_rng(5))
+    _run(twin, 200)
+    snapshot = twin.checkpoint()
+    branches = [twin.fork(), DigitalTwin.from_checkpoint(pickle.loads(pickle.dumps(snapshot)))]
+    expected = _run(twin, 300)
+    for branch in branches:
+        np.testing.assert_array_equal(_run(branch, 300), expected)
+        np.testing.assert_array_equal(branch.history['torque'], twin.history['torque'][-300:])
+
+    twin.restore(snapshot)
+    np.testing.assert_array_equal(_run(twin, 300), expected)
@@ -0,0 +1,142 @@
+import asyncio
+import numpy as np
+import os
+import sys
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.simulation.batch_twin import BatchDigitalTwin
+from prowinder.simulation.cosim import (
+    MSG_SETPOINT, REPLY, REQUEST, CoSimClient, CoSimServer, decode_reply, encode_request,
+)
+from prowinder.simulation.digital_twin import DigitalTwin, SystemConfig
+
+
+def test_protocol_frames_are_compact_and_fixed_size():
+    assert REQUEST.size == 24 and REPLY.size == 64
+    frame = encode_request(MSG_SETPOINT, 7, 42, 5.0, 120.0)
+    assert REQUEST.unpack(frame) == (MSG_SETPOINT, 0, 7, 42, 5.0, 120.0)
+    kind, status, seq, reading = decode_reply(REPLY.pack(2, 0, 3, 9, 11, 0.011, 100.0, 25.0, 0.2, -20.0, 99.0))
+    assert (kind, status, seq) == (2, 0, 9)
+    assert reading.twin_id == 3 and reading.tick == 11 and reading.tension == 100.0
+
+
+def test_clients_drive_a_batch_in_lockstep():
+    config = SystemConfig()
+
+    async def scenario():
+        server = CoSimServer(BatchDigitalTwin.replicate(config, 4), speed_ref=5.0, tension_ref=100.0)
+        async with await server.start():
+            host, port = server.address[:2]
+            plc, scada = await CoSimClient.connect(host, port), await CoSimClient.connect(host, port)
+            assert await plc.info() == (4, config.dt, 0)
+
+            readings, ack = [], None
+            for k in range(20):
+                if k == 10:
+                    ack = await plc.setpoint(1, 6.0, 150.0)
+                # Pipelined reads of the whole floor from a second client
+                readings.extend(await asyncio.gather(*(scada.read(i) for i in range(4))))
+            with pytest.raises(ValueError):
+                await plc.read(4)
+            stats = server.stats()
+            await plc.close()
+            await scada.close()
+        return readings, ack, stats
+
+    readings, ack, stats = asyncio.run(scenario())
+    assert [r.twin_id for r in readings[:4]] == [0, 1, 2, 3]
+    assert stats['ticks'] == readings[-1].tick and stats['requests_per_tick'] >= 1.0
+    clients = list(stats['clients'].values())
+    assert clients[0]['requests'] == 3 and clients[0]['errors'] == 1
+    assert clients[1]['requests'] == 80 and clients[1]['latency_max_us'] > 0.0
+
+    # Replay on a reference batch: the setpoint applies from the tick that acknowledged it
+    reference = BatchDigitalTwin.replicate(config, 4)
+    speed, tension = np.full(4, 5.0), np.full(4, 100.0)
+    states = {}
+    for tick in range(1, readings[-1].tick + 1):
+        if tick == ack.tick:
+            speed[1], tension[1] = 6.0, 150.0
+        reference.step(speed, tension)
+        states[tick] = reference.snapshot()
+    for reading in readings + [ack]:
+        state = states[reading.tick]
+        assert reading.tension == state['tension'][reading.twin_id]
+        assert reading.omega == state['omega'][reading.twin_id]
+        assert reading.radius == state['radius'][reading.twin_id]
+    assert readings[-3].tension != readings[-4].tension
+
+
+def test_paced_server_over_a_unix_socket(tmp_path):
+    twins = [DigitalTwin(SystemConfig(dt=1e-3)) for _ in range(3)]
+    path = str(tmp_path / "plant.sock")
+
+    async def scenario():
+        server = CoSimServer(twins, period=2e-3)
+        async with await server.start(path=path):
+            client = await CoSimClient.connect(path=path)
+            first = await client.setpoint(2, 5.0, 100.0)
+            await asyncio.sleep(0.1)
+            last = await client.read(2)
+            await client.close()
+            return first, last, server.stats()
+
+    first, last, stats = asyncio.run(scenario())
+    # Ticks keep running on the period without requests
+    assert last.tick - first.tick > 10
+    # The server may tick again before it is closed: compare against the logged step
+    history = twins[2].history
+    assert last.time == pytest.approx(history['time'][last.tick - 1])
+    assert last.tension == history['tension'][last.tick - 1] != twins[0].history['tension'][last.tick - 1]
+    assert stats['requests_per_tick'] < 1.0
+
+
+def test_unix_clients_get_separate_statistics(tmp_path):
+    path = str(tmp_path / "plant.sock")
+
+    async def scenario():
+        server = CoSimServer(BatchDigitalTwin.replicate(SystemConfig(), 2))
+        async with await server.start(path=path):
+            clients = [await CoSimClient.connect(path=path) for _ in range(3)]
+            for client in clients:
+                for _ in range(5):
+                    await client.read(1)
+                await client.close()
+            return server.stats()
+
+    stats = asyncio.run(scenario())
+    assert len(stats['clients']) == 3
+    assert [summary['requests'] for summary in stats['clients'].values()] == [5, 5, 5]
+    assert list(stats['clients'])[0] == f"1:{path}"
+    # Streaming statistics: no per-request storage
+    for summary in stats['clients'].values():
+        assert 0.0 < summary['latency_mean_us'] <= summary['latency_max_us']
+        assert summary['latency_p99_us'] <= summary['latency_max_us']
+
+
+def test_reconnecting_clients_keep_bounded_statistics():
+    async def scenario():
+        server = CoSimServer(BatchDigitalTwin.replicate(SystemConfig(), 1), closed_history=2)
+        async with await server.start():
+            host, port = server.address[:2]
+            for _ in range(6):  # A PLC reconnecting periodically
+                client = await CoSimClient.connect(host, port)
+                await client.read(0)
+                await client.close()
+            current = await CoSimClient.connect(host, port)
+            await current.read(0)
+            while len(server.clients) > 1:  # Let the server see the last disconnection
+                await asyncio.sleep(0.01)
+            stats = server.stats()
+            await current.close()
+        return server, stats
+
+    server, stats = asyncio.run(scenario())
+    assert len(server.closed_clients) == 2
+    assert [(key.split(':')[0], summary['open']) for key, summary in stats['clients'].items()] == \
+        [('5', False), ('6', False), ('7', True)]
+    assert stats['closed'] == {'connections': 6, 'requests': 6, 'errors': 0}
@@ -1,5 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import sys
 import os
 
@@ -72,6 +71,7 @@ def run_full_simulation():
     torque = np.array(history['torque'])
 
     # 5. Plotting
+    import matplotlib.pyplot as plt  # Only needed for plotting
     fig, axs = plt.subplots(3, 1, figsize=(10, 10), sharex=True)
     
     # Plot 1: Speed
@@ -0,0 +1,88 @@
+import math
+import numpy as np
+import os
+import sys
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.mechanics.motor import Motor, MotorSpecs
+from prowinder.mechanics.material import MaterialProperties, WebMaterial
+from prowinder.mechanics.web_span import WebSpan, SpanProperties
+from prowinder.mechanics.winder import Winder
+from prowinder.mechanics.friction import FrictionModel
+from prowinder.simulation.digital_twin import DigitalTwin, SystemConfig
+from prowinder.simulation.profiles import SCurveRamp
+
+
+def _material():
+    return WebMaterial(MaterialProperties("PET", 1390.0, 4e9, 50e-6, width=0.15))
+
+
+def test_motor_exact_lag_is_stable_at_large_dt():
+    specs = MotorSpecs("test", 10.0, 300.0, 0.005, torque_bandwidth=1000.0)
+    exact = Motor(specs, discretization="exact")
+    euler = Motor(specs)
+    for motor in (exact, euler):
+        motor.set_torque_command(5.0)
+
+    dt = 5e-3  # 5x the drive time constant
+    for k in range(1, 4):
+        exact.update(dt, 0.0)
+        euler.update(dt, 0.0)
+        assert exact.current_torque == pytest.approx(5.0 * (1 - math.exp(-k * dt * 1000.0)))
+    assert abs(euler.current_torque) > 100.0
+
+
+def test_span_exact_convection_matches_analytic_solution():
+    props = SpanProperties(length=1.5, initial_tension=15.0)
+    span = WebSpan(_material(), props, discretization="exact")
+    eps0 = span.current_strain
+    v_up, v_down = 2.0, 2.01
+    # d(eps)/dt = a - b*eps
+    a, b = (v_down - v_up) / 1.5, v_up / 1.5
+    eps_ss = a / b
+
+    span.update(v_up, v_down, dt=0.5)
+    assert span.current_strain == pytest.approx(eps_ss + (eps0 - eps_ss) * math.exp(-b * 0.5), rel=1e-12)
+    span.update(0.0, 0.0, dt=0.5)  # No transport: strain is held
+    assert span.current_strain == pytest.approx(eps_ss + (eps0 - eps_ss) * math.exp(-b * 0.5), rel=1e-12)
+
+
+def test_radius_from_accumulated_angle():
+    winder = Winder("w", 0.02, 0.05, _material(), FrictionModel(0, 0, 0, 0), discretization="exact")
+    winder.set_initial_state(0.2, initial_speed=-30.0)
+    dt = 1e-3
+    for _ in range(100000):
+        winder.update_geometric(dt)
+    assert winder.angle == pytest.approx(-30.0 * 100.0)
+    assert winder.radius == pytest.approx(0.2 - 50e-6 * 3000.0 / (2 * np.pi), rel=1e-12)
+
+    winder.omega = -1e5
+    winder.update_geometric(1.0)
+    assert winder.radius == 0.05
+    winder.omega = 10.0
+    winder.update_geometric(dt)
+    assert winder.radius > 0.05
+
+
+def test_exact_discretization_keeps_twin_accurate_at_larger_dt():
+    speed = SCurveRamp(0.0, 5.0, 0.2, 2.0, 10.0)
+    reference = DigitalTwin(SystemConfig(dt=1e-5, control_dt=1e-3, estimator_dt=1e-3, duration=1.5)).run(speed_ref=speed)
+    settled = reference['time'] > 0.1
+
+    def error(config):
+        history = DigitalTwin(config).run(speed_ref=speed)
+        return np.max(np.abs(np.interp(reference['time'], history['time'], history['tension']) - reference['tension'])[settled])
+
+    assert error(SystemConfig(dt=1e-3, duration=1.5, discretization="exact")) < \
+        0.75 * error(SystemConfig(dt=1e-3, duration=1.5, discretization="euler"))
+    # Euler's drive lag diverges beyond dt = 2/bandwidth, the exact update does not
+    assert error(SystemConfig(dt=4e-3, duration=1.5, discretization="exact")) < 15.0
+
+
+def test_unknown_discretization_is_rejected():
+    with pytest.raises(ValueError):
+        DigitalTwin(SystemConfig(discretization="tustin"))
@@ -0,0 +1,89 @@
+import numpy as np
+import os
+import sys
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.control.banks import FrictionObserverBank, RadiusCalculatorBank, TensionObserverBank
+from prowinder.control.observers import FrictionObserver
+from prowinder.control.radius_estimator import RadiusCalculator
+from prowinder.control.tension_observer import TensionObserver
+from prowinder.mechanics.friction import FrictionModel
+from prowinder.mechanics.material import MaterialProperties
+
+M = 6
+MATERIAL = MaterialProperties("PET", 1390.0, 4e9, 50e-6, width=0.15, viscosity=5e7)
+FRICTION = FrictionModel(0.5, 0.01, 1.2, 0.5)
+
+
+def test_radius_bank_matches_one_calculator_per_axis():
+    rng = np.random.default_rng(0)
+    R0, thickness = rng.uniform(0.04, 0.08, M), rng.uniform(30e-6, 80e-6, M)
+    bank = RadiusCalculatorBank(M, R0, thickness, roller_length=1.0)
+    calculators = [RadiusCalculator(R0[i], thickness[i], roller_length=1.0) for i in range(M)]
+
+    for k in range(2000):
+        # Ramp up, run, ramp down (startup/running transitions), one axis at standstill each step
+        v = 60.0 * min(k / 300, 1.0, max(0.0, (2000 - k) / 300)) + rng.normal(0.0, 1.0, M)
+        omega = v / 60.0 / np.array([c.R_last for c in calculators]) * (1 + rng.normal(0.0, 0.01, M))
+        omega[k % M] = 0.0
+        if k == 1200:
+            bank.reset([1, 3], R0=0.06)
+            for i in (1, 3):
+                calculators[i].reset(R0=0.06)
+        estimates = bank.estimate(v, omega, thickness, dt=0.01)
+        for i, calculator in enumerate(calculators):
+            assert estimates.axis(i) == calculator.estimate(v[i], omega[i], thickness[i], dt=0.01)
+    assert set(bank.running) == {False} and bank.R0[1] == 0.06
+
+
+def test_tension_bank_matches_one_observer_per_axis():
+    rng = np.random.default_rng(1)
+    gains = np.array([20.0, 0.0, 10.0, 20.0, 5.0, 0.0])
+    J_nominal = rng.uniform(0.1, 1.0, M)
+    bank = TensionObserverBank(M, MATERIAL, span_length=rng.uniform(1.0, 2.0, M), dt=1e-3,
+                               friction_observer=FrictionObserverBank(M, FRICTION, gains), J_nominal=J_nominal)
+    observers = [TensionObserver(MATERIAL, bank.span_length[i], dt=1e-3,
+                                 friction_observer=FrictionObserver(FRICTION, gains[i]), J_nominal=J_nominal[i])
+                 for i in range(M)]
+
+    for k in range(1000):
+        omega, R = rng.uniform(0.0, 8.0, M), rng.uniform(0.05, 0.3, M)
+        tau, alpha = rng.normal(-20.0, 2.0, M), rng.normal(0.0, 1.0, M)
+        v_up = omega * R
+        v_down = v_up * (1 + rng.normal(1e-4, 1e-5, M))
+        measured = rng.normal(100.0, 1.0, M)
+        measured[k % M] = np.nan  # Missing load cell reading on one axis
+        J_total = None if k % 2 else 3.0 * R
+        if k == 500:
+            bank.reset(np.array([True, False, True, False, False, False]))
+            observers[0].reset()
+            observers[2].reset()
+        estimates = bank.update(tau, omega, alpha, R, v_up, v_down, J_total=J_total, tension_measured=measured)
+        for i, observer in enumerate(observers):
+            expected = observer.update(tau[i], omega[i], alpha[i], R[i], v_up[i], v_down[i],
+                                       J_total=None if J_total is None else J_total[i],
+                                       tension_measured=None if np.isnan(measured[i]) else measured[i])
+            assert estimates.axis(i) == expected
+
+
+def test_friction_bank_per_axis_models_and_masks():
+    models = [FrictionModel(0.5, 0.01, 1.2, 0.5), FrictionModel(0.2, 0.05, 0.0, 0.0)]
+    bank = FrictionObserverBank(2, models, gain=0.0)
+    velocity = np.array([0.3, -2.0])
+    np.testing.assert_allclose(bank.update(velocity, 0.0, 1e-3, 1.0),
+                               [m.compute_torque(w) for m, w in zip(models, velocity)])
+
+    bank = FrictionObserverBank(3, FRICTION, gain=[10.0, 20.0, 30.0])
+    first = bank.update([1.0, 2.0, 3.0], 0.0, 1e-2, 0.5)
+    kept = first.copy()
+    bank.reset([True, False, True])
+    np.testing.assert_array_equal(bank.estimated_friction, [0.0, kept[1], 0.0])
+    np.testing.assert_array_equal(first, kept)  # Earlier results are not modified by a reset
+    with pytest.raises(ValueError):
+        FrictionObserverBank(3, FRICTION, gain=[1.0, 2.0])
+    with pytest.raises(ValueError):
+        bank.reset(np.array([True, False]))
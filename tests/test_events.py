@@ -0,0 +1,102 @@
+import numpy as np
+import os
+import pickle
+import sys
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.mechanics.motor import MotorSpecs
+from prowinder.simulation.digital_twin import DigitalTwin, SystemConfig
+from prowinder.simulation.events import Event, core_reached, limit, slack, torque_saturation, web_break
+from prowinder.simulation.monte_carlo import MonteCarloStudy, Uniform
+from prowinder.simulation.sweep import run_sweep
+
+SMALL_MOTOR = MotorSpecs("small", 5.0, 300.0, 0.005)
+LARGE_MOTOR = MotorSpecs("large", 40.0, 300.0, 0.005)
+
+
+def test_terminal_event_stops_the_run_early():
+    twin = DigitalTwin(SystemConfig(duration=2.0, motor_specs=SMALL_MOTOR))
+    history = twin.run(5.0, 100.0, events=[torque_saturation(terminal=True)])
+    assert [record.name for record in twin.events] == ['torque_saturation']
+    assert twin.events[0].terminal
+    assert history.n_samples == twin.events[0].step + 1 < 100
+    assert twin.time < 0.1
+
+
+def test_crossing_is_localized_inside_the_step():
+    twin = DigitalTwin(SystemConfig(duration=1.0))
+    level = 0.2 + 2e-5
+    history = twin.run(5.0, 100.0, events=limit('radius', high=level))
+    record = twin.events[0]
+    k = record.step
+    t, radius = history['time'], history['radius']
+    assert radius[k - 1] < level <= radius[k]
+    expected = t[k - 1] + (level - radius[k - 1]) / (radius[k] - radius[k - 1]) * (t[k] - t[k - 1])
+    assert record.time == pytest.approx(expected, rel=1e-12)
+    assert t[k - 1] < record.time <= t[k]
+    assert history.n_samples == k + 1
+
+
+def test_core_reached_and_callbacks():
+    seen = []
+    events = [core_reached(), slack(callback=lambda twin, record: seen.append(record.time)),
+              web_break(1e6)]
+    twin = DigitalTwin(SystemConfig(duration=5.0, initial_radius=0.0502))
+    history = twin.run(-1.0, 50.0, events=events)
+    names = [record.name for record in twin.events]
+    assert names[-1] == 'core_reached' and 'web_break' not in names
+    assert history['radius'][-1] == pytest.approx(0.05)
+    assert twin.time < 5.0
+    assert seen == [record.time for record in twin.events if record.name == 'slack']
+
+
+def test_direction_filter_and_non_terminal_events():
+    rising = Event('rising', lambda twin, sample: sample.time - 0.1, direction=1)
+    falling = Event('falling', lambda twin, sample: sample.time - 0.1, direction=-1)
+    twin = DigitalTwin(SystemConfig(duration=0.3))
+    history = twin.run(5.0, 100.0, events=[rising, falling])
+    # 'falling' is already met (g < 0) at the start; the upward crossing only fires 'rising'
+    assert [(record.name, record.step) for record in twin.events] == [('falling', 0), ('rising', 99)]
+    assert twin.events[0].time == 0.0
+    assert twin.events[1].time == pytest.approx(0.1)
+    assert history['time'][-1] == pytest.approx(0.3)
+    # Records belong to one run: a later run without events clears them
+    twin.run(5.0, 100.0)
+    assert twin.events == []
+    with pytest.raises(ValueError):
+        DigitalTwin(SystemConfig(duration=0.01)).run(events=[Event('bad', rising.function, direction=2)])
+
+
+def test_sweeps_and_monte_carlo_stop_failed_cases_early():
+    events = [torque_saturation(terminal=True)]
+    assert pickle.loads(pickle.dumps(events))[0].name == 'torque_saturation'
+
+    # Speed loop with a torque limit: the command settles at T*R = 20 N.m, above SMALL_MOTOR's peak
+    base = SystemConfig(duration=0.5, control_mode="SPEED_LIMIT", motor_specs=LARGE_MOTOR)
+    result = run_sweep(base, [{'motor_specs': SMALL_MOTOR}, {}], events=events, processes=1)
+    np.testing.assert_array_equal(result.kpis['terminated'], [1.0, 0.0])
+    assert result.kpis['event_time'][0] < 0.1 and np.isnan(result.kpis['event_time'][1])
+
+    study = MonteCarloStudy(base, {'motor_specs.rated_torque': Uniform(4.0, 40.0)}, events=events)
+    mc = study.run(8, seed=1, processes=1)
+    saturated = 2.0 * mc.samples['motor_specs.rated_torque'] < 20.0
+    assert 0 < mc.n_failures < 8
+    np.testing.assert_array_equal(mc.samples['failed'], saturated)
+
+
+def test_conditions_met_from_the_start_fire_at_the_start_time():
+    config = SystemConfig(duration=0.05, motor_specs=SMALL_MOTOR)
+    twin = DigitalTwin(config)
+    twin.run(5.0, 100.0)
+    # Continued run: the tension is already above the break level and the small motor saturates at once
+    twin.run(5.0, 500.0, events=[web_break(1.0), torque_saturation(), Event('any', web_break(1.0).function)])
+    # Both fire at the start time; the direction=0 copy has no active side and stays silent
+    assert [record.name for record in twin.events] == ['web_break', 'torque_saturation']
+    for record in twin.events:
+        assert record.time == pytest.approx(0.05) and record.step == 0
+    assert twin.time == pytest.approx(0.05 + config.dt)
+
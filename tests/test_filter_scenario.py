@@ -1,5 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import sys
 import os
 
@@ -72,6 +71,7 @@ def run_filter_simulation():
         filter_freq_log[i] = notch_filter.f0
 
     # 6. Visualization
+    import matplotlib.pyplot as plt  # Only needed for plotting
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8), sharex=True)
 
     # Plot 1: Signals
@@ -0,0 +1,84 @@
+import numpy as np
+import os
+import sys
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.simulation.history import HistoryRecorder, LoggingPolicy
+from prowinder.simulation.digital_twin import DigitalTwin, SystemConfig
+
+
+def _recorder(chunk_size=4):
+    return HistoryRecorder(['time', 'tension'], {'tension_mode': ('torque', 'fusion', 'span')}, chunk_size=chunk_size)
+
+
+def test_grows_in_chunks_and_keeps_data():
+    rec = _recorder(chunk_size=4)
+    for i in range(10):
+        rec.append((i * 0.1, 100.0 + i), ('span' if i > 5 else 'torque',))
+
+    assert rec.n_samples == 10
+    assert rec._capacity == 12
+    np.testing.assert_allclose(rec['tension'], 100.0 + np.arange(10))
+    assert list(rec['tension_mode'][:2]) == ['torque', 'torque']
+    assert rec['tension_mode'][-1] == 'span'
+    assert rec.codes('tension_mode').dtype == np.int8
+
+
+def test_unknown_label_extends_categories():
+    rec = _recorder()
+    rec.append((0.0, 1.0), ('startup',))
+    assert rec.categories('tension_mode')[-1] == 'startup'
+    assert rec['tension_mode'][0] == 'startup'
+
+
+def test_dataframe_shares_memory():
+    pytest.importorskip("pandas")
+    rec = _recorder()
+    for i in range(6):
+        rec.append((i * 0.1, float(i)), ('fusion',))
+    df = rec.to_dataframe()
+    assert list(df.columns) == ['time', 'tension', 'tension_mode']
+    assert np.shares_memory(df['tension'].to_numpy(), rec._values)
+    assert str(df['tension_mode'].dtype) == 'category'
+
+
+def test_digital_twin_history_is_dict_compatible():
+    twin = DigitalTwin(SystemConfig(duration=0.05))
+    results = twin.run()
+    assert set(results) == {'time', 'omega', 'radius', 'tension', 'tension_est', 'tension_mode', 'torque'}
+    assert len(results['tension']) == 50
+    assert results['time'][-1] == pytest.approx(0.05)
+    assert results['tension_mode'][-1] in ('torque', 'fusion', 'span')
+
+
+def test_logging_policy_decimation_envelope_and_ring():
+    policy = LoggingPolicy(channels=('tension', 'tension_mode'), decimation=10, envelope=True, ring_buffer=25)
+    twin = DigitalTwin(SystemConfig(duration=0.1, logging_policy=policy))
+    reference = DigitalTwin(SystemConfig(duration=0.1))
+    history = twin.run()
+    full = reference.run()
+
+    assert set(history) == {'time', 'tension', 'tension_mode'}
+    np.testing.assert_allclose(history['tension'], full['tension'][9::10])
+    np.testing.assert_allclose(history['time'], full['time'][9::10])
+
+    env = twin.history.envelope
+    assert env.n_samples == 10
+    blocks = full['tension'].reshape(10, 10)
+    np.testing.assert_allclose(env['tension_min'], blocks.min(axis=1))
+    np.testing.assert_allclose(env['tension_max'], blocks.max(axis=1))
+    np.testing.assert_allclose(env['tension_mean'], blocks.mean(axis=1))
+
+    recent = twin.history.recent
+    assert recent.n_samples == 25
+    np.testing.assert_allclose(recent['tension'], full['tension'][-25:])
+    assert list(recent['tension_mode']) == list(full['tension_mode'][-25:])
+
+
+def test_logging_policy_rejects_unknown_channel():
+    with pytest.raises(ValueError):
+        DigitalTwin(SystemConfig(logging_policy=LoggingPolicy(channels=('speed_of_light',))))
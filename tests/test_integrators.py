@@ -0,0 +1,107 @@
+import numpy as np
+import os
+import sys
+import warnings
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.simulation.integrators import (
+    PlantInputs, PlantState, plant_rhs, plant_jacobian, step_rosenbrock, step_semi_implicit,
+)
+from prowinder.simulation.digital_twin import DigitalTwin, SystemConfig
+from prowinder.simulation.batch_twin import BatchDigitalTwin
+from prowinder.simulation.profiles import SCurveRamp
+
+
+def _inputs(**overrides):
+    values = dict(
+        target_torque=-15.0, v_downstream=3.0, radius=0.2, inertia=0.55, gear_ratio=1.0,
+        torque_bandwidth=1000.0, span_length=1.5, section=7.5e-6, young_modulus=4e9, viscosity=5e7,
+        friction_coulomb=0.5, friction_viscous=0.01, friction_stiction=1.2, friction_stribeck=0.5,
+    )
+    values.update(overrides)
+    return PlantInputs(**values)
+
+
+def _explicit_reference(x, p, duration, h=1e-6):
+    for _ in range(int(round(duration / h))):
+        f, _ = plant_rhs(x, p)
+        x = PlantState(x.omega + h * f.omega, x.strain + h * f.strain, x.torque + h * f.torque)
+    return x
+
+
+def test_jacobian_matches_finite_differences():
+    p = _inputs()
+    x = PlantState(12.0, 4e-3, -10.0)
+    jac = plant_jacobian(x, p)
+    eps = 1e-7
+    f0, _ = plant_rhs(x, p)
+    f_w, _ = plant_rhs(PlantState(x.omega + eps, x.strain, x.torque), p)
+    f_e, _ = plant_rhs(PlantState(x.omega, x.strain + eps * 1e-3, x.torque), p)
+    f_t, _ = plant_rhs(PlantState(x.omega, x.strain, x.torque + eps), p)
+
+    assert jac.ww == pytest.approx((f_w.omega - f0.omega) / eps, rel=1e-4)
+    assert jac.ew == pytest.approx((f_w.strain - f0.strain) / eps, rel=1e-4)
+    assert jac.we == pytest.approx((f_e.omega - f0.omega) / (eps * 1e-3), rel=1e-4)
+    assert jac.ee == pytest.approx((f_e.strain - f0.strain) / (eps * 1e-3), rel=1e-4)
+    assert jac.wt == pytest.approx((f_t.omega - f0.omega) / eps, rel=1e-4)
+    assert jac.tt == pytest.approx((f_t.torque - f0.torque) / eps, rel=1e-4)
+
+
+def test_rosenbrock_is_second_order():
+    p = _inputs()
+    x0 = PlantState(12.0, 4e-3, -10.0)
+    exact = _explicit_reference(x0, p, 0.02)
+
+    errors = []
+    for h in (2e-3, 1e-3):
+        x = x0
+        for _ in range(int(round(0.02 / h))):
+            x, _ = step_rosenbrock(x, p, h)
+        errors.append(abs(x.omega - exact.omega))
+    assert errors[0] / errors[1] > 3.0
+
+
+@pytest.mark.parametrize("step", [step_semi_implicit, step_rosenbrock])
+def test_implicit_steps_are_stable_on_stiff_drive(step):
+    # Explicit Euler diverges for dt * bandwidth > 2
+    p = _inputs()
+    x = PlantState(12.0, 4e-3, 0.0)
+    for _ in range(200):
+        x, tension = step(x, p, 10e-3)
+    assert np.isfinite(x.omega) and x.torque == pytest.approx(p.target_torque, rel=1e-6)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        diverged = _explicit_reference(PlantState(12.0, 4e-3, 0.0), p, duration=0.2, h=10e-3)
+    assert not abs(diverged.torque) < 1e3
+
+
+def test_twin_runs_at_large_steps_with_rosenbrock():
+    speed = SCurveRamp(0.0, 5.0, 0.2, 2.0, 10.0)
+    reference = DigitalTwin(SystemConfig(duration=5.0)).run(speed_ref=speed)
+    twin = DigitalTwin(SystemConfig(dt=5e-3, duration=5.0, integrator="rosenbrock"))
+    history = twin.run(speed_ref=speed)
+
+    assert len(history['tension']) == 1000
+    final = np.interp(4.0, reference['time'], reference['tension'])
+    assert np.interp(4.0, history['time'], history['tension']) == pytest.approx(final, rel=0.02)
+
+
+def test_batch_matches_scalar_with_implicit_integrator():
+    configs = [SystemConfig(dt=5e-3, duration=1.0, integrator="semi_implicit", control_mode=mode)
+               for mode in ("CLOSED_LOOP_TENSION", "OPEN_LOOP_TORQUE")]
+    out = BatchDigitalTwin(configs).run()
+    for i, config in enumerate(configs):
+        history = DigitalTwin(config).run()
+        np.testing.assert_allclose(out['tension'][:, i], history['tension'], rtol=1e-9, atol=1e-9)
+
+
+def test_unknown_integrator_is_rejected():
+    with pytest.raises(ValueError):
+        DigitalTwin(SystemConfig(integrator="rk4"))
+    with pytest.raises(ValueError):
+        BatchDigitalTwin([SystemConfig(), SystemConfig(integrator="rosenbrock")])
@@ -0,0 +1,79 @@
+import numpy as np
+import os
+import sys
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.simulation import kernel
+from prowinder.simulation.digital_twin import DigitalTwin, SystemConfig
+from prowinder.simulation.profiles import SCurveRamp
+
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"control_mode": "OPEN_LOOP_TORQUE"},
+    {"control_mode": "SPEED_LIMIT"},
+    {"discretization": "euler"},
+    {"integrator": "rosenbrock", "dt": 5e-3},
+    {"control_dt": 2e-3, "estimator_dt": 4e-3},
+])
+def test_kernel_engine_matches_object_engine(overrides):
+    speed = SCurveRamp(0.0, 5.0, 0.2, 2.0, 10.0)
+    objects = DigitalTwin(SystemConfig(duration=1.5, **overrides)).run(speed_ref=speed)
+    flat = DigitalTwin(SystemConfig(duration=1.5, engine="kernel", **overrides)).run(speed_ref=speed)
+
+    for channel in ('omega', 'radius', 'tension', 'tension_est', 'torque'):
+        np.testing.assert_allclose(flat[channel], objects[channel], rtol=1e-12, atol=1e-9)
+    assert list(flat['tension_mode']) == list(objects['tension_mode'])
+
+
+def test_step_is_pure_and_state_is_flat():
+    params = kernel.make_params(SystemConfig())
+    state = kernel.initial_state(params)
+    before = state.copy()
+    new_state = kernel.step(state, (2.0, 80.0, None), params)
+
+    np.testing.assert_array_equal(state, before)
+    assert new_state.dtype == np.float64 and new_state.shape == (kernel.STATE_SIZE,)
+    assert new_state.flags['C_CONTIGUOUS']
+    assert new_state[kernel.STATE_INDEX['time']] == pytest.approx(params.dt)
+
+
+def test_initial_state_matches_fresh_twin():
+    config = SystemConfig()
+    np.testing.assert_array_equal(kernel.initial_state(kernel.make_params(config)), DigitalTwin(config).pack_state())
+
+
+def test_objects_are_a_view_of_the_state():
+    twin = DigitalTwin(SystemConfig(engine="kernel"))
+    for _ in range(300):
+        twin.step(speed_ref=3.0, tension_ref=90.0)
+
+    idx = kernel.STATE_INDEX
+    assert twin.unwinder.radius == twin.state[idx['radius']]
+    assert twin.web_span.tension == twin.state[idx['tension']]
+    assert twin.tension_estimate.tension == twin.state[idx['tension_est']]
+    np.testing.assert_array_equal(twin.pack_state(), twin.state)
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        DigitalTwin(SystemConfig(engine="numba"))
+
+
+def test_engines_share_the_hard_wired_constants():
+    from prowinder.simulation.batch_twin import BatchDigitalTwin
+
+    twin = DigitalTwin(SystemConfig())
+    params = kernel.make_params(twin.config)
+    observer = twin.tension_observer
+    assert (twin.unwinder.J_base, twin.unwinder.core_radius) == (params.core_inertia, params.core_radius)
+    assert twin.observer.gain == params.friction_observer_gain == BatchDigitalTwin.FRICTION_OBSERVER_GAIN
+    assert (observer.omega_min, observer.omega_max, observer.ema_alpha, observer.tension_min, observer.tension_max,
+            observer.min_radius) == (params.obs_omega_min, params.obs_omega_max, params.obs_ema_alpha,
+                                     params.obs_tension_min, params.obs_tension_max, params.obs_min_radius)
+    assert twin.notch_filter.f0 == params.notch_base_freq == BatchDigitalTwin.NOTCH_BASE_FREQ
+    assert BatchDigitalTwin([twin.config]).torque_limit[0] == params.torque_limit
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+# Add src to path for direct execution
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.append(SRC)
+
+from prowinder.control.filters import AdaptiveNotchFilter
+
+
+def _fresh_interpreter(code: str) -> str:
+    env = dict(os.environ, PYTHONPATH=SRC)
+    return subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True).stdout
+
+
+def test_twin_import_and_run_do_not_load_heavy_dependencies():
+    out = _fresh_interpreter(
+        "import sys\n"
+        "import prowinder\n"
+        "print('numpy' in sys.modules)\n"
+        "from prowinder.simulation import digital_twin, sweep, monte_carlo\n"
+        "twin = prowinder.DigitalTwin(prowinder.SystemConfig(duration=0.05, control_mode='OPEN_LOOP_TORQUE'))\n"
+        "twin.run()\n"
+        "print(sorted(m for m in ('scipy', 'matplotlib', 'pandas') if m in sys.modules))\n"
+        "twin.notch_filter.process(1.0)\n"
+        "print('scipy.signal' in sys.modules)\n"
+    )
+    assert out.split('\n')[:3] == ['False', '[]', 'True']
+
+
+def test_lazy_notch_filter_matches_eager_design():
+    from scipy import signal
+    notch = AdaptiveNotchFilter(20.0, 10.0, 1000.0)
+    notch.adapt(current_inertia=4.0, base_inertia=1.0, base_freq=20.0)
+    assert notch.f0 == 10.0
+
+    b, a = signal.iirnotch(10.0 / 500.0, 10.0)
+    zi = signal.lfilter_zi(b, a)
+    x = np.sin(2 * np.pi * 10.0 * np.arange(200) / 1000.0) + 1.0
+    expected, _ = signal.lfilter(b, a, x, zi=zi)
+    np.testing.assert_allclose([notch.process(v) for v in x], expected, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(notch.b, b)
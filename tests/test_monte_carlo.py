@@ -0,0 +1,93 @@
+import numpy as np
+import os
+import sys
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.simulation.digital_twin import DigitalTwin, SensorNoise, SystemConfig
+from prowinder.simulation.monte_carlo import MonteCarloStudy, Normal, P2Quantile, Uniform, tolerance
+
+
+def _study(**kwargs):
+    return MonteCarloStudy(SystemConfig(dt=1e-3, duration=0.3), {
+        "material.thickness": tolerance(50e-6, 0.05),
+        "friction.coulomb_coeff": Uniform(0.3, 0.8),
+        "motor_specs.torque_bandwidth": Normal(1000.0, 100.0, low=500.0),
+        "sensor_noise.tension_std": Uniform(0.0, 0.5),
+    }, **kwargs)
+
+
+def test_p2_quantile_tracks_numpy_percentiles():
+    rng = np.random.default_rng(1)
+    data = rng.lognormal(0.0, 0.5, 20000)
+    for p in (0.05, 0.5, 0.95):
+        estimator = P2Quantile(p)
+        for x in data:
+            estimator.update(x)
+        assert estimator.value == pytest.approx(np.percentile(data, 100 * p), rel=0.02)
+
+
+def test_results_depend_only_on_seed():
+    study = _study()
+    local = study.run(8, seed=7, processes=1)
+    pooled = study.run(8, seed=7, processes=2, chunksize=3)
+    for name, column in local.samples.items():
+        np.testing.assert_array_equal(column, pooled.samples[name])
+    assert local.percentiles == pooled.percentiles
+
+    other = study.run(8, seed=8, processes=1)
+    assert not np.array_equal(other.samples["friction.coulomb_coeff"], local.samples["friction.coulomb_coeff"])
+
+
+def test_streaming_statistics_and_failure_rate():
+    study = _study(limits={"tension_max_error": 0.0})
+    result = study.run(6, seed=0, processes=1)
+    assert result.failure_rate == 1.0
+
+    errors = result.samples["tension_rms_error"]
+    assert result.mean["tension_rms_error"] == pytest.approx(np.mean(errors))
+    assert result.std["tension_rms_error"] == pytest.approx(np.std(errors, ddof=1))
+    assert result.max["tension_rms_error"] == np.max(errors)
+    assert min(errors) <= result.percentiles["tension_rms_error"][50.0] <= max(errors)
+
+    relaxed = MonteCarloStudy(study.base_config, study.distributions, limits={"tension_max_error": 1e6})
+    assert relaxed.run(4, seed=0, processes=1, keep_samples=False).failure_rate == 0.0
+    # Local runs keep no reference to the study in the module-level worker context
+    from prowinder.simulation import monte_carlo
+    assert monte_carlo._WORKER == {}
+
+
+def test_sensor_noise_uses_twin_generator():
+    config = SystemConfig(duration=0.1, sensor_noise=SensorNoise(speed_std=0.05, tension_std=1.0))
+    runs = [DigitalTwin(config, rng=np.random.default_rng(seed)).run()['tension'] for seed in (3, 3, 4)]
+    np.testing.assert_array_equal(runs[0], runs[1])
+    assert not np.array_equal(runs[0], runs[2])
+
+
+def test_invalid_studies_are_rejected():
+    with pytest.raises(ValueError):
+        MonteCarloStudy(SystemConfig(), {"friction.unknown": Uniform(0.0, 1.0)})
+    with pytest.raises(ValueError):
+        DigitalTwin(SystemConfig(engine="kernel", sensor_noise=SensorNoise(tension_std=1.0)))
+
+
+def test_diverged_samples_count_as_failures():
+    # Explicit Euler with a coarse step is unstable for fast torque loops
+    study = MonteCarloStudy(SystemConfig(duration=1.0, dt=0.005, discretization='euler'),
+                            {"motor_specs.torque_bandwidth": Uniform(500, 1200)})
+    result = study.run(6, seed=1, processes=1)
+    assert result.n_failures > 0
+    assert result.samples["failed"].sum() == result.n_failures
+
+
+def test_errors_that_are_not_divergence_propagate():
+    def broken(history, references):
+        return {'rms': float(np.sqrt(np.mean(history['tension_typo'] ** 2)))}
+
+    study = MonteCarloStudy(SystemConfig(dt=1e-3, duration=0.05), {"friction.coulomb_coeff": Uniform(0.3, 0.8)},
+                            kpis=broken)
+    with pytest.raises(KeyError):
+        study.run(2, seed=0, processes=1)
@@ -0,0 +1,67 @@
+import numpy as np
+import os
+import sys
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.simulation.scheduler import MultiRateScheduler
+from prowinder.simulation.digital_twin import DigitalTwin, SystemConfig
+from prowinder.simulation.batch_twin import BatchDigitalTwin
+
+
+def test_scheduler_divisors_and_ticks():
+    sched = MultiRateScheduler(1e-4, {"control": 1e-3, "estimator": 5e-3})
+    assert sched.divisors == {"control": 10, "estimator": 50}
+    due = []
+    for _ in range(20):
+        due.append(sched.due("control"))
+        sched.advance()
+    assert due.count(True) == 2 and due[0] and due[10]
+
+    with pytest.raises(ValueError):
+        MultiRateScheduler(1e-3, {"control": 1.5e-3})
+
+
+def test_equal_rates_reproduce_single_rate_twin():
+    base = DigitalTwin(SystemConfig(duration=0.5)).run()
+    explicit = DigitalTwin(SystemConfig(duration=0.5, control_dt=0.001, estimator_dt=0.001)).run()
+    np.testing.assert_array_equal(base['tension'], explicit['tension'])
+    np.testing.assert_array_equal(base['torque'], explicit['torque'])
+
+
+@pytest.mark.parametrize("mode", ["CLOSED_LOOP_TENSION", "OPEN_LOOP_TORQUE", "SPEED_LIMIT"])
+def test_slow_control_holds_command(mode):
+    config = SystemConfig(dt=1e-4, control_dt=1e-3, estimator_dt=2e-3, duration=0.2, control_mode=mode)
+    twin = DigitalTwin(config)
+    commands = []
+    for _ in range(40):
+        twin.step(speed_ref=2.0, tension_ref=80.0)
+        commands.append(twin.motor.target_torque)
+    commands = np.array(commands)
+
+    # Command only changes on control ticks (every 10 plant steps)
+    assert np.all(np.diff(commands.reshape(4, 10), axis=1) == 0.0)
+    assert twin.tension_observer.dt == pytest.approx(2e-3)
+
+
+def test_batch_matches_scalar_at_mixed_rates():
+    configs = [
+        SystemConfig(dt=5e-4, control_dt=1e-3, estimator_dt=2e-3, duration=0.5, control_mode=mode)
+        for mode in ("CLOSED_LOOP_TENSION", "OPEN_LOOP_TORQUE", "SPEED_LIMIT")
+    ]
+    batch = BatchDigitalTwin(configs)
+    out = batch.run()
+
+    for i, config in enumerate(configs):
+        history = DigitalTwin(config).run(speed_ref=5.0, tension_ref=100.0)
+        np.testing.assert_allclose(out['tension'][:, i], history['tension'], rtol=1e-9, atol=1e-9)
+
+
+def test_invalid_rates_are_rejected():
+    with pytest.raises(ValueError):
+        DigitalTwin(SystemConfig(dt=1e-3, control_dt=2.5e-3))
+    with pytest.raises(ValueError):
+        BatchDigitalTwin([SystemConfig(control_dt=1e-3), SystemConfig(control_dt=2e-3)])
@@ -0,0 +1,54 @@
+import numpy as np
+import os
+import sys
+import time
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.simulation.digital_twin import DigitalTwin, SystemConfig
+from prowinder.simulation.multiscale import QuasiStaticRunner
+from prowinder.simulation.profiles import SCurveRamp, SpliceSlowdown
+
+
+# Open loop has no tension integrator: its steady-state error is only carried from segment entry
+@pytest.mark.parametrize("mode, torque_tol", [("CLOSED_LOOP_TENSION", 0.01), ("OPEN_LOOP_TORQUE", 0.1)])
+def test_fast_forward_matches_full_dynamic_twin(mode, torque_tol):
+    config = SystemConfig(duration=30.0, control_mode=mode)
+    speed = SCurveRamp(2.0, 5.0, t_start=15.0)
+    reference = DigitalTwin(config).run(speed, 100.0)
+    result = QuasiStaticRunner(DigitalTwin(config), macro_dt=1.0).run(speed, 100.0)
+    history = result.history
+
+    assert result.macro_steps > 0 and result.speedup > 2.0
+    assert history['time'][-1] == pytest.approx(30.0)
+    assert history['radius'][-1] == pytest.approx(reference['radius'][-1], rel=1e-5)
+    assert history['omega'][-1] == pytest.approx(reference['omega'][-1], rel=1e-4)
+    assert history['torque'][-1] == pytest.approx(reference['torque'][-1], rel=torque_tol)
+
+    # The speed ramp is always simulated by the full dynamic twin, with a lead-in
+    kinds = [kind for start, end, kind in result.segments if start <= 15.0 - 0.4 and end >= 15.0 + speed.duration]
+    assert kinds == ['dynamic']
+    dynamic = history['quasi_static'] == 0
+    window = dynamic & (history['time'] > 14.0) & (history['time'] < 15.0 + speed.duration)
+    ref_window = (reference['time'] > 14.0) & (reference['time'] < 15.0 + speed.duration)
+    assert abs(history['tension'][window].min() - reference['tension'][ref_window].min()) < 1.5
+
+
+def test_full_roll_cycle_runs_in_seconds():
+    twin = DigitalTwin(SystemConfig(initial_radius=0.05))
+    speed = SCurveRamp(0.0, 5.0) + SpliceSlowdown(300.0, depth=3.0, dwell=2.0)
+    start = time.perf_counter()
+    result = QuasiStaticRunner(twin, macro_dt=2.0).run(speed, 100.0, duration=900.0)
+    assert time.perf_counter() - start < 20.0
+    assert result.speedup > 20.0
+    assert [kind for _, _, kind in result.segments] == ['dynamic', 'quasi_static', 'dynamic', 'quasi_static']
+
+    # Roll geometry at constant speed: R^2 grows by e * v * t / pi
+    radius = result.history['radius'][-1]
+    assert radius**2 == pytest.approx(0.05**2 + 50e-6 * 5.0 * 900.0 / np.pi, rel=0.02)
+    assert twin.unwinder.radius == radius and twin.time == pytest.approx(900.0)
+    tension = result.history['tension'][result.history['time'] > 10.0]
+    assert np.all(np.abs(tension - 100.0) < 20.0)
@@ -0,0 +1,78 @@
+import numpy as np
+import os
+import sys
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.simulation.profiles import (
+    SCurveRamp, SpliceSlowdown, TaperTension, ConstantProfile, sample_references,
+)
+from prowinder.simulation.digital_twin import DigitalTwin, SystemConfig
+from prowinder.simulation.batch_twin import BatchDigitalTwin
+
+
+@pytest.mark.parametrize("end, max_accel", [(5.0, 2.0), (0.2, 2.0), (-3.0, 1.5)])
+def test_scurve_limits_and_derivatives(end, max_accel):
+    ramp = SCurveRamp(0.0, end, t_start=0.5, max_accel=max_accel, max_jerk=10.0)
+    t = np.linspace(0.0, ramp.t_end + 0.5, 20001)
+    v, a, j = ramp.evaluate(t)
+
+    assert v[0] == 0.0 and v[-1] == pytest.approx(end)
+    assert np.max(np.abs(a)) <= max_accel + 1e-12
+    assert np.max(np.abs(j)) <= 10.0 + 1e-12
+    # Analytic derivatives agree with numerical ones
+    np.testing.assert_allclose(np.gradient(v, t), a, atol=5e-3)
+    # Jerk integrates back to the acceleration (jerk is discontinuous, so compare integrals)
+    dt = t[1] - t[0]
+    np.testing.assert_allclose(np.concatenate(([0.0], np.cumsum(0.5 * (j[1:] + j[:-1]) * dt))), a, atol=1e-2)
+
+
+def test_splice_slowdown_returns_to_base():
+    speed = SCurveRamp(0.0, 5.0, 0.0, 2.0, 10.0) + SpliceSlowdown(t_start=4.0, depth=3.0, dwell=1.0, max_accel=2.0, max_jerk=10.0)
+    t = np.array([3.9, 4.0 + 1.7 + 0.5, 20.0])
+    v, a, _ = speed.evaluate(t)
+    np.testing.assert_allclose(v, [5.0, 2.0, 5.0])
+    np.testing.assert_allclose(a, 0.0, atol=1e-12)
+
+
+def test_taper_tension_laws():
+    hyper = TaperTension(100.0, taper=0.3, core_radius=0.05)
+    f, df, d2f = hyper.factor_derivatives(np.array([0.05, 0.1]))
+    np.testing.assert_allclose(f, [1.0, 0.85])
+    eps = 1e-6
+    np.testing.assert_allclose(df, (hyper.factor(np.array([0.05, 0.1]) + eps) - f) / eps, rtol=1e-4)
+    assert np.all(d2f > 0)
+
+    linear = TaperTension(100.0, taper=0.5, core_radius=0.05, max_radius=0.25, law="linear")
+    assert linear.factor(0.25) == pytest.approx(0.5)
+    with pytest.raises(ValueError):
+        TaperTension(100.0, 0.5, 0.05, law="linear")
+
+
+def test_sample_references_is_bulk():
+    refs = sample_references(SCurveRamp(0.0, 2.0, 0.0, 1.0, 5.0), ConstantProfile(80.0), 0.0, 0.01, 500)
+    assert refs.speed.shape == (500,) and refs.speed_dot.shape == (500,)
+    np.testing.assert_allclose(refs.tension, 80.0)
+
+
+def test_twin_run_with_profiles_uses_exact_feedforward():
+    speed = SCurveRamp(0.0, 3.0, t_start=0.1, max_accel=4.0, max_jerk=40.0)
+    tension = TaperTension(100.0, taper=0.2, core_radius=0.05)
+    config = SystemConfig(duration=1.5)
+
+    twin = DigitalTwin(config)
+    history = twin.run(speed_ref=speed, tension_ref=tension)
+
+    manual = DigitalTwin(config)
+    for k in range(1500):
+        t = k * config.dt
+        v, a, _ = speed.evaluate(np.array([t]))
+        manual.step(v[0], 100.0 * tension.factor(manual.unwinder.radius), speed_ref_dot=a[0])
+    np.testing.assert_allclose(history['tension'], manual.history['tension'])
+
+    batch = BatchDigitalTwin([config, config])
+    out = batch.run(speed_ref=speed, tension_ref=tension, record=False)
+    np.testing.assert_allclose(out['tension'], twin.web_span.tension, rtol=1e-9)
@@ -0,0 +1,74 @@
+import json
+import numpy as np
+import os
+import sys
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.simulation.digital_twin import DigitalTwin, SystemConfig
+from prowinder.simulation.profiling import N_BUCKETS, StageProfiler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_nested_stages_are_timed_exclusively():
+    clock = FakeClock()
+    profiler = StageProfiler(clock)
+
+    def inner():
+        clock.now += 300
+
+    timed_inner = profiler.wrap('inner', inner)
+
+    def outer():
+        clock.now += 1000
+        timed_inner()
+        timed_inner()
+
+    profiler.wrap('outer', outer)()
+
+    summary = profiler.summary()
+    assert summary['outer']['calls'] == 1 and summary['outer']['total_ms'] == 1000 / 1e6
+    assert summary['inner']['calls'] == 2 and summary['inner']['mean_us'] == 0.3
+    assert profiler.total_ns == 1600
+
+    edges, counts = profiler.histogram('inner')
+    assert len(edges) == N_BUCKETS + 1 and counts.sum() == 2
+    assert edges[np.argmax(counts)] <= 300 < edges[np.argmax(counts) + 1]
+
+
+def test_twin_stage_breakdown_depends_on_control_mode():
+    for mode, expected in (("CLOSED_LOOP_TENSION", 'friction_observer'), ("OPEN_LOOP_TORQUE", 'notch_filter')):
+        profiler = StageProfiler()
+        twin = DigitalTwin(SystemConfig(duration=0.2, control_mode=mode, control_dt=2e-3), profiler=profiler)
+        twin.run()
+        summary = profiler.summary()
+        assert summary['step']['calls'] == 200
+        assert summary['plant']['calls'] == 200 and summary['actuation']['calls'] == 200
+        assert summary['control']['calls'] == 100
+        assert summary['sensing']['calls'] == 300  # Estimator and control ticks
+        assert summary[expected]['calls'] > 0
+        assert abs(sum(s['share'] for s in summary.values()) - 1.0) < 1e-9
+
+    # JSON export and text report
+    json.dumps(profiler.to_dict())
+    assert 'tension_observer' in profiler.report()
+
+
+def test_profiled_twin_matches_unprofiled_twin():
+    config = SystemConfig(duration=0.2)
+    plain = DigitalTwin(config)
+    assert 'advance' not in vars(plain)  # Nothing is wrapped without a profiler
+    profiler = StageProfiler()
+    np.testing.assert_array_equal(DigitalTwin(config, profiler=profiler).run()['tension'], plain.run()['tension'])
+
+    kernel = StageProfiler()
+    DigitalTwin(SystemConfig(duration=0.2, engine="kernel"), profiler=kernel).run()
+    assert set(kernel.stats) == {'kernel', 'step', 'logging'}
@@ -0,0 +1,91 @@
+import numpy as np
+import os
+import sys
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.simulation.digital_twin import DigitalTwin, SystemConfig
+from prowinder.simulation.realtime import PacedRunner
+
+
+class FakeTime:
+    """Monotonic clock advancing on sleep, by 1 us per read, and by the simulated cycle cost."""
+
+    def __init__(self, costs_us=()):
+        self.now = 0
+        self.costs = list(costs_us)
+        self.sleeps = 0
+
+    def clock(self):
+        self.now += 1000
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps += 1
+        self.now += int(seconds * 1e9)
+
+    def on_cycle(self, sample):
+        self.now += int(1e3 * (self.costs.pop(0) if self.costs else 100))
+
+
+def _runner(fake, policy="catch_up"):
+    twin = DigitalTwin(SystemConfig(dt=1e-3))
+    return twin, PacedRunner(twin, policy=policy, clock=fake.clock, sleep=fake.sleep, disable_gc=False)
+
+
+def test_cycles_start_on_their_deadlines():
+    fake = FakeTime()
+    twin, runner = _runner(fake)
+    report = runner.run(duration=0.05, on_cycle=fake.on_cycle)
+    summary = report.summary()
+
+    assert summary['cycles'] == 50 and len(twin.history['time']) == 50
+    assert summary['overruns'] == 0 and report.sustainable()
+    assert summary['latency_max_us'] <= 2.0  # Spin wait ends within one clock read
+    assert summary['jitter_max_us'] <= 2.0
+    assert summary['achieved_rate_hz'] == pytest.approx(1000.0, rel=0.01)
+    assert fake.sleeps == 49  # Coarse sleep before each spin, except for the first cycle
+
+
+@pytest.mark.parametrize("policy", ["catch_up", "skip_logging", "substep", "slip"])
+def test_overrun_policies(policy):
+    # Cycle 5 takes 3.5 periods
+    fake = FakeTime([100] * 5 + [3500])
+    twin, runner = _runner(fake, policy)
+    report = runner.run(duration=0.03, on_cycle=fake.on_cycle)
+    summary = report.summary()
+    assert twin.time == pytest.approx(0.03)
+    assert report.overrun[5] and summary['overruns'] >= 1
+
+    if policy == "catch_up":
+        assert summary['cycles'] == 30 and summary['unlogged_cycles'] == 0
+        assert summary['max_consecutive_overruns'] >= 2
+    elif policy == "skip_logging":
+        assert summary['unlogged_cycles'] >= 2
+        assert len(twin.history['time']) == 30 - summary['unlogged_cycles']
+    elif policy == "substep":
+        assert report.steps[6] == 3 and summary["cycles"] == 28
+        assert summary['overruns'] == 1  # Back on schedule right after the merged cycle
+    else:
+        assert summary['cycles'] == 30 and summary['overruns'] == 1
+        # Wall time slipped by the overrun: the last cycle starts ~3 periods late
+        assert report.start_ns[-1] > 31e6
+    assert not report.sustainable()
+
+
+def test_real_clock_runs_at_requested_rate():
+    twin = DigitalTwin(SystemConfig(dt=2e-3))
+    report = PacedRunner(twin).run(duration=0.1)
+    summary = report.summary()
+    assert summary['cycles'] == 50
+    # Elapsed wall time follows the period (no fast-forward)
+    assert report.start_ns[-1] >= 49 * 2e6
+    assert summary['achieved_rate_hz'] < 600
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        PacedRunner(DigitalTwin(SystemConfig()), policy="drop")
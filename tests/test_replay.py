@@ -0,0 +1,141 @@
+import numpy as np
+import os
+import sys
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.control.inertia_estimator import InertiaEstimator
+from prowinder.control.observers import FrictionObserver
+from prowinder.control.radius_estimator import RadiusCalculator
+from prowinder.control.tension_observer import TENSION_MODES, TensionObserver
+from prowinder.mechanics.friction import FrictionModel
+from prowinder.mechanics.material import MaterialProperties
+from prowinder.simulation.replay import (FrictionReplay, InertiaReplay, RadiusReplay, ReplayEngine,
+                                         TensionReplay, replay_many)
+
+MATERIAL = MaterialProperties("PET", 1390.0, 4e9, 50e-6, width=0.15)
+THICKNESS = 50e-6
+
+
+def _trace(n=1500, dt=1e-2):
+    rng = np.random.default_rng(3)
+    t = np.arange(n) * dt
+    radius = 0.05 + 1e-5 * np.arange(n)
+    line_speed = 1.0 + 0.5 * np.sin(0.5 * t)
+    return {
+        'time': t,
+        'omega': line_speed / radius,
+        'line_speed': line_speed,
+        'torque': -0.15 * 100.0 + 0.2 * rng.standard_normal(n),
+        'tension': 100.0 + rng.standard_normal(n),
+    }
+
+
+def _estimators():
+    return {
+        'radius': RadiusReplay(RadiusCalculator(R0=0.05, film_thickness=THICKNESS, roller_length=1.0), THICKNESS),
+        'tension': TensionReplay(TensionObserver(MATERIAL, span_length=1.5, dt=1e-2), radius='radius.radius'),
+        'inertia': InertiaReplay(InertiaEstimator(J_motor=0.05, J_roller=0.02, R_core=0.05, L_roller=1.0, dt=1e-2),
+                                 radius='radius.radius', tension='tension.tension'),
+        'friction': FrictionReplay(FrictionObserver(FrictionModel(0.5, 0.01, 0.6, 0.1)), inertia=0.1),
+    }
+
+
+def test_chunked_replay_matches_sample_by_sample_loop():
+    trace = _trace()
+    out = ReplayEngine(_estimators()).run(trace, chunk_size=137)
+
+    # Reference: one plain loop over the whole trace with fresh estimators
+    calc = RadiusCalculator(R0=0.05, film_thickness=THICKNESS, roller_length=1.0)
+    observer = TensionObserver(MATERIAL, span_length=1.5, dt=1e-2)
+    inertia = InertiaEstimator(J_motor=0.05, J_roller=0.02, R_core=0.05, L_roller=1.0, dt=1e-2)
+    friction = FrictionObserver(FrictionModel(0.5, 0.01, 0.6, 0.1))
+    expected = {'radius': [], 'tension': [], 'mode': [], 'J_total': [], 'friction': []}
+    prev_omega = trace['omega'][0]
+    for i in range(len(trace['time'])):
+        t, w, v = trace['time'][i], trace['omega'][i], trace['line_speed'][i]
+        tau, T = trace['torque'][i], trace['tension'][i]
+        dt = 1e-2 if i == 0 else t - trace['time'][i - 1]
+        alpha = (w - prev_omega) / dt
+        prev_omega = w
+        R = calc.estimate(v * 60.0, w, THICKNESS, dt).radius
+        estimate = observer.update(tau_motor=tau, omega=w, alpha=alpha, R=R, v_upstream=w * R, v_downstream=v,
+                                   dt=dt, tension_measured=T)
+        expected['radius'].append(R)
+        expected['tension'].append(estimate.tension)
+        expected['mode'].append(TENSION_MODES.index(estimate.mode))
+        expected['J_total'].append(inertia.update(tau, w, alpha, estimate.tension, R).J_total)
+        expected['friction'].append(friction.update(w, tau, dt, 0.1))
+
+    assert len(out['time']) == len(trace['time'])
+    np.testing.assert_allclose(out['radius.radius'], expected['radius'], rtol=1e-12)
+    np.testing.assert_allclose(out['tension.tension'], expected['tension'], rtol=1e-12)
+    np.testing.assert_array_equal(out['tension.mode'], expected['mode'])
+    np.testing.assert_allclose(out['inertia.J_total'], expected['J_total'], rtol=1e-12)
+    np.testing.assert_allclose(out['friction.friction'], expected['friction'], rtol=1e-12)
+    # The radius follows the recorded roll growth
+    assert out['radius.radius'][-1] == pytest.approx(0.05 + 1e-5 * 1499, rel=0.05)
+
+
+def test_csv_npz_and_sink_sources_agree(tmp_path):
+    import pandas as pd
+    trace = _trace(n=600)
+    reference = ReplayEngine(_estimators()).run(trace, chunk_size=600)
+
+    csv = tmp_path / 'trace.csv'
+    pd.DataFrame(trace).to_csv(csv, index=False, float_format='%.17g')
+    from_csv = ReplayEngine(_estimators()).run(str(csv), chunk_size=100)
+
+    npz = tmp_path / 'trace.npz'
+    np.savez(npz, **trace)
+    parts = []
+    assert ReplayEngine(_estimators()).run(npz, chunk_size=250, sink=parts.append) is None
+    assert [len(p['time']) for p in parts] == [250, 250, 100]
+
+    for name in reference:
+        np.testing.assert_allclose(from_csv[name], reference[name], rtol=1e-12)
+        np.testing.assert_allclose(np.concatenate([p[name] for p in parts]), reference[name], rtol=1e-12)
+
+
+def test_non_numeric_log_columns_are_ignored(tmp_path):
+    import pandas as pd
+    from prowinder.simulation.replay import iter_chunks
+    trace = _trace(n=300)
+    reference = ReplayEngine(_estimators()).run(trace)
+
+    frame = pd.DataFrame(trace)
+    frame.insert(0, 'timestamp', pd.date_range('2026-03-02 06:00', periods=300, freq='10ms').astype(str))
+    frame['status'] = np.where(np.arange(300) < 150, 'RUN', 'RAMP')
+    frame['motor_temp'] = 40.0
+    csv = tmp_path / 'plc_log.csv'
+    frame.to_csv(csv, index=False, float_format='%.17g')
+
+    from_csv = ReplayEngine(_estimators()).run(str(csv), chunk_size=128)
+    for name in reference:
+        np.testing.assert_allclose(from_csv[name], reference[name], rtol=1e-12)
+    # Only numeric columns when no channel selection is given; a requested text column is an error
+    assert set(next(iter_chunks(str(csv)))) == set(trace) | {'motor_temp'}
+    with pytest.raises(ValueError, match="status"):
+        next(iter_chunks(str(csv), channels=['time', 'status']))
+
+
+def test_missing_channel_is_reported():
+    trace = _trace(n=50)
+    del trace['tension']
+    engine = ReplayEngine({'tension': TensionReplay(TensionObserver(MATERIAL, span_length=1.5), radius=0.05)})
+    with pytest.raises(ValueError, match="tension"):
+        engine.run(trace)
+    # Without the load cell the observer runs on torque alone
+    engine = ReplayEngine({'tension': TensionReplay(TensionObserver(MATERIAL, span_length=1.5), radius=0.05,
+                                                    use_load_cell=False)})
+    assert len(engine.run(trace)['tension.tension']) == 50
+
+
+def test_replay_many_is_ordered():
+    traces = [_trace(n=200), {k: v[:120] for k, v in _trace(n=200).items()}]
+    outputs = replay_many(traces, _estimators, chunk_size=64, processes=2)
+    assert [len(o['time']) for o in outputs] == [200, 120]
+    np.testing.assert_allclose(outputs[1]['tension.tension'], outputs[0]['tension.tension'][:120], rtol=1e-12)
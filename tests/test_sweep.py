@@ -0,0 +1,69 @@
+import numpy as np
+import os
+import sys
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.simulation.digital_twin import DigitalTwin, SystemConfig
+from prowinder.simulation.sweep import apply_overrides, grid, run_sweep
+
+
+def _final_tension(history, references):
+    return {'final_tension': float(history['tension'][-1]), 'ref': float(references.tension[-1])}
+
+
+def test_grid_and_dotted_overrides():
+    points = grid(tension_kp=[0.2, 0.5], **{"material.young_modulus": [2e9, 4e9, 6e9]})
+    assert len(points) == 6
+    config = apply_overrides(SystemConfig(), points[-1])
+    assert config.tension_kp == 0.5 and config.material.young_modulus == 6e9
+    assert SystemConfig().material.young_modulus == 4e9  # Base config untouched
+
+    with pytest.raises(ValueError):
+        apply_overrides(SystemConfig(), {"material.colour": "red"})
+
+
+def test_serial_sweep_matches_direct_runs():
+    base = SystemConfig(duration=0.3)
+    points = grid(tension_kp=[0.2, 1.0], span_length=[1.0, 2.0])
+    result = run_sweep(base, points, speed_ref=2.0, tension_ref=80.0, trajectories=('tension',), processes=1)
+
+    assert len(result) == 4
+    assert result.trajectories['tension'].shape == (4, 300)
+    np.testing.assert_array_equal(result.parameters['tension_kp'], [0.2, 0.2, 1.0, 1.0])
+    for i, point in enumerate(points):
+        direct = DigitalTwin(apply_overrides(base, point)).run(speed_ref=2.0, tension_ref=80.0)
+        np.testing.assert_array_equal(result.trajectories['tension'][i], direct['tension'])
+        assert result.kpis['final_tension'][i] == direct['tension'][-1]
+
+    best = result.best('tension_rms_error')
+    assert best['tension_rms_error'] == result.kpis['tension_rms_error'].min()
+
+
+def test_local_sweeps_do_not_share_worker_state():
+    from prowinder.simulation import sweep
+
+    def nested(history, references):
+        # A sweep inside a KPI must not change the context of the outer sweep
+        inner = run_sweep(SystemConfig(duration=0.05), [{'span_length': 3.0}], processes=1)
+        return {'final_tension': float(history['tension'][-1]), 'inner': float(inner.kpis['tension_rms_error'][0])}
+
+    base = SystemConfig(duration=0.1)
+    points = [{'tension_kp': 0.2}, {'tension_kp': 1.0}]
+    result = run_sweep(base, points, kpis=nested, processes=1)
+    for i, point in enumerate(points):
+        assert result.kpis['final_tension'][i] == DigitalTwin(apply_overrides(base, point)).run()['tension'][-1]
+    assert sweep._WORKER == {}
+
+
+def test_process_pool_matches_serial():
+    base = SystemConfig(duration=0.2)
+    points = grid(tension_ki=[0.5, 1.0, 2.0, 4.0], gear_ratio=[1.0, 2.0])
+    serial = run_sweep(base, points, kpis=_final_tension, processes=1)
+    pooled = run_sweep(base, points, kpis=_final_tension, processes=2, chunksize=3)
+
+    np.testing.assert_array_equal(pooled.kpis['final_tension'], serial.kpis['final_tension'])
+    np.testing.assert_array_equal(pooled.kpis['ref'], 100.0)
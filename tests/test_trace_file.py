@@ -0,0 +1,96 @@
+import numpy as np
+import os
+import sys
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.control.tension_observer import TENSION_MODES
+from prowinder.simulation.digital_twin import DigitalTwin, SystemConfig
+from prowinder.simulation.history import HistoryRecorder
+from prowinder.simulation.trace_file import TraceReader, TraceWriter, write_trace
+
+
+def _columns(n=10000):
+    t = np.arange(n) * 1e-3
+    return {'time': t, 'tension': 100.0 + np.sin(t), 'count': np.arange(n, dtype=np.int32)}
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_round_trip_and_time_window(tmp_path, compression):
+    columns = _columns()
+    path = tmp_path / 'trace.pwt'
+    with TraceWriter(path, chunk_size=1000, compression=compression) as writer:
+        # Writes that straddle chunk boundaries
+        for start in range(0, 10000, 1500):
+            writer.write({name: c[start:start + 1500] for name, c in columns.items()})
+
+    trace = TraceReader(path)
+    assert trace.n_samples == 10000 and trace.n_chunks == 10
+    for name, column in columns.items():
+        np.testing.assert_array_equal(trace[name], column)
+    assert trace['count'].dtype == np.int32
+
+    window = trace.window(2.5, 4.2)
+    mask = (columns['time'] >= 2.5) & (columns['time'] <= 4.2)
+    np.testing.assert_array_equal(window['tension'], columns['tension'][mask])
+    assert trace.window(20.0, 30.0)['time'].size == 0
+    assert trace.index_range(None, 0.0) == (0, 1)
+
+    t = columns['time']
+    chunks = list(trace.iter_chunks(('time',), t_start=t[999], t_end=t[2000]))
+    assert [len(c['time']) for c in chunks] == [1, 1000, 1]
+
+
+def test_uncompressed_columns_are_views_on_the_mapped_file(tmp_path):
+    path = tmp_path / 'trace.pwt'
+    write_trace(path, _columns(), chunk_size=4000)
+    trace = TraceReader(path)
+    window = trace.window(1.0, 2.0, channels=('tension',))['tension']
+    assert isinstance(window.base, np.memmap) or isinstance(window.base.base, np.memmap)
+    assert not window.flags.writeable
+
+
+def test_categories_and_history_round_trip(tmp_path):
+    history = HistoryRecorder(['time', 'tension'], {'mode': ['torque']}, chunk_size=16)
+    for i in range(100):
+        history.append([i * 0.01, 50.0 + i], ['span' if i % 3 else 'torque'])
+    path = tmp_path / 'history.pwt'
+    assert history.to_trace(path, compression="zlib", chunk_size=32) == 100
+
+    trace = TraceReader(path)
+    assert trace.category_channels == ['mode'] and trace.categories('mode') == ['torque', 'span']
+    np.testing.assert_array_equal(trace['mode'], history['mode'])
+
+    reloaded = HistoryRecorder.from_trace(path, t_start=0.2, t_end=0.5)
+    np.testing.assert_array_equal(reloaded['time'], history['time'][20:51])
+    np.testing.assert_array_equal(reloaded['mode'], history['mode'][20:51])
+
+    # String columns are encoded on the fly
+    write_trace(tmp_path / 's.pwt', {'time': [0.0, 1.0, 2.0], 'state': np.array(['a', 'b', 'a'])})
+    assert list(TraceReader(tmp_path / 's.pwt')['state']) == ['a', 'b', 'a']
+
+
+def test_twin_streams_to_trace_like_run(tmp_path):
+    config = SystemConfig(duration=0.5)
+    history = DigitalTwin(config).run()
+    trace = DigitalTwin(config).run_to_trace(tmp_path / 'twin.pwt', chunk_size=128, compression="zlib")
+    assert trace.n_samples == history.n_samples
+    for name in history:
+        np.testing.assert_array_equal(trace[name], history[name])
+    assert set(trace.categories('tension_mode')) <= set(TENSION_MODES)
+
+
+def test_invalid_traces_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="non-decreasing"):
+        write_trace(tmp_path / 'a.pwt', {'time': [0.0, 2.0, 1.0]})
+    with pytest.raises(ValueError, match="Time channel"):
+        write_trace(tmp_path / 'b.pwt', {'x': [0.0]})
+    writer = TraceWriter(tmp_path / 'c.pwt')
+    writer.write({'time': [0.0]})
+    with pytest.raises(ValueError, match="not a complete trace"):
+        TraceReader(tmp_path / 'c.pwt')  # Index not written yet
+    writer.close()
+    assert TraceReader(tmp_path / 'c.pwt').n_samples == 1
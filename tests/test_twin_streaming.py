@@ -0,0 +1,63 @@
+import numpy as np
+import os
+import sys
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.simulation.digital_twin import DigitalTwin, SystemConfig, TwinSample, SAMPLE_DTYPE
+
+
+def _ramp(t):
+    return 2.0 * min(t / 0.1, 1.0)
+
+
+def test_stream_matches_step_loop():
+    config = SystemConfig(duration=0.2)
+    reference = DigitalTwin(config)
+    for i in range(200):
+        reference.step(speed_ref=_ramp(i * config.dt), tension_ref=80.0)
+
+    twin = DigitalTwin(config)
+    samples = list(twin.iter_steps(speed_ref=_ramp, tension_ref=80.0, duration=0.2))
+
+    assert len(samples) == 200
+    assert isinstance(samples[-1], TwinSample)
+    np.testing.assert_allclose([s.tension for s in samples], reference.history['tension'])
+    assert twin.history.n_samples == 0  # Streaming does not grow the history by default
+
+
+def test_stop_and_resume():
+    config = SystemConfig()
+    reference = DigitalTwin(config)
+    full = list(reference.iter_steps(speed_ref=_ramp, duration=0.3))
+
+    twin = DigitalTwin(config)
+    first = []
+    for sample in twin.iter_steps(speed_ref=_ramp):
+        first.append(sample)
+        if len(first) == 120:
+            break
+    rest = list(twin.iter_steps(speed_ref=_ramp, duration=0.18))
+
+    resumed = first + rest
+    assert len(resumed) == 300
+    np.testing.assert_allclose([s.tension for s in resumed], [s.tension for s in full])
+
+
+def test_block_stream():
+    twin = DigitalTwin(SystemConfig())
+    blocks = list(twin.iter_steps(duration=0.025, block_size=10, record=True))
+
+    assert [len(b) for b in blocks] == [10, 10, 5]
+    assert blocks[0].dtype == SAMPLE_DTYPE
+    stacked = np.concatenate(blocks)
+    np.testing.assert_allclose(stacked['tension'], twin.history['tension'])
+    np.testing.assert_allclose(stacked['time'], twin.history['time'])
+
+
+def test_invalid_block_size():
+    with pytest.raises(ValueError):
+        next(DigitalTwin(SystemConfig()).iter_steps(block_size=0))
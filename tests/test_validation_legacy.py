@@ -7,7 +7,6 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
 import numpy as np
-import matplotlib.pyplot as plt
 from prowinder.simulation.digital_twin import DigitalTwin, SystemConfig
 from prowinder.mechanics.material import MaterialProperties
 
@@ -78,6 +77,7 @@ class TestLegacyValidation(unittest.TestCase):
         print(f"[Validation] Final Speed: {results['speed'][-1]:.2f} m/s (Target: {target_speed:.2f} m/s)")
         
         # 5. Plotting (Saved to file for user review)
+        import matplotlib.pyplot as plt  # Only needed for plotting
         plt.figure(figsize=(10, 6))
         plt.subplot(2, 1, 1)
         plt.plot(results['time'], results['speed'], label='Line Speed (m/s)')
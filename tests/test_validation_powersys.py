@@ -7,7 +7,6 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
 import numpy as np
-import matplotlib.pyplot as plt
 from prowinder.simulation.digital_twin import DigitalTwin, SystemConfig
 from prowinder.mechanics.material import MaterialProperties
 
@@ -106,6 +105,7 @@ class TestPowerSysValidation(unittest.TestCase):
         
         # 5. Plotting
         try:
+            import matplotlib.pyplot as plt  # Only needed for plotting
             plt.figure(figsize=(12, 8))
             
             plt.subplot(3, 1, 1)
@@ -0,0 +1,97 @@
+import numpy as np
+import os
+import sys
+import time
+
+import pytest
+
+# Add src to path for direct execution
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prowinder.mechanics.friction import FrictionProperties
+from prowinder.mechanics.material import MaterialProperties, WebMaterial
+from prowinder.mechanics.motor import MotorSpecs
+from prowinder.mechanics.roller import Roller
+from prowinder.mechanics.web_span import SpanProperties, WebSpan
+from prowinder.simulation.profiles import SCurveRamp
+from prowinder.simulation.web_line import LineBuilder
+
+MATERIAL = MaterialProperties("PET", 1390.0, 4e9, 50e-6, width=0.15, viscosity=5e7)
+LOW_FRICTION = FrictionProperties(0.01, 0.0005, 0.02, 0.5)
+
+
+def _motor(name):
+    return MotorSpecs(name, 20.0, 300.0, 0.005)
+
+
+def _line(n_idlers_before=1, n_idlers_after=0, tension=100.0):
+    builder = LineBuilder(MATERIAL).unwinder(0.3, _motor("M1"), tension=tension)
+    for _ in range(n_idlers_before):
+        builder.span(1.0, tension).idler(0.05, 0.005, friction=LOW_FRICTION)
+    builder.span(1.0, tension).pull_roll(0.1, 0.05, _motor("M2"))
+    for _ in range(n_idlers_after):
+        builder.span(1.0, tension).idler(0.05, 0.005, friction=LOW_FRICTION)
+    return builder.span(1.0, tension).rewinder(0.08, _motor("M3"), tension=tension).build()
+
+
+def test_spans_match_chained_web_span_objects():
+    # Free, frictionless heavy rollers: speeds are held, only strain transport acts
+    builder = LineBuilder(MATERIAL, dt=1e-3)
+    speeds = (2.0, 2.01, 2.03, 2.02)
+    for i, v in enumerate(speeds):
+        if i:
+            builder.span(1.0 + 0.5 * i)
+        roller = Roller(f"R{i}", 1e12, 0.1, None)
+        roller.omega = v / 0.1
+        builder.axis(roller)
+    line = builder.build()
+
+    material = WebMaterial(MATERIAL)
+    spans = [WebSpan(material, SpanProperties(1.0 + 0.5 * i), discretization="exact") for i in (1, 2, 3)]
+    for _ in range(2000):
+        line.step(0.0)
+        strain_in = 0.0
+        for j, span in enumerate(spans):
+            previous = span.current_strain
+            span.update(speeds[j], speeds[j + 1], 1e-3, strain_upstream=strain_in)
+            strain_in = previous
+    np.testing.assert_allclose(line.strain, [s.current_strain for s in spans], rtol=1e-9)
+    np.testing.assert_allclose(line.tension, [s.tension for s in spans], rtol=1e-9)
+    # Strain carried downstream: span 2 sees more than its own speed difference
+    assert line.strain[1] > (speeds[2] - speeds[1]) / speeds[2]
+
+
+def test_line_tracks_speed_and_tension_setpoints():
+    line = _line(n_idlers_before=2)
+    history = line.run(speed_ref=SCurveRamp(0.0, 3.0, 0.5, 1.0, 5.0), duration=8.0, tension_refs={4: 80.0})
+    assert history['tension'].shape == (8000, 4)
+    np.testing.assert_allclose(history['speed'][-1], 3.0, rtol=0.01)
+    assert history['tension'][-1, 0] == pytest.approx(100.0, abs=1.0)
+    assert history['tension'][-1, 3] == pytest.approx(80.0, abs=1.0)
+    # Idler friction raises the tension span after span
+    assert np.all(np.diff(history['tension'][-1, :3]) > 0)
+    # The unwinder empties, the rewinder fills
+    assert history['radius'][-1, 0] < 0.3 and history['radius'][-1, -1] > 0.08
+
+
+def test_twenty_span_line_runs_faster_than_real_time():
+    line = _line(n_idlers_before=9, n_idlers_after=9)
+    assert line.n_spans == 20
+    start = time.perf_counter()
+    history = line.run(speed_ref=SCurveRamp(0.0, 2.0, 0.2, 1.0, 5.0), duration=3.0)
+    assert time.perf_counter() - start < 3.0
+    assert np.all(np.isfinite(history['tension']))
+
+
+def test_invalid_lines_are_rejected():
+    builder = LineBuilder(MATERIAL).idler(0.05, 0.01)
+    with pytest.raises(ValueError):
+        builder.idler(0.05, 0.01)
+    with pytest.raises(ValueError):
+        builder.build()
+    with pytest.raises(ValueError):
+        LineBuilder(MATERIAL).span(1.0)
+    middle_winder = (LineBuilder(MATERIAL).idler(0.05, 0.01).span(1.0).unwinder(0.2, _motor("M"))
+                     .span(1.0).idler(0.05, 0.01))
+    with pytest.raises(ValueError):
+        middle_winder.build()